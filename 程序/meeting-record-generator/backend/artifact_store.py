@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 已渲染文档存储配置（可通过环境变量覆盖）
+# 存储目录，默认为后端目录下的temp/artifacts
+ARTIFACT_DIR = os.environ.get("MEETING_ARTIFACT_DIR",
+                              os.path.join(os.path.dirname(__file__), "temp", "artifacts"))
+# 磁盘配额（MB），超出时按最近最少使用淘汰；0表示不存储，每次都重新渲染
+ARTIFACT_QUOTA_MB = float(os.environ.get("MEETING_ARTIFACT_QUOTA_MB", "256"))
+# 浏览器缓存已下载文档的时长（秒）：内容寻址，同一地址的内容不会变化
+ARTIFACT_MAX_AGE = int(os.environ.get("MEETING_ARTIFACT_MAX_AGE", "86400"))
+
+ARTIFACT_SUFFIX = ".docx"
+# 文档键为SHA-256十六进制串（同时防止通过键访问存储目录以外的文件）
+ARTIFACT_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+# 参与渲染的源码：渲染代码或渲染器变化后键随之变化，不会复用旧版本渲染的文档
+_RENDER_SOURCES = ("word_generator.py", "ooxml_writer.py")
+
+
+def _compute_render_version() -> str:
+    """渲染版本：渲染器名称与渲染代码的哈希（只读取源文件，不导入python-docx）"""
+    digest = hashlib.sha256(os.environ.get("MEETING_WORD_RENDERER", "docx").encode("utf-8"))
+    for name in _RENDER_SOURCES:
+        try:
+            with open(os.path.join(os.path.dirname(__file__), name), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(name.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+RENDER_VERSION = _compute_render_version()
+
+
+def make_artifact_key(meeting_info: Dict[str, Any], render_version: str = RENDER_VERSION) -> str:
+    """基于内容生成文档键：规范化的会议信息（键排序的JSON） + 渲染版本"""
+    raw = json.dumps(meeting_info, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{render_version}\x1f{raw}".encode("utf-8")).hexdigest()
+
+
+class ArtifactStore:
+    """
+    已渲染文档的内容寻址存储：以会议信息的哈希为键保存.docx，相同的提取结果只渲染一次
+    文件先写入临时文件再原子替换，总大小超过配额时按最近最少使用淘汰；
+    首次使用时扫描目录恢复索引（按修改时间排序，命中时更新修改时间），多个工作进程可共享同一目录
+    """
+
+    def __init__(self, root: str = ARTIFACT_DIR, quota_mb: float = ARTIFACT_QUOTA_MB):
+        """
+        :param root: 存储目录
+        :param quota_mb: 磁盘配额（MB），0表示不存储
+        """
+        self.root = root
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        # key -> 文件大小，按最近使用排序（最早的在前）
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.quota_bytes > 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}{ARTIFACT_SUFFIX}")
+
+    def _load(self):
+        """首次使用时扫描存储目录（调用方持有锁）"""
+        if self._loaded:
+            return
+        self._loaded = True
+        os.makedirs(self.root, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.name.endswith(ARTIFACT_SUFFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(ARTIFACT_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        查询文档
+        :return: 文件路径；不存在或键格式不正确时返回None
+        """
+        if not self.enabled or not ARTIFACT_KEY_PATTERN.fullmatch(key):
+            return None
+        with self._lock:
+            self._load()
+            known = key in self._entries
+            if known:
+                self._entries.move_to_end(key)
+        path = self.path(key)
+        try:
+            # 更新修改时间，重启或其他工作进程扫描目录时保持最近使用顺序
+            os.utime(path)
+        except OSError:
+            # 未渲染过，或已被其他工作进程淘汰
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            if not known:
+                # 其他工作进程写入的文档
+                size = os.path.getsize(path)
+                self._entries[key] = size
+                self._total_bytes += size
+            self.hits += 1
+        return path
+
+    def read(self, key: str) -> Optional[bytes]:
+        """
+        读取文档字节；不存在时返回None
+        响应应使用读取到的字节而不是文件路径：发送响应时文件可能已被并发的写入淘汰
+        """
+        path = self.lookup(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> Optional[str]:
+        """
+        保存文档（原子写入），超出配额时淘汰最近最少使用的文档
+        :return: 文件路径；未启用或写入失败时返回None
+        """
+        if not self.enabled or len(data) > self.quota_bytes:
+            return None
+        with self._lock:
+            self._load()
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            # 原子替换，并发读取的请求不会读到半写入的文件
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"文档写入存储目录失败: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        evicted = []
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            while self._total_bytes > self.quota_bytes and len(self._entries) > 1:
+                old_key, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                evicted.append(old_key)
+            self.evictions += len(evicted)
+        for old_key in evicted:
+            try:
+                os.remove(self.path(old_key))
+            except OSError:
+                pass
+        return path
+
+    def render(self, meeting_info: Dict[str, Any],
+               render_fn: Callable[[Dict[str, Any]], bytes]) -> Tuple[str, bytes, bool]:
+        """
+        取得会议信息对应的文档，不存在（或读取前已被淘汰）时渲染并保存
+        :param render_fn: Word渲染函数（meeting_info -> .docx字节）
+        :return: (文档键, .docx字节, 存储中是否有该文档)；未启用存储或写入失败时第三项为False
+        """
+        key = make_artifact_key(meeting_info)
+        data = self.read(key)
+        if data is not None:
+            return key, data, True
+        data = render_fn(meeting_info)
+        return key, data, self.put(key, data) is not None
+
+    def render_bytes(self, meeting_info: Dict[str, Any], render_fn: Callable[[Dict[str, Any]], bytes]) -> bytes:
+        """与render相同，只返回.docx字节（可直接替代render_fn）"""
+        return self.render(meeting_info, render_fn)[1]
+
+    def clear(self):
+        """删除存储中的全部文档（基准测试每轮冷启动前调用）"""
+        with self._lock:
+            self._load()
+            keys = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "quota_bytes": self.quota_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "render_version": RENDER_VERSION,
+            }
+
+
+# 进程内共享的文档存储
+artifact_store = ArtifactStore()
@@ -0,0 +1,294 @@
+"""
+ASGI入口：信息提取（含JSON接口/extract）与SSE流式接口使用协程实现，等待Ollama期间不占用线程，单进程即可同时处理大量请求
+Word渲染（CPU密集）在独立线程池中执行；其余接口（任务、批量、缓存统计、静态页面等）交给Flask应用处理
+配置了渲染进程池（MEETING_RENDER_PROCESSES）时Word渲染在渲染进程中执行，协程直接等待结果
+用法（在backend目录下）：
+    uvicorn asgi:app --host 127.0.0.1 --port 5000
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.http import parse_etags, quote_etag
+
+import main
+from artifact_store import ARTIFACT_MAX_AGE, artifact_store, make_artifact_key
+from cancellation import DISCONNECT, record_cancellation
+from metrics import REQUEST_SECONDS
+from model_client import aextract_meeting_info, astream_meeting_info, extraction_cache, extraction_key
+from profiling import profiler
+from render_pool import render_meeting_word, render_pool
+from streaming import astream_meeting_events
+
+# Word渲染线程数（可通过环境变量覆盖），默认与CPU核数相同
+RENDER_WORKERS = int(os.environ.get("MEETING_RENDER_WORKERS", str(os.cpu_count() or 4)))
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# 所有响应都允许跨域，与Flask应用的CORS配置一致
+_CORS_HEADERS = [(b"access-control-allow-origin", b"*")]
+
+# 支持按需性能分析（X-Profile）的接口：需要分析的请求交给Flask接口处理，
+# 分析器按线程采集，不能在事件循环中分析单个协程
+_PROFILED_ROUTES = {("POST", "/generate-meeting")}
+
+
+class MeetingASGIApp:
+    """会议记录生成服务的ASGI应用"""
+
+    def __init__(self, flask_app):
+        self.wsgi_app = WsgiToAsgi(flask_app)
+        self.render_executor: Optional[ThreadPoolExecutor] = None
+        self.routes = {
+            ("POST", "/generate-meeting"): self.generate_meeting,
+            ("POST", "/generate-meeting/stream"): self.generate_meeting_stream,
+            ("POST", "/extract"): self.extract,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] == "http":
+            route = (scope["method"], scope["path"])
+            handler = self.routes.get(route)
+            if route in _PROFILED_ROUTES and profiler.wants(_header(scope, b"x-profile"),
+                                                            _header(scope, b"x-profile-token")):
+                handler = None
+            if handler is not None:
+                await self._timed(handler, scope, receive, send)
+                return
+        await self.wsgi_app(scope, receive, send)
+
+    @staticmethod
+    async def _timed(handler, scope: Scope, receive: Receive, send: Send):
+        """记录请求耗时（与Flask接口相同，流式响应记录到开始返回为止）"""
+        start = time.perf_counter()
+        recorded = False
+
+        async def timed_send(message: Dict[str, Any]):
+            nonlocal recorded
+            if message["type"] == "http.response.start" and not recorded:
+                recorded = True
+                REQUEST_SECONDS.labels(scope["path"], message["status"]).observe(time.perf_counter() - start)
+            await send(message)
+
+        await handler(scope, receive, timed_send)
+
+    async def lifespan(self, receive: Receive, send: Send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._executor()
+                render_pool.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.render_executor is not None:
+                    self.render_executor.shutdown(wait=True)
+                    self.render_executor = None
+                render_pool.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self.render_executor is None:
+            self.render_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+        return self.render_executor
+
+    async def render(self, meeting_info: Dict[str, Any]) -> bytes:
+        """渲染Word文档（会议信息相同的文档直接读取文档存储）"""
+        return (await self.render_artifact(meeting_info))[1]
+
+    async def render_artifact(self, meeting_info: Dict[str, Any]) -> Tuple[str, bytes, bool]:
+        """
+        取得会议信息对应的文档，文档存储中没有时渲染并保存
+        :return: (文档键, .docx字节, 是否已在文档存储中)
+        """
+        key = make_artifact_key(meeting_info)
+        word_bytes = await asyncio.to_thread(artifact_store.read, key)
+        if word_bytes is not None:
+            return key, word_bytes, True
+        word_bytes = await self._render_uncached(meeting_info)
+        stored = await asyncio.to_thread(artifact_store.put, key, word_bytes) is not None
+        return key, word_bytes, stored
+
+    async def _render_uncached(self, meeting_info: Dict[str, Any]) -> bytes:
+        """渲染Word文档：启用渲染进程池时直接等待进程池结果，否则在渲染线程池中执行"""
+        if render_pool.enabled:
+            return await asyncio.wrap_future(render_pool.submit(meeting_info))
+        return await asyncio.get_running_loop().run_in_executor(self._executor(), render_meeting_word, meeting_info)
+
+    async def generate_meeting(self, scope: Scope, receive: Receive, send: Send):
+        """
+        与Flask的/generate-meeting相同：返回Word文件，ETag为文档键；与Flask接口一样，POST请求不处理If-None-Match
+        （文档键在提取之后才能确定），客户端应对Content-Location发送GET请求重新验证（由Flask应用返回304）；
+        客户端在完成前断开时停止生成，提取期间断开时不再渲染；需要性能分析（X-Profile）的请求由Flask接口处理
+        """
+        input_text = await _read_input_text(receive)
+        if not input_text:
+            await _send_json(send, 400, {"error": "请传递会议描述文本"})
+            return
+        stage = "extract"
+
+        async def respond():
+            nonlocal stage
+            try:
+                meeting_info = await aextract_meeting_info(input_text)
+                stage = "render"
+                key, word_bytes, stored = await self.render_artifact(meeting_info)
+            except Exception as e:
+                await _send_json(send, 500, {"error": str(e)})
+                return
+            await self._send_document(send, key, word_bytes, stored)
+
+        if await _run_until_disconnect(respond(), receive):
+            record_cancellation(DISCONNECT, stage)
+
+    @staticmethod
+    async def _send_document(send: Send, key: str, word_bytes: bytes, stored: bool):
+        headers = [
+            (b"content-type", main.DOCX_MIMETYPE.encode()),
+            (b"content-disposition", f"attachment; filename*=UTF-8''{quote('会议记录.docx')}".encode()),
+            (b"etag", quote_etag(key).encode()),
+            (b"cache-control", f"private, max-age={ARTIFACT_MAX_AGE}, immutable".encode()),
+        ]
+        if stored:
+            # 之后通过该地址重新下载（由Flask应用提供，支持Range与If-None-Match）
+            headers.append((b"content-location", f"/artifacts/{key}".encode()))
+        await _send_response(send, 200, word_bytes, headers)
+
+    async def extract(self, scope: Scope, receive: Receive, send: Send):
+        """与Flask的/extract相同：返回JSON格式的会议信息，If-None-Match与ETag相同时返回304"""
+        input_text = await _read_input_text(receive)
+        if not input_text:
+            await _send_json(send, 400, {"error": "请传递会议描述文本"})
+            return
+
+        etag = await asyncio.to_thread(extraction_key, input_text)
+        cache_headers = [(b"etag", quote_etag(etag).encode()), (b"cache-control", main.EXTRACT_CACHE_CONTROL.encode())]
+        if etag in parse_etags(_header(scope, b"if-none-match")):
+            await _send_response(send, 304, b"", cache_headers)
+            return
+
+        async def respond():
+            try:
+                meeting_info = await aextract_meeting_info(input_text)
+            except Exception as e:
+                await _send_json(send, 500, {"error": str(e)})
+                return
+            # 规则回退的结果不缓存，也不带ETag（与Flask接口相同）
+            cached = await asyncio.to_thread(extraction_cache.__contains__, etag)
+            await _send_json(send, 200, meeting_info, cache_headers if cached else [(b"cache-control", b"no-store")])
+
+        # 客户端断开时停止提取
+        if await _run_until_disconnect(respond(), receive):
+            record_cancellation(DISCONNECT, "extract")
+
+    async def generate_meeting_stream(self, scope: Scope, receive: Receive, send: Send):
+        """与Flask的/generate-meeting/stream相同：以SSE推送事件；客户端断开后立即停止生成"""
+        input_text = await _read_input_text(receive)
+        if not input_text:
+            await _send_json(send, 400, {"error": "请传递会议描述文本"})
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": _CORS_HEADERS + [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+        events = astream_meeting_events(input_text, astream_meeting_info, self.render, main.job_manager)
+
+        async def send_events():
+            try:
+                async for message in events:
+                    await send({"type": "http.response.body", "body": message.encode("utf-8"), "more_body": True})
+            finally:
+                await events.aclose()
+            await send({"type": "http.response.body", "body": b""})
+
+        # 客户端断开时取消生成（取消次数由astream_meeting_events记录）
+        await _run_until_disconnect(send_events(), receive)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    return body
+
+
+async def _read_input_text(receive: Receive) -> Optional[str]:
+    """读取请求体中的input_text，JSON格式错误时视为未传递"""
+    try:
+        request_data = json.loads(await _read_body(receive) or b"{}")
+    except ValueError:
+        return None
+    return request_data.get("input_text") if isinstance(request_data, dict) else None
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    """取请求头（name为小写字节串），不存在时返回None"""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _wait_disconnect(receive: Receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _run_until_disconnect(coro: Awaitable[None], receive: Receive) -> bool:
+    """
+    执行响应协程，客户端先断开时取消它：取消会传到Ollama调用并关闭连接，相同请求的等待者自行重新提取
+    :return: 是否因客户端断开而取消
+    """
+    task = asyncio.ensure_future(coro)
+    watcher = asyncio.create_task(_wait_disconnect(receive))
+    done, _ = await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    if task in done:
+        watcher.cancel()
+        task.result()
+        return False
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return True
+
+
+async def _send_response(send: Send, status: int, body: bytes, headers: List[Tuple[bytes, bytes]]):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": _CORS_HEADERS + headers + [(b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send: Send, status: int, data: Dict[str, Any],
+                     headers: Optional[List[Tuple[bytes, bytes]]] = None):
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    await _send_response(send, status, body, [(b"content-type", b"application/json")] + (headers or []))
+
+
+app = MeetingASGIApp(main.app)
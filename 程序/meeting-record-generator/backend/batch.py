@@ -0,0 +1,103 @@
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List
+
+from cancellation import DISCONNECT, CancelToken, cancel_scope
+
+# 批量生成配置（可通过环境变量覆盖）
+BATCH_PARALLELISM = int(os.environ.get("MEETING_BATCH_PARALLELISM", "4"))
+BATCH_MAX_ITEMS = int(os.environ.get("MEETING_BATCH_MAX_ITEMS", "50"))
+
+
+class _ChunkBuffer:
+    """只写的内存缓冲区：zipfile写入后由生成器取走已写出的数据块，实现边压缩边返回"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _generate_item(index: int, input_text: str,
+                   extract_fn: Callable[[str], Dict[str, Any]],
+                   render_fn: Callable[[Dict[str, Any]], bytes], token: CancelToken) -> Dict[str, Any]:
+    """生成单条会议记录，异常写入结果而不向上抛出（批量请求被取消时抛出Cancelled）"""
+    item = {"index": index, "filename": None, "status": "failed", "meeting_type": None, "error": None}
+    with cancel_scope(token):
+        try:
+            token.check()
+            if not isinstance(input_text, str) or not input_text.strip():
+                raise ValueError("会议描述文本为空")
+            meeting_info = extract_fn(input_text)
+            item["meeting_type"] = meeting_info.get("meeting_type")
+            token.check()
+            item["content"] = render_fn(meeting_info)
+            item["filename"] = f"{index + 1:03d}_会议记录.docx"
+            item["status"] = "ok"
+        except Exception as e:
+            item["error"] = str(e)
+    return item
+
+
+def stream_batch_zip(input_texts: List[str],
+                     extract_fn: Callable[[str], Dict[str, Any]],
+                     render_fn: Callable[[Dict[str, Any]], bytes],
+                     parallelism: int = BATCH_PARALLELISM) -> Iterator[bytes]:
+    """
+    并发生成多条会议记录并以ZIP流的形式逐块返回
+    ZIP中每条成功的记录对应一个.docx文件，另附manifest.json记录每条的状态与错误信息；
+    客户端断开（生成器被关闭）时取消尚未开始的记录，正在生成的记录在下一个模型输出分块处停止，不再等待全部生成完
+    :param input_texts: 会议描述文本列表
+    :param extract_fn: 会议信息提取函数
+    :param render_fn: Word渲染函数（meeting_info -> .docx字节）
+    :param parallelism: 最大并发数
+    :return: ZIP文件数据块迭代器
+    """
+    buffer = _ChunkBuffer()
+    manifest = []
+    token = CancelToken()
+    with ThreadPoolExecutor(max_workers=max(1, parallelism), thread_name_prefix="meeting-batch") as executor:
+        futures = [executor.submit(_generate_item, idx, text, extract_fn, render_fn, token)
+                   for idx, text in enumerate(input_texts)]
+        try:
+            # .docx本身已是压缩包，存储时不再重复压缩
+            with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+                # 按提交顺序写入，保证文件顺序与输入一致
+                for future in futures:
+                    item = future.result()
+                    content = item.pop("content", None)
+                    if content is not None:
+                        archive.writestr(item["filename"], content)
+                    manifest.append(item)
+                    yield buffer.drain()
+
+                archive.writestr(
+                    "manifest.json",
+                    json.dumps({"total": len(manifest),
+                                "succeeded": sum(1 for item in manifest if item["status"] == "ok"),
+                                "items": manifest}, ensure_ascii=False, indent=2),
+                    compress_type=zipfile.ZIP_DEFLATED
+                )
+        except GeneratorExit:
+            # 客户端断开：退出线程池前取消排队中的记录，并通知正在生成的记录停止
+            token.cancel(DISCONNECT)
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    yield buffer.drain()
@@ -0,0 +1,74 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from metrics import CANCELLATIONS
+
+# 取消原因：disconnect（客户端断开，如关闭页面或前端AbortController中止请求）、client（DELETE /jobs/<id>）
+DISCONNECT = "disconnect"
+CLIENT = "client"
+
+
+class Cancelled(BaseException):
+    """
+    生成已被取消：与asyncio.CancelledError相同继承BaseException，
+    不会被模型调用的异常处理当作失败而进入规则回退，相同请求的等待者收到FlightAbandoned后自行重新提取
+    """
+
+
+class CancelToken:
+    """一次生成的取消标记：由其他线程（接口、断开检测）设置，生成流程在模型输出分块之间与渲染之前检查"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = CLIENT):
+        """请求取消（重复调用以第一次的原因为准）"""
+        if self.reason is None:
+            self.reason = reason
+        self._event.set()
+
+    def check(self):
+        """已请求取消时抛出Cancelled"""
+        if self._event.is_set():
+            raise Cancelled(self.reason)
+
+
+# 当前线程（或协程）正在执行的生成对应的取消标记
+_current: "contextvars.ContextVar[Optional[CancelToken]]" = contextvars.ContextVar("cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current.get()
+
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken]) -> Iterator[Optional[CancelToken]]:
+    """在with代码块中把token设为当前取消标记（模型调用通过check_cancelled检查，无需逐层传递）"""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def check_cancelled():
+    """当前生成已被取消时抛出Cancelled（没有取消标记时不做任何事）"""
+    token = _current.get()
+    if token is not None:
+        token.check()
+
+
+def record_cancellation(reason: Optional[str], stage: str):
+    """
+    记录一次被取消的生成
+    :param reason: 取消原因（disconnect、client）
+    :param stage: 取消时所处的阶段（queued、extract、render）
+    """
+    CANCELLATIONS.labels(reason or CLIENT, stage).inc()
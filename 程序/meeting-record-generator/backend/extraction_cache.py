@@ -0,0 +1,168 @@
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# 缓存配置（可通过环境变量覆盖）
+CACHE_MAX_ENTRIES = int(os.environ.get("MEETING_CACHE_SIZE", "256"))
+CACHE_TTL = int(os.environ.get("MEETING_CACHE_TTL", "86400"))
+# 磁盘持久化目录，为空则只使用内存缓存
+CACHE_DIR = os.environ.get("MEETING_CACHE_DIR", "")
+
+
+def normalize_text(text: str) -> str:
+    """规范化会议文本：统一全角/半角字符、合并空白，使仅有格式差异的文本命中同一缓存"""
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_cache_key(input_text: str, model: str, meeting_type: str, prompt_version: str) -> str:
+    """基于内容生成缓存键：规范化文本 + 模型名 + 会议类型 + Prompt版本"""
+    raw = "\x1f".join([normalize_text(input_text), model, meeting_type, prompt_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    会议信息提取结果缓存
+    内存中按LRU淘汰并限制条目数，每个条目有TTL；可选写入磁盘目录，服务重启后仍可命中
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: int = CACHE_TTL,
+                 cache_dir: str = CACHE_DIR):
+        """
+        :param max_entries: 内存中最多保留的条目数
+        :param ttl: 条目有效期（秒）
+        :param cache_dir: 磁盘持久化目录，为空则不持久化
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        # key -> (写入时间, 模型耗时秒数, meeting_info)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # 命中缓存而节省的模型调用时间（秒）
+        self.saved_model_seconds = 0.0
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """查询缓存，命中时返回结果副本，未命中或过期返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is None or time.time() - entry[0] > self.ttl:
+            if entry is not None:
+                self._discard(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.saved_model_seconds += entry[1]
+        return copy.deepcopy(entry[2])
+
+    def __contains__(self, key: str) -> bool:
+        """是否有未过期的条目（不计入命中统计，也不调整淘汰顺序）"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load_from_disk(key)
+        return entry is not None and time.time() - entry[0] <= self.ttl
+
+    def put(self, key: str, meeting_info: Dict[str, Any], model_seconds: float = 0.0):
+        """
+        写入缓存
+        :param key: make_cache_key生成的缓存键
+        :param meeting_info: 提取结果
+        :param model_seconds: 本次模型调用耗时，命中时计入节省时间
+        """
+        entry = (time.time(), model_seconds, copy.deepcopy(meeting_info))
+        self._remember(key, entry)
+        self._save_to_disk(key, entry)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+        for key in keys:
+            self._remove_file(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "saved_model_seconds": round(self.saved_model_seconds, 3),
+                "persistent": bool(self.cache_dir),
+            }
+
+    def _remember(self, key: str, entry: tuple):
+        evicted = []
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        for old_key in evicted:
+            self._remove_file(old_key)
+
+    def _discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+        self._remove_file(key)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_from_disk(self, key: str) -> Optional[tuple]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return (data["stored_at"], data.get("model_seconds", 0.0), data["meeting_info"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_to_disk(self, key: str, entry: tuple):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": entry[0], "model_seconds": entry[1], "meeting_info": entry[2]},
+                          f, ensure_ascii=False)
+            # 原子替换，避免并发读到半写入的文件
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"缓存写入磁盘失败: {str(e)}")
+
+    def _remove_file(self, key: str):
+        if not self.cache_dir:
+            return
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
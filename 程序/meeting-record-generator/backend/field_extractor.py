@@ -0,0 +1,224 @@
+import datetime
+import os
+import re
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# 扫描窗口（字符数，可通过环境变量覆盖）：会议时间地点通常写在开头，超出窗口后已找到的字段不再寻找更可信的候选，
+# 只继续查找尚未找到的字段
+FIELD_SCAN_CHARS = int(os.environ.get("MEETING_FIELD_SCAN_CHARS", "2000"))
+
+# 会议地点关键词（按常见程度排列）
+LOCATION_KEYWORDS = ['会议室', '办公室', '培训室', '讨论室', '大厅', '在线']
+
+# 时长前的提示词：带提示词的时长（“预计两小时”“时长：90分钟”）才视为会议时长，
+# 其余出现在文中的时长（如“中途休息10分钟”）置信度较低，不会覆盖由会议时间段算出的时长
+DURATION_ANCHORS = ['时长', '预计', '大约', '约', '持续', '历时', '为期', '用时']
+
+# 中文数字（用于“两小时”“半小时”等时长表达）
+_CN_DIGITS = {"零": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5,
+              "六": 6, "七": 7, "八": 8, "九": 9, "十": 10, "半": 0.5}
+
+# 时长中的数量：阿拉伯数字（可带小数）或简单中文数字
+_NUMBER = r"\d+(?:\.\d+)?|[零一二两三四五六七八九十]+"
+_DATE = r"(?:(?P<{p}y>\d{{4}})年)?(?P<{p}mo>\d{{1,2}})月(?P<{p}d>\d{{1,2}})[日号]"
+_CLOCK = r"(?P<{p}sh>\d{{1,2}})[:：](?P<{p}sm>\d{{2}})\s*[-~—,，至到]\s*(?P<{p}eh>\d{{1,2}})[:：](?P<{p}em>\d{{2}})"
+
+# 所有字段的正则合并为一个，按命名分组区分字段，只需扫描一遍文本
+# 同一位置按顺序尝试，信息更完整的模式（带时段的会议时间）排在前面
+_FIELD_ALTERNATIVES = "|".join([
+    # 会议时间：2025年3月5日 14:00-15:00 / 3月5日 14:00到15:00
+    r"(?P<time>" + _DATE.format(p="t") + r"\s*" + _CLOCK.format(p="t") + r")",
+    # 会议时间：2025-03-05 14:00-15:00
+    r"(?P<isotime>(?P<iy>\d{4})-(?P<imo>\d{1,2})-(?P<id>\d{1,2})\s+" + _CLOCK.format(p="i") + r")",
+    # 日期范围：3月5日至3月7日 / 2025年3月5日-2025年3月7日
+    r"(?P<range>" + _DATE.format(p="r1") + r"\s*(?:至|到|[-~—])\s*" + _DATE.format(p="r2") + r")",
+    # 会议时长：约两小时 / 1.5小时 / 一个半小时 / 1小时30分钟 / 时长：30分钟 / 半小时
+    r"(?P<duration>(?:(?P<dn>" + _NUMBER + r")\s*个?\s*(?P<dhalf>半)?|(?P<dhalf0>半))\s*个?\s*(?P<du>小时|钟头|分钟)"
+    r"(?:(?<!分钟)\s*又?(?P<dm>" + _NUMBER + r")\s*分钟?)?)",
+    # 会议地点关键词，修饰词（如“三楼大”）在命中后向前截取，避免在每个位置回溯
+    r"(?P<location>" + "|".join(LOCATION_KEYWORDS) + r")",
+])
+# 各分支可能的首字符：先用前瞻跳过不可能开始匹配的位置，避免在每个位置逐个尝试所有分支
+_FIRST_CHARS = r"\d零一二两三四五六七八九十半" + "".join(sorted({kw[0] for kw in LOCATION_KEYWORDS}))
+_FIELD_PATTERN = re.compile("(?=[" + _FIRST_CHARS + "])(?:" + _FIELD_ALTERNATIVES + ")")
+
+# 各字段可能的最高置信度：字段都已达到时停止扫描，之后的候选不可能替换已有结果
+_TOP_CONFIDENCE = {"meeting_time": 0.95, "date_range": 0.9, "meeting_duration": 0.9, "meeting_location": 0.85}
+
+# 时长前的提示词（命中后向前检查，不参与逐位置匹配）
+_DURATION_ANCHOR = re.compile("(?:" + "|".join(DURATION_ANCHORS) + r")[为是:：]?\s*$")
+
+# 地点关键词前的修饰字：最多8个，不含介词、标点
+_LOCATION_MODIFIER = re.compile(r"(?:(?![在于到去和与及的、，。；：\s])[一-龥A-Za-z0-9#]){1,8}$")
+
+
+class FieldMatch(NamedTuple):
+    """单个字段的提取结果"""
+    value: str                  # 规范化后的字段值
+    span: Tuple[int, int]       # 在原文中的起止位置
+    confidence: float           # 置信度（0-1）
+    raw: str                    # 原文片段
+
+
+def _cn_number(text: str) -> Optional[float]:
+    """解析“两”“十五”“半”等简单中文数字"""
+    if text == "半":
+        return 0.5
+    if "十" in text:
+        tens, _, units = text.partition("十")
+        return (_CN_DIGITS.get(tens, 1) if tens else 1) * 10 + (_CN_DIGITS.get(units, 0) if units else 0)
+    if len(text) == 1 and text in _CN_DIGITS:
+        return _CN_DIGITS[text]
+    return None
+
+
+def _parse_number(text: str) -> Optional[float]:
+    """解析阿拉伯数字或简单中文数字"""
+    return float(text) if text[0].isdigit() else _cn_number(text)
+
+
+def _format_duration(minutes: float) -> str:
+    hours, mins = divmod(int(round(minutes)), 60)
+    if hours and mins:
+        return f"{hours}小时{mins}分钟"
+    if hours:
+        return f"{hours}小时"
+    return f"{mins}分钟"
+
+
+class FieldExtractor:
+    """
+    会议结构化字段提取引擎
+    所有正则在模块加载时编译一次，单次扫描同时提取会议时间、日期范围、地点与时长，
+    每个字段返回规范化值、原文位置和置信度，调用方可直接复用而无需再次扫描文本；
+    所需字段都已确定时提前结束扫描，长逐字稿开头写明时间地点时不必扫描全文
+    """
+
+    def __init__(self, default_year: Optional[int] = None, scan_chars: int = FIELD_SCAN_CHARS):
+        """
+        :param default_year: 日期未写年份时使用的年份，默认取当前年份
+        :param scan_chars: 扫描窗口（字符数），窗口内的候选按置信度择优，窗口外只查找尚未找到的字段
+        """
+        self.default_year = default_year
+        self.scan_chars = scan_chars
+
+    def extract(self, text: str) -> Dict[str, FieldMatch]:
+        """
+        单次扫描提取字段
+        :param text: 会议文本
+        :return: 字段名 -> FieldMatch，字段包括meeting_time、date_range、meeting_location、meeting_duration，
+                 未找到的字段不出现在结果中；同一字段有多个候选时取置信度最高、位置最靠前的（扫描窗口外只取第一个）；
+                 date_range只在没有会议时间时使用，已找到会议时间后不再查找
+        """
+        best: Dict[str, FieldMatch] = {}
+        for match in _FIELD_PATTERN.finditer(text):
+            if match.start() >= self.scan_chars and self._settled(best, past_window=True):
+                break
+            kind = match.lastgroup
+            if kind == "time":
+                field, result = "meeting_time", self._time_match(match, "t")
+            elif kind == "isotime":
+                field, result = "meeting_time", self._time_match(match, "i")
+            elif kind == "range":
+                if "meeting_time" in best:
+                    continue
+                field, result = "date_range", self._range_match(match)
+            elif kind == "duration":
+                field, result = "meeting_duration", self._duration_match(match)
+            else:
+                field, result = "meeting_location", self._location_match(match)
+            if result is not None and (field not in best or result.confidence > best[field].confidence):
+                best[field] = result
+                if self._settled(best, past_window=False):
+                    break
+
+        # 未写明时长（或只有不带提示词的时长）但有完整时间段时，根据起止时间计算
+        if "meeting_time" in best:
+            computed = self._duration_from_time(best["meeting_time"])
+            if computed is not None and ("meeting_duration" not in best
+                                         or best["meeting_duration"].confidence < computed.confidence):
+                best["meeting_duration"] = computed
+        return best
+
+    @staticmethod
+    def _settled(best: Dict[str, FieldMatch], past_window: bool) -> bool:
+        """
+        是否可以停止扫描：每个字段都已达到最高置信度（超出扫描窗口后只要求已找到）
+        """
+        for field, top in _TOP_CONFIDENCE.items():
+            if field == "date_range" and "meeting_time" in best:
+                continue
+            found = best.get(field)
+            if found is None or (not past_window and found.confidence < top):
+                return False
+        return True
+
+    def _year(self, year: Optional[str]) -> Tuple[str, bool]:
+        """返回(年份, 是否原文给出)"""
+        if year:
+            return year, True
+        return str(self.default_year or datetime.date.today().year), False
+
+    def _time_match(self, match: "re.Match", prefix: str) -> Optional[FieldMatch]:
+        year, explicit_year = self._year(match.group(f"{prefix}y"))
+        month, day = int(match.group(f"{prefix}mo")), int(match.group(f"{prefix}d"))
+        start_h, start_m = int(match.group(f"{prefix}sh")), int(match.group(f"{prefix}sm"))
+        end_h, end_m = int(match.group(f"{prefix}eh")), int(match.group(f"{prefix}em"))
+        if not (1 <= month <= 12 and 1 <= day <= 31 and start_h < 24 and end_h < 24
+                and start_m < 60 and end_m < 60):
+            return None
+        value = f"{year}年{month:02d}月{day:02d}日 {start_h:02d}:{start_m:02d}-{end_h:02d}:{end_m:02d}"
+        # 年份由系统推断时置信度降低
+        return FieldMatch(value, match.span(), 0.95 if explicit_year else 0.8, match.group(0))
+
+    def _range_match(self, match: "re.Match") -> Optional[FieldMatch]:
+        start_year, explicit_year = self._year(match.group("r1y"))
+        end_year = match.group("r2y") or start_year
+        start = f"{start_year}年{int(match.group('r1mo')):02d}月{int(match.group('r1d')):02d}日"
+        end = f"{end_year}年{int(match.group('r2mo')):02d}月{int(match.group('r2d')):02d}日"
+        return FieldMatch(f"{start}至{end}", match.span(), 0.9 if explicit_year else 0.75, match.group(0))
+
+    def _duration_match(self, match: "re.Match") -> Optional[FieldMatch]:
+        number = match.group("dn")
+        amount = (_parse_number(number) or 0) if number else 0
+        half = match.group("dhalf") or match.group("dhalf0")
+        if match.group("du") == "分钟":
+            if half:
+                return None
+            minutes = amount
+        else:
+            minutes = amount * 60 + (30 if half else 0)
+            if match.group("dm"):
+                minutes += _parse_number(match.group("dm")) or 0
+        if not minutes:
+            return None
+        # 带提示词的时长才是会议时长；文中其他时长低于由会议时间段算出的时长（0.7）
+        start = match.start()
+        anchored = _DURATION_ANCHOR.search(match.string, max(0, start - 4), start) is not None
+        confidence = 0.9 if anchored else 0.6
+        return FieldMatch(_format_duration(minutes), match.span(), confidence, match.group(0))
+
+    def _location_match(self, match: "re.Match") -> FieldMatch:
+        start, end = match.span()
+        modifier = _LOCATION_MODIFIER.search(match.string, max(0, start - 8), start)
+        if modifier:
+            start = modifier.start()
+        raw = match.string[start:end]
+        # 带有具体修饰（如“三楼大会议室”）的地点比单独的关键词更可信
+        confidence = 0.85 if modifier else 0.6
+        return FieldMatch(raw, (start, end), confidence, raw)
+
+    def _duration_from_time(self, time_match: FieldMatch) -> Optional[FieldMatch]:
+        clock = time_match.value.split(" ")[-1]
+        start, end = clock.split("-")
+        start_h, start_m = map(int, start.split(":"))
+        end_h, end_m = map(int, end.split(":"))
+        minutes = (end_h * 60 + end_m) - (start_h * 60 + start_m)
+        if minutes <= 0:
+            return None
+        return FieldMatch(_format_duration(minutes), time_match.span, 0.7, time_match.raw)
+
+
+# 进程内共享的提取引擎
+FIELD_EXTRACTOR = FieldExtractor()
+
@@ -0,0 +1,209 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from cancellation import CLIENT, CancelToken, Cancelled, cancel_scope, record_cancellation
+
+# 任务队列配置（可通过环境变量覆盖）
+JOB_WORKERS = int(os.environ.get("MEETING_JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.environ.get("MEETING_JOB_QUEUE_SIZE", "32"))
+# 已完成任务的保留时间（秒），超时后结果被清理
+JOB_RESULT_TTL = int(os.environ.get("MEETING_JOB_RESULT_TTL", "600"))
+
+
+class QueueFullError(Exception):
+    """任务队列已满，无法接收新任务"""
+
+
+class Job:
+    """单个会议记录生成任务"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, input_text: str):
+        self.id = uuid.uuid4().hex
+        self.input_text = input_text
+        self.status = Job.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # 各阶段耗时（秒），如 {"extract": 12.3, "render": 0.08}
+        self.timings: Dict[str, float] = {}
+        self.meeting_type: Optional[str] = None
+        self.result: Optional[bytes] = None
+        self.error: Optional[str] = None
+        # 取消标记：DELETE /jobs/<id>时设置，正在进行的模型调用在下一个输出分块时停止
+        self.cancel_token = CancelToken()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (Job.DONE, Job.FAILED, Job.CANCELLED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """任务状态（供GET /jobs/<id>返回）"""
+        now = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "meeting_type": self.meeting_type,
+            "queued_seconds": round((self.started_at or now) - self.created_at, 3),
+            "total_seconds": round(now - self.created_at, 3),
+            "timings": {stage: round(seconds, 3) for stage, seconds in self.timings.items()},
+            "error": self.error,
+            "cancel_requested": self.cancel_token.cancelled,
+        }
+
+
+class JobManager:
+    """
+    基于有界队列和固定数量工作线程的异步任务管理器
+    提交任务立即返回任务ID，工作线程依次执行“信息提取 -> 渲染Word”两个阶段
+    """
+
+    def __init__(self, extract_fn: Callable[[str], Dict[str, Any]],
+                 render_fn: Callable[[Dict[str, Any]], bytes],
+                 workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE,
+                 result_ttl: int = JOB_RESULT_TTL):
+        """
+        :param extract_fn: 会议信息提取函数（input_text -> meeting_info）
+        :param render_fn: Word渲染函数（meeting_info -> .docx字节）
+        :param workers: 工作线程数
+        :param queue_size: 排队任务上限，超过后拒绝提交
+        :param result_ttl: 已完成任务的保留秒数
+        """
+        self.extract_fn = extract_fn
+        self.render_fn = render_fn
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=queue_size)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """启动工作线程（重复调用无副作用）"""
+        with self._lock:
+            if self._threads:
+                return
+            for idx in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"meeting-job-{idx}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, input_text: str) -> Job:
+        """提交任务，队列已满时抛出QueueFullError"""
+        self.start()
+        self._purge_expired()
+        job = Job(input_text)
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFullError("任务队列已满，请稍后重试")
+        return job
+
+    def add_completed(self, result: bytes, meeting_type: Optional[str] = None,
+                      timings: Optional[Dict[str, float]] = None) -> Job:
+        """
+        登记一个已在队列外生成完成的文档（如流式接口），之后可通过任务ID下载
+        :param result: .docx字节
+        :param meeting_type: 会议类型
+        :param timings: 各阶段耗时（秒）
+        """
+        self._purge_expired()
+        job = Job("")
+        job.status = Job.DONE
+        job.started_at = job.created_at
+        job.finished_at = time.time()
+        job.meeting_type = meeting_type
+        job.timings = dict(timings or {})
+        job.result = result
+        with self._lock:
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str, reason: str = CLIENT) -> Optional[Job]:
+        """
+        取消任务：排队中的任务直接标记为已取消，执行中的任务停止模型生成且不再渲染，已结束的任务不受影响
+        :return: 任务；不存在时返回None
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.cancel_token.cancel(reason)
+            if job.status == Job.QUEUED:
+                job.status = Job.CANCELLED
+                job.finished_at = time.time()
+                job.input_text = ""
+                record_cancellation(reason, "queued")
+        return job
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job):
+        with self._lock:
+            # 排队期间已取消
+            if job.status == Job.CANCELLED:
+                return
+            job.status = Job.RUNNING
+        job.started_at = time.time()
+        stage = "extract"
+        try:
+            with cancel_scope(job.cancel_token):
+                # 1. 信息提取（模型调用）
+                stage_start = time.perf_counter()
+                meeting_info = self.extract_fn(job.input_text)
+                job.timings["extract"] = time.perf_counter() - stage_start
+                job.meeting_type = meeting_info.get("meeting_type")
+
+                # 2. 渲染Word文档（提取期间已取消时不再渲染）
+                stage = "render"
+                job.cancel_token.check()
+                stage_start = time.perf_counter()
+                job.result = self.render_fn(meeting_info)
+                job.timings["render"] = time.perf_counter() - stage_start
+
+            job.status = Job.DONE
+        except Cancelled:
+            job.status = Job.CANCELLED
+            record_cancellation(job.cancel_token.reason, stage)
+        except Exception as e:
+            job.error = str(e)
+            job.status = Job.FAILED
+        finally:
+            job.finished_at = time.time()
+            # 原文在任务结束后不再需要，及时释放
+            job.input_text = ""
+
+    def _purge_expired(self):
+        """清理超过保留时间的已完成任务"""
+        deadline = time.time() - self.result_ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < deadline]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,86 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordAutomaton:
+    """
+    多关键词匹配自动机（Aho-Corasick）
+    构建时把所有关键词编译为确定性自动机，匹配时只需顺序扫描一遍文本，
+    耗时与文本长度成正比，与关键词数量无关；重叠、嵌套的关键词（如“例会”“周例会”）都会被计数
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        :param keywords: 关键词列表（重复或空字符串会被忽略）
+        """
+        self.keywords: List[str] = list(dict.fromkeys(kw for kw in keywords if kw))
+        # 每个状态的完整转移表：字符 -> 下一状态，不在表中的字符回到根状态0
+        self._delta: List[Dict[str, int]] = [{}]
+        # 每个状态命中的关键词（已合并失败链上的输出）
+        self._output: List[Tuple[str, ...]] = [()]
+        self._build()
+
+    def _build(self):
+        # 1. 构建字典树
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[str]] = [[]]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                if ch not in goto[state]:
+                    goto.append({})
+                    output.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            output[state].append(keyword)
+
+        # 2. 按广度优先计算失败指针，同时补全转移表得到确定性自动机
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # 继承失败状态的转移，再用自身的字典树边覆盖
+            transitions = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                output[child].extend(output[fail[child]])
+                transitions[ch] = child
+                queue.append(child)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._output = [tuple(out) for out in output]
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        单次扫描文本，统计每个关键词的出现次数
+        :param text: 待扫描文本
+        :return: 关键词 -> 出现次数（只包含出现过的关键词）
+        """
+        delta = self._delta
+        output = self._output
+        counts: Dict[str, int] = {}
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                for keyword in output[state]:
+                    counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """
+        单次扫描文本，返回所有命中位置
+        :param text: 待扫描文本
+        :return: [(起始下标, 关键词), ...]，按结束位置排序
+        """
+        delta = self._delta
+        output = self._output
+        hits = []
+        state = 0
+        for idx, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            for keyword in output[state]:
+                hits.append((idx - len(keyword) + 1, keyword))
+        return hits
@@ -0,0 +1,172 @@
+import os
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+# 长文本分段配置（可通过环境变量覆盖）
+# 每个token约对应的中文字符数（偏保守，避免超出上下文）
+CHARS_PER_TOKEN = float(os.environ.get("MEETING_CHARS_PER_TOKEN", "1.0"))
+# 为模型输出预留的token数
+OUTPUT_TOKEN_RESERVE = int(os.environ.get("MEETING_OUTPUT_TOKENS", "1024"))
+# 相邻分段重叠的比例，避免说话内容在分段边界被截断
+CHUNK_OVERLAP_RATIO = float(os.environ.get("MEETING_CHUNK_OVERLAP", "0.1"))
+# 分段并发提取数（还受Ollama服务端OLLAMA_NUM_PARALLEL限制）
+CHUNK_PARALLELISM = int(os.environ.get("MEETING_CHUNK_PARALLELISM", "4"))
+# 单个分段的最少字符数（上下文很小时也保证分段有意义）
+MIN_CHUNK_CHARS = 500
+
+# 未提供信息时的占位值
+PLACEHOLDER_VALUES = {"", "无", "待确认", "未知", "未提及"}
+
+# 切分单元：在句末标点与换行（说话人切换处）之后切开，标点与换行保留在前一单元
+_UNIT_BOUNDARY = re.compile(r"(?<=[。！？!?；;…\n])")
+_PARTICIPANT_SEPARATOR = re.compile(r"[,，、;；/\s]+")
+# 标题归一化时去掉的字符：空白与标点
+_TITLE_NOISE = re.compile(r"[\s\W_]+")
+_FULL_TIME = re.compile(r"\d{4}年\d{1,2}月\d{1,2}日\s*\d{1,2}:\d{2}-\d{1,2}:\d{2}")
+_DATE = re.compile(r"\d{1,2}月\d{1,2}[日号]|\d{4}-\d{1,2}-\d{1,2}")
+_CLOCK = re.compile(r"\d{1,2}[:：]\d{2}")
+
+
+def chunk_chars_for_context(context_length: int, prompt_chars: int) -> int:
+    """
+    根据模型上下文长度计算单个分段可容纳的会议文本字符数
+    :param context_length: 上下文长度（token）
+    :param prompt_chars: 会议文本之外的Prompt字符数（系统提示词 + 类型前缀）
+    """
+    available_tokens = context_length - OUTPUT_TOKEN_RESERVE - int(prompt_chars / CHARS_PER_TOKEN)
+    return max(MIN_CHUNK_CHARS, int(available_tokens * CHARS_PER_TOKEN))
+
+
+def _split_units(text: str, max_chars: int) -> List[str]:
+    """按句子与说话人边界切分为最小单元，超长单元再按长度硬切"""
+    units = []
+    for unit in _UNIT_BOUNDARY.split(text):
+        if not unit.strip():
+            # 单独的换行、空白并入前一单元，保留原文的分行
+            if units:
+                units[-1] += unit
+            continue
+        while len(unit) > max_chars:
+            units.append(unit[:max_chars])
+            unit = unit[max_chars:]
+        units.append(unit)
+    return units
+
+
+def split_transcript(text: str, max_chars: int, overlap_ratio: float = CHUNK_OVERLAP_RATIO) -> List[str]:
+    """
+    将长会议记录切分为若干分段，每段不超过max_chars个字符
+    只在句子或说话人边界切分，相邻分段重叠约overlap_ratio比例的内容
+    :return: 分段列表；文本不超过max_chars时原样返回一个分段
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    overlap_chars = int(max_chars * overlap_ratio)
+    units = _split_units(text, max_chars)
+    chunks = []
+    current: List[str] = []
+    current_len = 0
+    for unit in units:
+        if current and current_len + len(unit) > max_chars:
+            chunks.append("".join(current).strip())
+            # 下一段以上一段末尾的若干单元开头（总长不超过overlap_chars）
+            overlap: List[str] = []
+            overlap_len = 0
+            for previous in reversed(current):
+                if overlap_len + len(previous) > overlap_chars or overlap_len + len(previous) + len(unit) > max_chars:
+                    break
+                overlap.insert(0, previous)
+                overlap_len += len(previous)
+            current, current_len = overlap, overlap_len
+        current.append(unit)
+        current_len += len(unit)
+    if current:
+        chunks.append("".join(current).strip())
+    return chunks
+
+
+def _is_placeholder(value: Any) -> bool:
+    return not isinstance(value, str) or value.strip() in PLACEHOLDER_VALUES
+
+
+def normalize_title(title: str) -> str:
+    """议题标题归一化：全角转半角、去掉空白与标点、统一小写"""
+    return _TITLE_NOISE.sub("", unicodedata.normalize("NFKC", title or "")).lower()
+
+
+def _time_specificity(value: str) -> int:
+    """会议时间的具体程度：完整日期+时段 > 日期+时刻 > 日期 > 时刻 > 其他描述"""
+    if _FULL_TIME.search(value):
+        return 4
+    has_date, has_clock = bool(_DATE.search(value)), bool(_CLOCK.search(value))
+    return 2 * has_date + has_clock
+
+
+def _most_specific(values: List[str], score) -> Optional[str]:
+    """按得分取最具体的值，得分相同取靠前分段的（结果与分段完成顺序无关）"""
+    best, best_score = None, -1
+    for value in values:
+        if _is_placeholder(value):
+            continue
+        value_score = score(value)
+        if value_score > best_score:
+            best, best_score = value, value_score
+    return best
+
+
+def merge_meeting_infos(infos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并各分段的提取结果（按分段顺序，结果确定）
+    - 参会人员：按首次出现顺序取并集
+    - 议程：按归一化标题去重，保留首次出现的议题，空缺字段由后续重复议题补全
+    - 会议时间：取最具体的（完整日期+时段优先）；地点：取描述最长（修饰最具体）的
+    - 主题、时长：取第一个有效值（时长优先取带数字的）；全局准备：去重后合并
+    """
+    merged: Dict[str, Any] = {}
+
+    topics = [info.get("meeting_topic") for info in infos]
+    merged["meeting_topic"] = next((topic for topic in topics if not _is_placeholder(topic)), "待确认")
+
+    merged["meeting_time"] = _most_specific([info.get("meeting_time") for info in infos], _time_specificity) or "待确认"
+    merged["meeting_location"] = _most_specific([info.get("meeting_location") for info in infos], len) or "待确认"
+    merged["meeting_duration"] = _most_specific(
+        [info.get("meeting_duration") for info in infos], lambda value: any(ch.isdigit() for ch in value)) or "待确认"
+
+    participants: Dict[str, None] = {}
+    for info in infos:
+        value = info.get("participants")
+        if _is_placeholder(value):
+            continue
+        for name in _PARTICIPANT_SEPARATOR.split(value):
+            if name and name not in PLACEHOLDER_VALUES:
+                participants.setdefault(name, None)
+    merged["participants"] = ",".join(participants) or "待确认"
+
+    agenda: Dict[str, Dict[str, Any]] = {}
+    for info in infos:
+        items = info.get("agenda")
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            key = normalize_title(str(item.get("title") or ""))
+            if not key:
+                continue
+            if key not in agenda:
+                agenda[key] = dict(item)
+                continue
+            for field, value in item.items():
+                if _is_placeholder(agenda[key].get(field)) and not _is_placeholder(value):
+                    agenda[key][field] = value
+    merged["agenda"] = list(agenda.values())
+
+    preparations: Dict[str, None] = {}
+    for info in infos:
+        value = info.get("global_preparation")
+        if not _is_placeholder(value):
+            preparations.setdefault(value.strip(), None)
+    merged["global_preparation"] = "；".join(preparations) or "无"
+    return merged
@@ -1,8 +1,17 @@
-from flask import Flask, request, send_file
+from flask import Flask, Response, g, request, send_file, stream_with_context
 from flask_cors import CORS  # 解决前端跨域问题
+import io
 import os
-from model_client import extract_meeting_info
-from word_generator import generate_meeting_word
+import time
+from model_client import extract_meeting_info, extraction_cache, extraction_flight, extraction_key, stream_meeting_info
+from render_pool import render_meeting_word, render_pool
+from artifact_store import ARTIFACT_MAX_AGE, artifact_store
+from jobs import JobManager, QueueFullError
+from model_registry import model_registry, ollama_breaker
+from batch import BATCH_MAX_ITEMS, stream_batch_zip
+from streaming import stream_meeting_events
+from metrics import REGISTRY, REQUEST_SECONDS, GaugeCallback
+from profiling import PROFILE_FORMATS, PROFILE_KINDS, parse_kinds, profiler
 
 # 初始化Flask应用
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
@@ -12,11 +21,92 @@ CORS(app, resources=r"/*")
 # 设置静态文件目录
 FRONTEND_DIR = os.path.join(os.path.dirname(__file__), '..', 'frontend')
 
+# Word文件MIME类型
+DOCX_MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# /extract结果的缓存策略：客户端可以保存，但每次使用前需携带If-None-Match重新验证（模型或Prompt变化后ETag随之变化）
+EXTRACT_CACHE_CONTROL = "no-cache"
+
+# 渲染Word：会议信息相同的文档只渲染一次，之后直接读取文档存储（MEETING_ARTIFACT_DIR）中的文件
+def render_document(meeting_info):
+    return artifact_store.render_bytes(meeting_info, render_meeting_word)
+
+# 异步任务管理器：工作线程数与队列长度由MEETING_JOB_WORKERS / MEETING_JOB_QUEUE_SIZE配置
+job_manager = JobManager(extract_meeting_info, render_document)
+
+# 已有的统计（缓存、相同请求合并、熔断、队列）在采集/metrics时读取
+REGISTRY.register(GaugeCallback(
+    "meeting_cache_lookups_total", "Extraction cache lookups by result.",
+    lambda: {("hit",): extraction_cache.stats()["hits"], ("miss",): extraction_cache.stats()["misses"]},
+    ["result"], type_name="counter"))
+REGISTRY.register(GaugeCallback(
+    "meeting_single_flight_calls_total", "Extraction calls that ran the model or shared an identical in-flight call.",
+    lambda: {("executed",): extraction_flight.executed, ("coalesced",): extraction_flight.coalesced},
+    ["result"], type_name="counter"))
+REGISTRY.register(GaugeCallback(
+    "meeting_breaker_open", "Whether the Ollama circuit breaker is open (1) or not (0).",
+    lambda: {(): int(ollama_breaker.status()["state"] == ollama_breaker.OPEN)}))
+REGISTRY.register(GaugeCallback(
+    "meeting_job_queue_depth", "Jobs waiting for a job worker.", lambda: {(): job_manager.queue_depth()}))
+REGISTRY.register(GaugeCallback(
+    "meeting_render_queue_depth", "Documents waiting for a free render process.",
+    lambda: {(): render_pool.stats()["queue_depth"]}))
+REGISTRY.register(GaugeCallback(
+    "meeting_artifact_lookups_total", "Rendered document store lookups by result.",
+    lambda: {("hit",): artifact_store.stats()["hits"], ("miss",): artifact_store.stats()["misses"]},
+    ["result"], type_name="counter"))
+REGISTRY.register(GaugeCallback(
+    "meeting_artifact_evictions_total", "Rendered documents evicted to stay within the disk quota.",
+    lambda: {(): artifact_store.stats()["evictions"]}, type_name="counter"))
+REGISTRY.register(GaugeCallback(
+    "meeting_artifact_bytes", "Disk space used by rendered documents in bytes.",
+    lambda: {(): artifact_store.stats()["bytes"]}))
+
+# 记录每个请求的耗时（流式响应记录到开始返回为止）
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = g.pop("request_start", None)
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        REQUEST_SECONDS.labels(endpoint, response.status_code).observe(time.perf_counter() - start)
+    return response
+
 # 根路径返回前端页面
 @app.route('/')
 def index():
     return app.send_static_file('index.html')
 
+# 提取会议信息并渲染Word（性能分析时使用当前线程的渲染函数），返回(文档键, .docx字节, 是否已存入文档存储)
+def generate_word_artifact(input_text, render_fn):
+    # 2. 调用模型提取会议关键信息
+    meeting_info = extract_meeting_info(input_text)
+
+    # 3. 生成Word文档：文档存储中已有相同会议信息的文档时直接复用，否则渲染后原子写入存储
+    return artifact_store.render(meeting_info, render_fn)
+
+# 返回Word文档（作为附件下载）：ETag为文档键，GET请求支持If-None-Match与Range分段下载；
+# 文档按内容寻址，同一地址的内容不会变化，浏览器可以长期缓存；
+# 发送的是已读入内存的字节，响应期间文档被并发的写入淘汰也不影响本次下载
+def send_artifact(key, data, stored):
+    response = send_file(
+        io.BytesIO(data),
+        as_attachment=True,  # 强制下载
+        download_name="会议记录.docx",  # 前端下载的文件名
+        mimetype=DOCX_MIMETYPE,  # Word文件MIME类型
+        etag=key,
+        conditional=True,
+        max_age=ARTIFACT_MAX_AGE
+    )
+    # 会议记录只允许浏览器缓存，不允许共享的代理缓存
+    response.headers["Cache-Control"] = f"private, max-age={ARTIFACT_MAX_AGE}, immutable"
+    if stored:
+        response.headers["Content-Location"] = f"/artifacts/{key}"
+    return response
+
 # 定义接口：接收前端POST请求，生成会议记录Word
 @app.route('/generate-meeting', methods=['POST'])
 def generate_meeting():
@@ -27,25 +117,212 @@ def generate_meeting():
         if not input_text:
             return {"error": "请传递会议描述文本"}, 400  # 400：请求参数错误
 
-        # 2. 调用模型提取会议关键信息
-        meeting_info = extract_meeting_info(input_text)
-
-        # 3. 生成Word文档
-        word_path = generate_meeting_word(meeting_info)
+        # 按需性能分析（需配置MEETING_PROFILE_TOKEN）：未开启时只多一次判断
+        profile_kinds = profiler.requested(request.headers.get("X-Profile"), request.headers.get("X-Profile-Token"))
+        profile_headers = {}
+        if profile_kinds is None:
+            key, data, stored = generate_word_artifact(input_text, render_meeting_word)
+        else:
+            import word_generator
+            with profiler.profile(profile_kinds, label=request.path) as session:
+                # 分析时在当前线程中渲染（不经过渲染进程池），python-docx的耗时才会出现在分析结果中
+                key, data, stored = generate_word_artifact(input_text, word_generator.render_meeting_word)
+            profile_headers = {"X-Profile-Id": session.id} if session is not None else {"X-Profile-Status": "busy"}
 
-        # 4. 返回Word文件给前端（作为附件下载）
-        return send_file(
-            word_path,
-            as_attachment=True,  # 强制下载
-            download_name="会议记录.docx",  # 前端下载的文件名
-            mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document"  # Word文件MIME类型
-        )
+        # 4. 返回Word文件给前端（之后可通过Content-Location中的地址重新下载，无需再次提取与渲染）
+        response = send_artifact(key, data, stored)
+        response.headers.update(profile_headers)
+        return response
 
     except Exception as e:
         # 异常处理：返回错误信息与500状态码（服务器内部错误）
         return {"error": str(e)}, 500
 
+# JSON接口：只返回结构化的会议信息，不渲染Word；强ETag为提取结果的内容标识（文本哈希、模型与Prompt版本），
+# 请求携带的If-None-Match与之相同时直接返回304，不调用模型
+@app.route('/extract', methods=['POST'])
+def extract():
+    request_data = request.get_json(silent=True) or {}
+    input_text = request_data.get("input_text")
+    if not input_text:
+        return {"error": "请传递会议描述文本"}, 400
+
+    etag = extraction_key(input_text)
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = EXTRACT_CACHE_CONTROL
+        return response
+
+    try:
+        meeting_info = extract_meeting_info(input_text)
+    except Exception as e:
+        return {"error": str(e)}, 500
+
+    response = app.json.response(meeting_info)
+    # 只有写入了提取缓存的模型结果才带ETag；规则回退的结果不缓存，Ollama恢复后客户端应重新取得模型结果
+    if etag in extraction_cache:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = EXTRACT_CACHE_CONTROL
+    else:
+        response.headers["Cache-Control"] = "no-store"
+    return response
+
+# 流式接口：以Server-Sent Events推送会议类型、生成进度与已完成的字段，最后推送下载地址
+@app.route('/generate-meeting/stream', methods=['POST'])
+def generate_meeting_stream():
+    request_data = request.get_json(silent=True) or {}
+    input_text = request_data.get("input_text")
+    if not input_text:
+        return {"error": "请传递会议描述文本"}, 400
+
+    return Response(
+        stream_with_context(stream_meeting_events(input_text, stream_meeting_info, render_document, job_manager)),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 禁止Nginx等反向代理缓冲事件流
+        }
+    )
+
+# 批量接口：一次传入多条会议描述，返回包含所有会议记录与manifest.json的ZIP压缩包
+@app.route('/generate-batch', methods=['POST'])
+def generate_batch():
+    request_data = request.get_json(silent=True) or {}
+    input_texts = request_data.get("input_texts")
+    if not isinstance(input_texts, list) or not input_texts:
+        return {"error": "请传递会议描述文本列表input_texts"}, 400
+    if len(input_texts) > BATCH_MAX_ITEMS:
+        return {"error": f"单次最多生成{BATCH_MAX_ITEMS}条会议记录"}, 400
+
+    # 单条失败只记录在manifest.json中，不影响其余记录
+    return Response(
+        stream_batch_zip(input_texts, extract_meeting_info, render_document),
+        mimetype="application/zip",
+        headers={"Content-Disposition": "attachment; filename=meeting_records.zip"}
+    )
+
+# 异步任务接口：提交任务后立即返回任务ID，由后台工作线程生成
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    request_data = request.get_json(silent=True) or {}
+    input_text = request_data.get("input_text")
+    if not input_text:
+        return {"error": "请传递会议描述文本"}, 400
+
+    try:
+        job = job_manager.submit(input_text)
+    except QueueFullError as e:
+        return {"error": str(e)}, 503  # 503：服务繁忙
+
+    return {"job_id": job.id, "status": job.status}, 202  # 202：已接收，处理中
+
+# 查询任务状态与各阶段耗时
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return {"error": "任务不存在或已过期"}, 404
+    return job.to_dict()
+
+# 取消任务：排队中的任务不再执行，执行中的任务停止模型生成且不再渲染（前端关闭页面或重新生成时调用）
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return {"error": "任务不存在或已过期"}, 404
+    return job.to_dict()
+
+# 下载任务生成的Word文档
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return {"error": "任务不存在或已过期"}, 404
+    if job.status == job.FAILED:
+        return {"error": job.error}, 500
+    if job.status == job.CANCELLED:
+        return {"error": "任务已取消"}, 410  # 410：结果不会再生成
+    if job.status != job.DONE:
+        return {"error": "任务尚未完成", "status": job.status}, 409  # 409：结果尚未就绪
+
+    return send_file(
+        io.BytesIO(job.result),
+        as_attachment=True,
+        download_name="会议记录.docx",
+        mimetype=DOCX_MIMETYPE
+    )
+
+# 下载文档存储中的Word文档（/generate-meeting响应的Content-Location）
+@app.route('/artifacts/<key>', methods=['GET'])
+def download_artifact(key):
+    data = artifact_store.read(key)
+    if data is None:
+        return {"error": "文档不存在或已被清理"}, 404
+    return send_artifact(key, data, True)
+
+# 提取结果缓存命中统计，以及相同请求合并统计
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    stats = extraction_cache.stats()
+    stats["single_flight"] = extraction_flight.stats()
+    return stats
+
+# Word渲染进程池状态（进程数、排队文档数等），以及文档存储的命中与占用统计
+@app.route('/render/stats', methods=['GET'])
+def render_stats():
+    stats = render_pool.stats()
+    stats["artifacts"] = artifact_store.stats()
+    return stats
+
+# Prometheus文本格式的指标：各阶段耗时、回退次数、会议类型分布、模型吞吐等
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), content_type=REGISTRY.CONTENT_TYPE)
+
+# 性能分析管理接口（需配置MEETING_PROFILE_TOKEN，并在X-Profile-Token请求头中携带令牌）
+# GET：预约状态与已有的分析结果；POST {"requests": N, "kinds": "sample,alloc"}：分析接下来的N个生成请求
+@app.route('/admin/profiling', methods=['GET', 'POST'])
+def profiling_admin():
+    if not profiler.authorized(request.headers.get("X-Profile-Token")):
+        return {"error": "Not Found"}, 404  # 未开启或令牌错误时不暴露接口
+    if request.method == 'POST':
+        request_data = request.get_json(silent=True) or {}
+        try:
+            requests_count = int(request_data.get("requests", 1))
+        except (TypeError, ValueError):
+            return {"error": "requests必须是整数"}, 400
+        profiler.arm(requests_count, parse_kinds(request_data.get("kinds")))
+    return profiler.status()
+
+# 下载分析结果：cpu为pstats文件，sample与alloc为折叠栈文本（可用flamegraph.pl或speedscope生成火焰图）
+@app.route('/admin/profiles/<profile_id>/<kind>', methods=['GET'])
+def download_profile(profile_id, kind):
+    if not profiler.authorized(request.headers.get("X-Profile-Token")):
+        return {"error": "Not Found"}, 404
+    session = profiler.get(profile_id)
+    if session is None or kind not in PROFILE_KINDS or kind not in session.results:
+        return {"error": "分析结果不存在或已过期"}, 404
+    extension, mimetype = PROFILE_FORMATS[kind]
+    return send_file(
+        io.BytesIO(session.results[kind]),
+        as_attachment=True,
+        download_name=f"profile-{profile_id}.{extension}",
+        mimetype=mimetype
+    )
+
+# 模型可用性与熔断状态
+@app.route('/health/model', methods=['GET'])
+def model_health():
+    return {
+        "model": model_registry.best_model(),
+        "registry": model_registry.status(),
+        "breaker": ollama_breaker.status(),
+    }
+
 # 启动服务（仅开发环境使用debug模式）
+# 生产环境请使用serve.py：多进程预派生、启动前预热模板与模型、支持平滑重载
+# 或使用uvicorn asgi:app：信息提取与流式接口以协程处理，单进程即可支撑大量并发请求
 if __name__ == "__main__":
     # 确保临时目录存在
     temp_dir = os.path.join(os.path.dirname(__file__), "temp")
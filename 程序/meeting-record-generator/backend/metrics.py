@@ -0,0 +1,254 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 各阶段耗时直方图的默认分桶（秒）：覆盖毫秒级的规则提取到分钟级的模型生成
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    """指标基类：按标签值分组，每组一个子指标"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """取指定标签值对应的子指标（首次使用时创建）"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}需要标签{self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """创建一组标签值对应的子指标"""
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]:
+        """输出全部样本行（不含HELP、TYPE）"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterValue:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """只增计数器"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0):
+        """无标签计数器加amount"""
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # 各分桶的计数（非累计，输出时再累加），最后一个为+Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """统计with代码块的耗时（秒）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """直方图：按分桶统计观测值的分布，以及观测值总和与次数"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        """无标签直方图记录一个观测值"""
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class GaugeCallback(_Metric):
+    """采集时才取值的指标（如队列长度、缓存命中数），值由回调函数返回"""
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], Dict[LabelValues, float]],
+                 labelnames: Sequence[str] = (), type_name: str = "gauge"):
+        """
+        :param fn: 返回{标签值元组: 值}，无标签时键为()
+        :param type_name: gauge，或来自已有统计的累计值时为counter
+        """
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+        self.type_name = type_name
+
+    def _new_child(self):
+        raise TypeError(f"{self.name}的值由回调函数返回，不支持labels()")
+
+    def _samples(self) -> Iterator[str]:
+        try:
+            values = self.fn()
+        except Exception:
+            # 采集失败时不输出该指标的样本，不影响其他指标
+            return
+        for label_values, value in values.items():
+            if value is not None:
+                yield f"{self.name}{_format_labels(self.labelnames, label_values)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """指标注册表，以Prometheus文本格式输出全部指标"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """注册指标；同名指标重复注册时替换（模块重新加载时不报错）"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics: List[_Metric] = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# 进程内共享的指标注册表（多进程部署时各工作进程分别统计）
+REGISTRY = MetricsRegistry()
+
+# 各阶段耗时：classify（会议类型识别）、model（模型提取）、fallback（规则回退提取）、render（Word渲染）
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "meeting_stage_seconds", "Latency of each generation stage in seconds.", ["stage"]))
+# HTTP请求耗时（按接口与状态码）
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "meeting_http_request_seconds", "HTTP request latency in seconds.", ["endpoint", "status"]))
+# 实际执行的提取（缓存命中与相同请求合并另见meeting_cache_*、meeting_single_flight_*）：model、fallback
+EXTRACTIONS = REGISTRY.register(Counter(
+    "meeting_extractions_total", "Meeting extractions by result source.", ["source"]))
+# 使用规则回退的次数（按原因）：no_model、breaker_open、model_error、invalid_json
+FALLBACKS = REGISTRY.register(Counter(
+    "meeting_fallbacks_total", "Rule-based fallback extractions by reason.", ["reason"]))
+# 模型输出不是完整JSON对象的次数
+JSON_FAILURES = REGISTRY.register(Counter(
+    "meeting_model_json_failures_total", "Model outputs that did not form a complete JSON object."))
+# 会议类型分布
+MEETING_TYPES = REGISTRY.register(Counter(
+    "meeting_type_total", "Classified meetings by meeting type.", ["meeting_type"]))
+# 模型吞吐（来自Ollama返回的eval_count/eval_duration与prompt_eval_count/prompt_eval_duration）
+MODEL_TOKENS = REGISTRY.register(Counter(
+    "meeting_model_tokens_total", "Tokens processed by the model.", ["model", "phase"]))
+MODEL_SECONDS = REGISTRY.register(Counter(
+    "meeting_model_eval_seconds_total", "Time the model spent evaluating tokens in seconds.", ["model", "phase"]))
+# 从发出请求到收到第一个token的耗时（排队 + Prompt处理）
+MODEL_FIRST_TOKEN_SECONDS = REGISTRY.register(Histogram(
+    "meeting_model_first_token_seconds", "Time from sending a model request to its first token in seconds.",
+    ["model"]))
+MODEL_TOKENS_PER_SECOND = REGISTRY.register(Histogram(
+    "meeting_model_tokens_per_second", "Model throughput per call in tokens per second.", ["model", "phase"],
+    buckets=(1, 2.5, 5, 10, 20, 40, 80, 160, 320, 640, 1280, 2560)))
+# 长文本分段提取的分段数（只统计超出单次上下文、需要分段的输入）
+TRANSCRIPT_CHUNKS = REGISTRY.register(Histogram(
+    "meeting_transcript_chunks", "Number of chunks a long transcript was split into for extraction.",
+    buckets=(2, 3, 4, 6, 8, 12, 16, 24, 32)))
+# 被取消的生成（按原因与阶段）：disconnect、client；queued、extract、render
+CANCELLATIONS = REGISTRY.register(Counter(
+    "meeting_cancellations_total", "Generations cancelled before completion by reason and stage.",
+    ["reason", "stage"]))
+
+
+def observe_model_stats(model: Optional[str], final_chunk: Dict) -> None:
+    """记录Ollama最后一个输出分块中的token数与耗时统计"""
+    model = model or "unknown"
+    for phase, count_key, duration_key in (("prompt", "prompt_eval_count", "prompt_eval_duration"),
+                                           ("eval", "eval_count", "eval_duration")):
+        count, duration = final_chunk.get(count_key), final_chunk.get(duration_key)
+        if not count or not duration:
+            continue
+        seconds = duration / 1e9
+        MODEL_TOKENS.labels(model, phase).inc(count)
+        MODEL_SECONDS.labels(model, phase).inc(seconds)
+        MODEL_TOKENS_PER_SECOND.labels(model, phase).observe(count / seconds)
@@ -1,9 +1,72 @@
-import ollama
+import ollama_client
 import json
 import re
 import random
 import datetime
-from typing import Dict, List, Any
+import hashlib
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Dict, List, Any, AsyncIterator, Iterator, Optional, Tuple
+from extraction_cache import ExtractionCache, make_cache_key
+from keyword_matcher import KeywordAutomaton
+from field_extractor import FIELD_EXTRACTOR
+from partial_json import TopLevelFieldParser
+from single_flight import FlightAbandoned, SingleFlight
+from long_input import CHUNK_PARALLELISM, chunk_chars_for_context, merge_meeting_infos, split_transcript
+from model_registry import model_registry, ollama_breaker
+from cancellation import cancel_scope, check_cancelled, current_token
+from metrics import (EXTRACTIONS, FALLBACKS, JSON_FAILURES, MEETING_TYPES, MODEL_FIRST_TOKEN_SECONDS, STAGE_SECONDS,
+                     TRANSCRIPT_CHUNKS, observe_model_stats)
+
+# 默认使用的Ollama模型（OLLAMA_MODEL环境变量）
+MODEL_NAME = ollama_client.OLLAMA_MODEL
+
+# 流式提取时推送生成进度的最小间隔（秒）
+STREAM_PROGRESS_INTERVAL = 0.25
+
+# Prompt中会议描述的标题，其后直到末尾都是用户输入的会议文本
+MEETING_TEXT_MARKER = "【会议描述内容】"
+
+# 模型系统提示词
+SYSTEM_PROMPT = """你是一个专业的会议记录助手，擅长从会议描述中准确提取结构化信息。
+你的任务是根据用户提供的会议描述，精确提取并返回JSON格式的结构化数据。
+
+重要要求：
+1. 仔细分析会议描述中的每一个细节
+2. 准确识别人名、地名、时间、主题等信息
+3. 确保JSON格式正确，字段完整
+4. 时间格式统一为：YYYY年MM月DD日 HH:MM-HH:MM
+5. 参会人员用逗号分隔：人员1,人员2,人员3
+6. 如果某项信息未明确提供，填写"待确认"而非"无"
+
+返回格式必须是纯JSON，不包含任何解释或说明文字。"""
+
+# 必需字段（模型输出缺失时由_ensure_required_fields补全）
+REQUIRED_FIELDS = [
+    "meeting_topic", "meeting_location", "meeting_time",
+    "participants", "meeting_duration", "agenda", "global_preparation"
+]
+# 议程项字段
+AGENDA_ITEM_FIELDS = ["title", "leader", "preparation", "participants"]
+
+# 结构化输出Schema：通过Ollama的format参数约束解码，模型只能按该结构（及字段顺序）生成JSON
+MEETING_INFO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        field: {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {item_field: {"type": "string"} for item_field in AGENDA_ITEM_FIELDS},
+                "required": AGENDA_ITEM_FIELDS
+            }
+        } if field == "agenda" else {"type": "string"}
+        for field in REQUIRED_FIELDS
+    },
+    "required": REQUIRED_FIELDS
+}
 
 class MeetingTypeClassifier:
     """会议类型分类器"""
@@ -35,17 +98,19 @@ class MeetingTypeClassifier:
     }
 
     @classmethod
-    def classify_meeting_type(cls, text: str) -> str:
-        """根据文本内容识别会议类型"""
-        text_lower = text.lower()
+    def classify_meeting_type(cls, text: str, hits: Optional[Dict[str, int]] = None) -> str:
+        """
+        根据文本内容识别会议类型
+        :param text: 会议文本
+        :param hits: 已有的关键词扫描结果（KEYWORD_AUTOMATON.count），为空时扫描text
+        """
+        if hits is None:
+            hits = KEYWORD_AUTOMATON.count(text)
         scores = {}
         
+        # 每个类型的得分为该类型出现过的关键词个数
         for meeting_type, keywords in cls.TYPE_KEYWORDS.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in text:
-                    score += 1
-            scores[meeting_type] = score
+            scores[meeting_type] = sum(1 for keyword in keywords if keyword in hits)
             
         # 返回得分最高的会议类型
         max_score = max(scores.values()) if scores else 0
@@ -53,14 +118,98 @@ class MeetingTypeClassifier:
             return "team_meeting"  # 默认类型
         return max(scores, key=scores.get)
 
+class ModelOutput:
+    """
+    模型流式输出的处理：增量解析顶层字段、统计token数与生成速度
+    同步与异步调用共用，调用方只负责从Ollama读取分块
+    """
+    
+    def __init__(self, streamed: Dict[str, Any], model: Optional[str] = None):
+        """
+        :param streamed: 已推送的字段，解析出字段时同步写入
+        :param model: 模型名（记录吞吐指标）
+        """
+        self.parser = TopLevelFieldParser()
+        self.streamed = streamed
+        self.model = model
+        self.tokens = 0
+        self.final_chunk = None
+        self._started_at = time.perf_counter()
+        self._first_token_at: Optional[float] = None
+        self._last_token_at: Optional[float] = None
+        self._last_progress_at = 0.0
+    
+    @property
+    def finished(self) -> bool:
+        """Ollama已结束输出，或顶层JSON对象已闭合（之后的输出不再需要）"""
+        return self.final_chunk is not None or self.parser.closed
+    
+    def feed(self, chunk: Any) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        处理一个输出分块
+        :return: 需要推送的事件（field与节流后的progress）
+        """
+        now = time.perf_counter()
+        if chunk.get("done"):
+            self.final_chunk = chunk
+            return []
+        
+        # Ollama流式输出每块约为一个token
+        self.tokens += 1
+        if self._first_token_at is None:
+            self._first_token_at = now
+            MODEL_FIRST_TOKEN_SECONDS.labels(self.model or "unknown").observe(now - self._started_at)
+        self._last_token_at = now
+        events = []
+        for field, value in self.parser.feed(chunk["message"]["content"] or ""):
+            self.streamed[field] = value
+            events.append(("field", {"name": field, "value": value}))
+        if not self.parser.closed and now - self._last_progress_at >= STREAM_PROGRESS_INTERVAL:
+            self._last_progress_at = now
+            events.append(("progress", {"tokens": self.tokens, "tokens_per_second": self._rate(now), "done": False}))
+        return events
+    
+    def summary(self) -> Tuple[str, Dict[str, Any]]:
+        """输出结束后的最终progress事件"""
+        final_chunk = self.final_chunk
+        if final_chunk is not None:
+            observe_model_stats(self.model, final_chunk)
+        elif self.tokens > 1:
+            # JSON闭合后提前关闭了连接，收不到Ollama的统计，按本地计时估算生成吞吐
+            observe_model_stats(self.model, {
+                "eval_count": self.tokens - 1,
+                "eval_duration": (self._last_token_at - self._first_token_at) * 1e9,
+            })
+        if final_chunk is not None and final_chunk.get("eval_duration"):
+            # 正常结束时使用Ollama统计的准确token数与生成耗时
+            tokens = final_chunk.get("eval_count") or self.tokens
+            tokens_per_second = round(tokens / (final_chunk["eval_duration"] / 1e9), 1)
+        else:
+            tokens, tokens_per_second = self.tokens, self._rate(time.perf_counter())
+        return "progress", {"tokens": tokens, "tokens_per_second": tokens_per_second, "done": True}
+    
+    def _rate(self, now: float) -> Optional[float]:
+        elapsed = now - self._first_token_at if self._first_token_at is not None else 0
+        return round(self.tokens / elapsed, 1) if elapsed > 0 else None
+
 class AdvancedMeetingExtractor:
     """高级会议信息提取器"""
     
-    def __init__(self):
+    # 规则提取使用的关键词表（按优先级排列），会议时间、地点、时长由FIELD_EXTRACTOR提取
+    PEOPLE_KEYWORDS = ['张三', '李四', '王五', '赵六', '经理', '主管', '工程师', '同事', '成员']
+    TOPIC_KEYWORDS = ['项目', '讨论', '会议', '计划', '培训', '汇报', '决策', '复盘', '头脑风暴']
+    
+    def __init__(self, cache: Optional[ExtractionCache] = None):
         self.classifier = MeetingTypeClassifier()
+        # 未指定时使用进程内共享的提取结果缓存
+        self.cache = cache if cache is not None else extraction_cache
     
-    def get_meeting_prompt_by_type(self, meeting_type: str, input_text: str) -> str:
-        """根据会议类型获取对应的Prompt"""
+    @staticmethod
+    def build_prompt_prefix(meeting_type: str) -> str:
+        """
+        构建指定会议类型的Prompt前缀（会议文本之前的全部内容）
+        前缀只与会议类型有关，模块加载时为每种类型构建一次，见PROMPT_PREFIXES
+        """
         
         base_fields = """
     - meeting_topic: 会议主题
@@ -78,69 +227,69 @@ class AdvancedMeetingExtractor:
         
         type_specific_prompts = {
             "team_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 团队目标和工作安排
 - 成员工作进度和问题
 - 团队协作和沟通事项
 {base_fields}""",
             "project_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 项目目标和里程碑
 - 技术实现方案和难点
 - 资源和时间安排
 - 风险和依赖关系
 {base_fields}""",
             "decision_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 需要决策的具体问题
 - 备选方案对比
 - 决策标准和依据
 - 决策结果和执行计划
 {base_fields}""",
             "training_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 培训主题和内容
 - 讲师和学员信息
 - 学习目标和期望成果
 - 培训方式和方法
 {base_fields}""",
             "client_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 客户需求和期望
 - 解决方案和服务内容
 - 商务条件和合作细节
 - 下一步行动计划
 {base_fields}""",
             "brainstorming_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 创意主题和目标
 - 讨论方向和重点
 - 创新想法和建议
 - 可行性分析
 {base_fields}""",
             "progress_report_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 已完成的工作和成果
 - 当前进展和状态
 - 遇到的问题和困难
 - 下一步计划和安排
 {base_fields}""",
             "problem_solving_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 具体问题和挑战
 - 问题分析和根本原因
 - 解决方案和行动计划
 - 责任分工和时间安排
 {base_fields}""",
             "planning_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 目标设定和计划内容
 - 时间线和里程碑
 - 资源配置和分工
 - 风险评估和应对措施
 {base_fields}""",
             "review_meeting": f"""
-这是{self.classifier.MEETING_TYPES[meeting_type]}，请重点关注：
+这是{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}，请重点关注：
 - 回顾期间和范围
 - 主要成果和经验
 - 问题和教训总结
@@ -148,12 +297,10 @@ class AdvancedMeetingExtractor:
 {base_fields}"""
         }
         
-        return f"""你是一个专业的会议记录专家，擅长从{self.classifier.MEETING_TYPES[meeting_type]}描述中准确提取关键信息。
+        # 会议描述放在最后：同类型请求的Prompt前缀完全相同，Ollama可复用已计算的前缀缓存
+        return f"""你是一个专业的会议记录专家，擅长从{MeetingTypeClassifier.MEETING_TYPES[meeting_type]}描述中准确提取关键信息。
 
-【任务】仔细分析以下会议描述，提取所有可见的详细信息
-
-【会议描述内容】
-{input_text}
+【任务】仔细分析文末的会议描述，提取所有可见的详细信息
 
 【需要提取的结构化字段】
 {type_specific_prompts.get(meeting_type, base_fields)}
@@ -180,107 +327,435 @@ class AdvancedMeetingExtractor:
 - agenda必须是严格的数组格式
 
 【输出要求】
-返回标准JSON格式，必须包含所有字段，不包含任何解释文字："""
+返回标准JSON格式，必须包含所有字段，不包含任何解释文字
+
+{MEETING_TEXT_MARKER}
+"""
+    
+    def get_meeting_prompt_by_type(self, meeting_type: str, input_text: str) -> str:
+        """根据会议类型获取对应的Prompt（预构建的类型前缀 + 会议描述）"""
+        return PROMPT_PREFIXES[meeting_type] + input_text
+    
+    def _classify(self, input_text: str) -> str:
+        """识别会议类型，并记录耗时与类型分布"""
+        with STAGE_SECONDS.labels("classify").time():
+            meeting_type = self.classifier.classify_meeting_type(input_text)
+        MEETING_TYPES.labels(meeting_type).inc()
+        return meeting_type
+    
+    @staticmethod
+    def _record_extraction(response: Dict, model_seconds: float):
+        """记录一次模型提取（或规则回退）的耗时"""
+        source = "fallback" if response.get("fallback") else "model"
+        STAGE_SECONDS.labels(source).observe(model_seconds)
+        EXTRACTIONS.labels(source).inc()
+    
+    def extraction_key(self, input_text: str) -> str:
+        """
+        提取结果的内容标识（与缓存键相同）：规范化文本、模型、会议类型与Prompt版本的哈希
+        只做规则分类与模型选择，不调用模型；/extract接口以此作为ETag
+        """
+        meeting_type = self.classifier.classify_meeting_type(input_text)
+        model = model_registry.best_model()
+        return make_cache_key(input_text, model or MODEL_NAME, meeting_type, PROMPT_VERSION)
     
     def extract_meeting_info(self, input_text: str) -> Dict[str, Any]:
         """提取会议关键信息"""
         # 1. 识别会议类型
-        meeting_type = self.classifier.classify_meeting_type(input_text)
+        meeting_type = self._classify(input_text)
+        
+        # 2. 从已安装模型中选择优先级最高的模型（None表示没有可用的候选模型）
+        model = model_registry.best_model()
         
-        # 2. 获取对应的Prompt
-        prompt = self.get_meeting_prompt_by_type(meeting_type, input_text)
+        # 3. 查询缓存：相同文本、模型、会议类型与Prompt版本直接复用上次结果
+        cache_key = make_cache_key(input_text, model or MODEL_NAME, meeting_type, PROMPT_VERSION)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # 4. 合并相同请求：同一文本、模型与会议类型同时只调用一次模型，并发的相同请求共享结果
+        return extraction_flight.do(
+            cache_key, lambda: self._extract_uncached(input_text, meeting_type, model, cache_key))
+    
+    def _extract_uncached(self, input_text: str, meeting_type: str, model: Optional[str],
+                          cache_key: str) -> Dict[str, Any]:
+        """调用模型提取会议信息并写入缓存（extract_meeting_info未命中缓存时调用）"""
+        # 1. 会议文本超出单个Prompt的容量时切分为多段
+        chunks = self.split_input(input_text, meeting_type, model)
         
-        # 3. 调用模型提取信息
+        # 2. 调用模型提取信息（多段时并发提取后合并）
         try:
-            response = self._call_model(prompt)
-            
-            # 4. 解析返回结果
-            model_output = response["message"]["content"].strip()
-            meeting_info = json.loads(model_output)
+            model_start = time.perf_counter()
+            if len(chunks) > 1:
+                response = self._call_model_chunked(meeting_type, chunks, model)
+            else:
+                response = self._call_model(self.get_meeting_prompt_by_type(meeting_type, input_text), model)
+            model_seconds = time.perf_counter() - model_start
+            self._record_extraction(response, model_seconds)
             
-            # 5. 添加会议类型信息
-            meeting_info["meeting_type"] = meeting_type
-            meeting_info["meeting_type_display"] = self.classifier.MEETING_TYPES[meeting_type]
+            # 3. 添加会议类型信息，确保所有必需字段存在（模型输出在流式接收时已解析，无需再次解析）
+            meeting_info = response["meeting_info"]
+            self._complete_meeting_info(meeting_info, meeting_type)
             
-            # 6. 确保所有必需字段存在
-            self._ensure_required_fields(meeting_info)
+            # 4. 只缓存模型真实返回的结果，回退数据不缓存（Ollama恢复后应重新提取）
+            if not response.get("fallback"):
+                self.cache.put(cache_key, meeting_info, model_seconds)
             
             return meeting_info
             
         except Exception as e:
             raise Exception(f"信息提取失败：{str(e)}")
     
-    def _call_model(self, prompt: str) -> Dict:
-        """调用Ollama模型，优化提示词确保准确提取会议信息"""
-        # 首先尝试Ollama模型
+    def stream_meeting_info(self, input_text: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        流式提取会议关键信息：流程与extract_meeting_info相同，但边生成边返回事件
+        :param input_text: 会议描述文本
+        :return: (事件名, 数据)迭代器，事件依次为：
+                 classified：会议类型；progress：已生成token数与生成速度；
+                 field：一个完整的顶层字段（同名字段以后到的为准）；result：最终结构化结果（最后一个事件）
+        """
+        # 1. 识别会议类型（无需等待模型，立即返回）
+        meeting_type = self._classify(input_text)
+        yield "classified", {
+            "meeting_type": meeting_type,
+            "meeting_type_display": self.classifier.MEETING_TYPES[meeting_type],
+        }
+        
+        # 2. 选择模型并查询缓存
+        model = model_registry.best_model()
+        cache_key = make_cache_key(input_text, model or MODEL_NAME, meeting_type, PROMPT_VERSION)
+        meeting_info = self.cache.get(cache_key)
+        # 已推送给调用方的字段，最终结果中未推送或有变化的字段在最后补发
+        streamed: Dict[str, Any] = {}
+        
+        while meeting_info is None:
+            # 3. 合并相同请求：相同请求正在提取时等待并共享其结果
+            flight, leader = extraction_flight.begin(cache_key)
+            if not leader:
+                try:
+                    meeting_info = flight.wait()
+                except FlightAbandoned:
+                    continue
+                break
+            
+            # 4. 流式调用模型，字段一旦完整就推送
+            try:
+                meeting_info = yield from self._stream_uncached(input_text, meeting_type, model, cache_key, streamed)
+            except BaseException as e:
+                # 调用方中途断开（GeneratorExit）时，等待者收到FlightAbandoned后自行重新提取
+                extraction_flight.finish(cache_key, flight, error=e)
+                raise
+            extraction_flight.finish(cache_key, flight, meeting_info)
+        
+        # 5. 补发缓存、共享结果、回退结果或补全后的字段
+        for field, value in meeting_info.items():
+            if field not in streamed or streamed[field] != value:
+                yield "field", {"name": field, "value": value}
+        yield "result", meeting_info
+    
+    def _stream_uncached(self, input_text: str, meeting_type: str, model: Optional[str], cache_key: str,
+                         streamed: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        流式调用模型提取会议信息并写入缓存（长文本分段提取，合并后一次推送）
+        :return: 生成器返回值（通过yield from获取）为结构化字典
+        """
+        chunks = self.split_input(input_text, meeting_type, model)
         try:
-            # 优化的模型调用，使用更精确的提示词
-            response = ollama.chat(
-                model="llama3:8b",
-                messages=[{
-                    "role": "system",
-                    "content": """你是一个专业的会议记录助手，擅长从会议描述中准确提取结构化信息。
-你的任务是根据用户提供的会议描述，精确提取并返回JSON格式的结构化数据。
-
-重要要求：
-1. 仔细分析会议描述中的每一个细节
-2. 准确识别人名、地名、时间、主题等信息
-3. 确保JSON格式正确，字段完整
-4. 时间格式统一为：YYYY年MM月DD日 HH:MM-HH:MM
-5. 参会人员用逗号分隔：人员1,人员2,人员3
-6. 如果某项信息未明确提供，填写"待确认"而非"无"
-
-返回格式必须是纯JSON，不包含任何解释或说明文字。"""
-                }, {
-                    "role": "user", 
-                    "content": prompt
-                }]
-            )
+            model_start = time.perf_counter()
+            if len(chunks) > 1:
+                response = self._call_model_chunked(meeting_type, chunks, model)
+            else:
+                prompt = self.get_meeting_prompt_by_type(meeting_type, input_text)
+                response = yield from self._stream_model(prompt, model, streamed)
+            model_seconds = time.perf_counter() - model_start
+            self._record_extraction(response, model_seconds)
             
-            # 验证返回内容
-            if response and "message" in response:
-                content = response["message"]["content"].strip()
-                
-                # 尝试解析JSON
+            meeting_info = response["meeting_info"]
+            self._complete_meeting_info(meeting_info, meeting_type)
+            if not response.get("fallback"):
+                self.cache.put(cache_key, meeting_info, model_seconds)
+            return meeting_info
+        except Exception as e:
+            raise Exception(f"信息提取失败：{str(e)}")
+    
+    async def astream_meeting_info(self, input_text: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        stream_meeting_info的协程版本：事件与同步版本相同，等待模型期间不占用线程
+        与同步版本共用缓存与相同请求合并，同步与异步的相同请求互相合并；
+        可能访问磁盘或Ollama的步骤（模型选择、缓存、上下文长度查询）在线程池中执行
+        """
+        meeting_type = self._classify(input_text)
+        yield "classified", {
+            "meeting_type": meeting_type,
+            "meeting_type_display": self.classifier.MEETING_TYPES[meeting_type],
+        }
+        
+        model = await asyncio.to_thread(model_registry.best_model)
+        cache_key = make_cache_key(input_text, model or MODEL_NAME, meeting_type, PROMPT_VERSION)
+        meeting_info = await asyncio.to_thread(self.cache.get, cache_key)
+        streamed: Dict[str, Any] = {}
+        
+        while meeting_info is None:
+            flight, leader = extraction_flight.begin(cache_key)
+            if not leader:
                 try:
-                    json.loads(content)
-                    return response
-                except json.JSONDecodeError:
-                    print(f"JSON解析失败，重新生成: {content[:100]}...")
-                    # 如果JSON解析失败，使用智能回退
-                    return self._smart_fallback(prompt)
+                    meeting_info = await flight.wait_async()
+                except FlightAbandoned:
+                    continue
+                break
+            
+            try:
+                async for event in self._astream_uncached(input_text, meeting_type, model, cache_key, streamed):
+                    if event[0] == "result":
+                        meeting_info = event[1]
+                    else:
+                        yield event
+            except BaseException as e:
+                # 调用方断开（CancelledError、GeneratorExit）时，等待者收到FlightAbandoned后自行重新提取
+                extraction_flight.finish(cache_key, flight, error=e)
+                raise
+            extraction_flight.finish(cache_key, flight, meeting_info)
+        
+        for field, value in meeting_info.items():
+            if field not in streamed or streamed[field] != value:
+                yield "field", {"name": field, "value": value}
+        yield "result", meeting_info
+    
+    async def _astream_uncached(self, input_text: str, meeting_type: str, model: Optional[str], cache_key: str,
+                                streamed: Dict[str, Any]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """_stream_uncached的协程版本，最后一个事件为("result", 结构化字典)"""
+        try:
+            chunks = await asyncio.to_thread(self.split_input, input_text, meeting_type, model)
+            model_start = time.perf_counter()
+            if len(chunks) > 1:
+                response = await self._acall_model_chunked(meeting_type, chunks, model)
             else:
-                raise Exception("Ollama返回格式异常")
-                
+                prompt = self.get_meeting_prompt_by_type(meeting_type, input_text)
+                response = None
+                async for event in self._astream_model(prompt, model, streamed):
+                    if event[0] == "response":
+                        response = event[1]
+                    else:
+                        yield event
+            model_seconds = time.perf_counter() - model_start
+            self._record_extraction(response, model_seconds)
+            
+            meeting_info = response["meeting_info"]
+            self._complete_meeting_info(meeting_info, meeting_type)
+            if not response.get("fallback"):
+                await asyncio.to_thread(self.cache.put, cache_key, meeting_info, model_seconds)
         except Exception as e:
-            print(f"Ollama模型调用失败: {str(e)}")
-            print("使用智能回退系统...")
-            return self._smart_fallback(prompt)
+            raise Exception(f"信息提取失败：{str(e)}")
+        yield "result", meeting_info
+    
+    async def aextract_meeting_info(self, input_text: str) -> Dict[str, Any]:
+        """extract_meeting_info的协程版本"""
+        events = self.astream_meeting_info(input_text)
+        try:
+            async for event, data in events:
+                if event == "result":
+                    return data
+        finally:
+            await events.aclose()
+    
+    def split_input(self, input_text: str, meeting_type: str, model: Optional[str]) -> List[str]:
+        """
+        按模型上下文长度切分会议文本
+        :return: 分段列表；单个Prompt能容纳全文时只有一段
+        """
+        prompt_chars = len(SYSTEM_PROMPT) + len(PROMPT_PREFIXES[meeting_type])
+        max_chars = chunk_chars_for_context(model_registry.context_length(model), prompt_chars)
+        return split_transcript(input_text, max_chars)
+    
+    def _call_model_chunked(self, meeting_type: str, chunks: List[str], model: Optional[str]) -> Dict:
+        """
+        长文本map-reduce提取：各分段并发调用模型，再按确定的规则合并（见merge_meeting_infos）
+        :return: 与_call_model结构相同；任一分段使用了规则回退时fallback为True（结果不缓存）
+        """
+        prompts = [self.get_meeting_prompt_by_type(meeting_type, chunk) for chunk in chunks]
+        # 各分段线程沿用调用方的取消标记，取消后所有分段都停止生成
+        token = current_token()
+        
+        def call(prompt: str) -> Dict:
+            with cancel_scope(token):
+                return self._call_model(prompt, model)
+        
+        with ThreadPoolExecutor(max_workers=min(CHUNK_PARALLELISM, len(prompts))) as executor:
+            # map按分段顺序返回结果，合并结果与各分段完成的先后无关
+            responses = list(executor.map(call, prompts))
+        TRANSCRIPT_CHUNKS.observe(len(chunks))
+        return {
+            "meeting_info": merge_meeting_infos([response["meeting_info"] for response in responses]),
+            "fallback": any(response["fallback"] for response in responses)
+        }
     
-    def _smart_fallback(self, prompt: str) -> Dict:
-        """智能回退系统：结合AI和规则的信息提取"""
-        # 基于关键词和规则生成高质量会议数据
-        meeting_info = self._generate_smart_mock_data(prompt)
+    async def _acall_model_chunked(self, meeting_type: str, chunks: List[str], model: Optional[str]) -> Dict:
+        """_call_model_chunked的协程版本：各分段作为协程并发，并发数同样受CHUNK_PARALLELISM限制"""
+        slots = asyncio.Semaphore(CHUNK_PARALLELISM)
         
-        # 模拟Ollama返回格式
+        async def call(chunk: str) -> Dict:
+            async with slots:
+                return await self._acall_model(self.get_meeting_prompt_by_type(meeting_type, chunk), model)
+        
+        # gather按分段顺序返回结果
+        responses = await asyncio.gather(*(call(chunk) for chunk in chunks))
+        TRANSCRIPT_CHUNKS.observe(len(chunks))
         return {
-            "message": {
-                "content": json.dumps(meeting_info, ensure_ascii=False, indent=2)
-            }
+            "meeting_info": merge_meeting_infos([response["meeting_info"] for response in responses]),
+            "fallback": any(response["fallback"] for response in responses)
+        }
+    
+    def _stream_model(self, prompt: str, model: Optional[str],
+                      streamed: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        流式调用Ollama模型，边生成边返回progress与field事件
+        使用MEETING_INFO_SCHEMA约束解码，输出边生成边解析（每个字段只解析一次），
+        顶层JSON对象闭合后立即关闭连接，不再等待模型输出多余的空白或结束标记；
+        没有可用模型、熔断、调用失败或JSON不完整时使用智能回退；
+        当前生成被取消时（见cancellation.py）在分块之间抛出Cancelled并关闭连接，Ollama随即停止生成
+        :param prompt: 完整Prompt
+        :param model: 模型名，None表示没有可用模型
+        :param streamed: 已推送的字段，推送字段时同步写入
+        :return: 生成器返回值（通过yield from获取）：{"meeting_info": 结构化字典, "fallback": 是否来自规则回退}
+        """
+        if model is None:
+            print("未找到可用的Ollama模型，使用智能回退系统...")
+            return self._smart_fallback(prompt, "no_model")
+        if not ollama_breaker.allow():
+            return self._smart_fallback(prompt, "breaker_open")
+        
+        try:
+            check_cancelled()
+            output = ModelOutput(streamed, model)
+            try:
+                # 使用进程内共享的长连接客户端，连接/读取/总时长超时后抛出异常并进入智能回退
+                with closing(ollama_client.chat_stream(
+                    model=model, messages=self._build_messages(prompt), format=MEETING_INFO_SCHEMA
+                )) as stream:
+                    for chunk in stream:
+                        # Cancelled不是Exception，不进入智能回退，直接关闭连接后向上抛出
+                        check_cancelled()
+                        yield from output.feed(chunk)
+                        # 顶层对象已闭合：提前停止生成（关闭流后Ollama随即停止）
+                        if output.finished:
+                            break
+            except Exception as e:
+                return self._model_failed(prompt, e)
+            
+            yield output.summary()
+            return self._model_response(prompt, output)
+        except BaseException:
+            # 生成被取消（Cancelled）或调用方断开（GeneratorExit）：不记录成败，交还熔断器半开状态的探测名额
+            ollama_breaker.release_probe()
+            raise
+    
+    async def _astream_model(self, prompt: str, model: Optional[str],
+                             streamed: Dict[str, Any]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        _stream_model的协程版本：等待模型输出期间不占用线程
+        异步生成器不能返回值，最后一个事件为("response", 与_call_model结构相同的响应)
+        """
+        if model is None:
+            print("未找到可用的Ollama模型，使用智能回退系统...")
+            yield "response", self._smart_fallback(prompt, "no_model")
+            return
+        if not ollama_breaker.allow():
+            yield "response", self._smart_fallback(prompt, "breaker_open")
+            return
+        
+        try:
+            output = ModelOutput(streamed, model)
+            try:
+                stream = ollama_client.achat_stream(
+                    model=model, messages=self._build_messages(prompt), format=MEETING_INFO_SCHEMA)
+                try:
+                    async for chunk in stream:
+                        for event in output.feed(chunk):
+                            yield event
+                        if output.finished:
+                            break
+                finally:
+                    await stream.aclose()
+            except Exception as e:
+                yield "response", self._model_failed(prompt, e)
+                return
+            
+            yield output.summary()
+            yield "response", self._model_response(prompt, output)
+        except BaseException:
+            # 任务被取消（CancelledError）或调用方关闭生成器：不记录成败，交还熔断器半开状态的探测名额
+            ollama_breaker.release_probe()
+            raise
+    
+    @staticmethod
+    def _build_messages(prompt: str) -> List[Dict[str, str]]:
+        return [{
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        }, {
+            "role": "user",
+            "content": prompt
+        }]
+    
+    def _model_failed(self, prompt: str, error: Exception) -> Dict:
+        """模型调用失败：记录到熔断器并使用智能回退"""
+        ollama_breaker.record_failure()
+        print(f"Ollama模型调用失败: {str(error)}")
+        print("使用智能回退系统...")
+        return self._smart_fallback(prompt, "model_error")
+    
+    def _model_response(self, prompt: str, output: "ModelOutput") -> Dict:
+        """模型正常返回（即使输出不完整，服务本身是健康的）：输出完整时使用解析结果，否则使用智能回退"""
+        ollama_breaker.record_success()
+        if not output.parser.closed:
+            print(f"模型输出的JSON不完整，使用智能回退系统: {output.parser.text[:100]}...")
+            JSON_FAILURES.inc()
+            return self._smart_fallback(prompt, "invalid_json")
+        return {"meeting_info": output.parser.fields, "fallback": False}
+    
+    def _call_model(self, prompt: str, model: Optional[str] = MODEL_NAME) -> Dict:
+        """
+        调用Ollama模型，优化提示词确保准确提取会议信息
+        与_stream_model相同，只是不向调用方推送事件
+        :param prompt: 完整Prompt
+        :param model: 模型名，None表示没有可用模型，直接使用智能回退
+        :return: {"meeting_info": 结构化字典, "fallback": 是否来自规则回退}
+        """
+        events = self._stream_model(prompt, model, {})
+        while True:
+            try:
+                next(events)
+            except StopIteration as stop:
+                return stop.value
+    
+    async def _acall_model(self, prompt: str, model: Optional[str] = MODEL_NAME) -> Dict:
+        """_call_model的协程版本"""
+        async for event, data in self._astream_model(prompt, model, {}):
+            if event == "response":
+                return data
+    
+    def _smart_fallback(self, prompt: str, reason: str) -> Dict:
+        """
+        智能回退系统：结合AI和规则的信息提取
+        :param reason: 回退原因（no_model、breaker_open、model_error、invalid_json），计入meeting_fallbacks_total
+        """
+        FALLBACKS.labels(reason).inc()
+        # 基于关键词和规则生成高质量会议数据（fallback标记该结果来自规则回退）
+        return {
+            "meeting_info": self._generate_smart_mock_data(prompt),
+            "fallback": True
         }
 
     def _generate_smart_mock_data(self, prompt: str) -> Dict[str, Any]:
         """智能模拟数据生成：基于规则的高质量会议数据生成"""
-        # 从prompt中提取会议类型和输入文本
-        meeting_type = "team_meeting"
-        input_text = prompt
+        # 从prompt中取出会议文本（位于末尾），只对会议文本做规则提取，避免命中Prompt模板中的示例词汇
+        input_text = prompt.rsplit(MEETING_TEXT_MARKER + "\n", 1)[-1]
+        
+        # 单次扫描会议文本，得到所有关键词的命中次数，后续规则提取复用该结果
+        hits = KEYWORD_AUTOMATON.count(input_text)
         
         # 通过关键词识别会议类型
-        for mt, keywords in self.classifier.TYPE_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in prompt:
-                    meeting_type = mt
-                    break
+        meeting_type = self.classifier.classify_meeting_type(input_text, hits)
         
         # 基础数据模板
         base_data = {
@@ -396,15 +871,21 @@ class AdvancedMeetingExtractor:
             base_data.update(optimized_data)
         
         # 从原文本中提取可见信息进行补充
-        extracted_info = self._extract_info_from_text(prompt)
+        extracted_info = self._extract_info_from_text(input_text, hits)
         for key, value in extracted_info.items():
             if value != "待确认":
                 base_data[key] = value
         
         return base_data
 
-    def _extract_info_from_text(self, prompt: str) -> Dict[str, str]:
-        """从文本中提取可见信息"""
+    def _extract_info_from_text(self, prompt: str, hits: Optional[Dict[str, int]] = None) -> Dict[str, str]:
+        """
+        从文本中提取可见信息
+        :param prompt: 待提取文本
+        :param hits: 已有的关键词扫描结果（KEYWORD_AUTOMATON.count），为空时扫描prompt
+        """
+        if hits is None:
+            hits = KEYWORD_AUTOMATON.count(prompt)
         extracted = {
             "meeting_topic": "待确认",
             "meeting_location": "待确认", 
@@ -413,82 +894,86 @@ class AdvancedMeetingExtractor:
             "meeting_duration": "待确认"
         }
         
-        # 会议时间提取模式
-        time_patterns = [
-            r'(\d{4})年(\d{1,2})月(\d{1,2})日\s*(\d{1,2}):(\d{1,2})[-,到](\d{1,2}):(\d{1,2})',
-            r'(\d{4})-(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{1,2})[-,到](\d{1,2}):(\d{1,2})',
-            r'(\d{1,2})月(\d{1,2})日\s*(\d{1,2}):(\d{1,2})[-,到](\d{1,2}):(\d{1,2})'
-        ]
-        
-        for pattern in time_patterns:
-            import re
-            match = re.search(pattern, prompt)
-            if match:
-                if len(match.groups()) == 7:
-                    year, month, day, start_h, start_m, end_h, end_m = match.groups()
-                    extracted["meeting_time"] = f"{year}年{month}月{day}日 {start_h}:{start_m}-{end_h}:{end_m}"
-                elif len(match.groups()) == 5:
-                    month, day, start_h, start_m, end_h, end_m = match.groups()
-                    extracted["meeting_time"] = f"2025年{month}月{day}日 {start_h}:{start_m}-{end_h}:{end_m}"
-                break
-        
-        # 会议地点提取
-        location_patterns = ['会议室', '办公室', '培训室', '讨论室', '大厅', '在线']
-        for location in location_patterns:
-            if location in prompt:
-                extracted["meeting_location"] = location
-                break
+        # 会议时间、日期范围、地点、时长：单次扫描提取
+        fields = FIELD_EXTRACTOR.extract(prompt)
+        if "meeting_time" in fields:
+            extracted["meeting_time"] = fields["meeting_time"].value
+        elif "date_range" in fields:
+            extracted["meeting_time"] = fields["date_range"].value
+        if "meeting_location" in fields:
+            extracted["meeting_location"] = fields["meeting_location"].value
+        if "meeting_duration" in fields:
+            extracted["meeting_duration"] = fields["meeting_duration"].value
         
         # 参会人员提取（简单的关键词匹配）
-        people_keywords = ['张三', '李四', '王五', '赵六', '经理', '主管', '工程师', '同事', '成员']
-        found_people = []
-        for person in people_keywords:
-            if person in prompt:
-                found_people.append(person)
+        found_people = [person for person in self.PEOPLE_KEYWORDS if person in hits]
         
         if found_people:
             extracted["participants"] = ",".join(found_people)
         
         # 会议主题提取
-        topic_keywords = ['项目', '讨论', '会议', '计划', '培训', '汇报', '决策', '复盘', '头脑风暴']
-        for keyword in topic_keywords:
-            if keyword in prompt:
-                if '项目' in prompt:
+        for keyword in self.TOPIC_KEYWORDS:
+            if keyword in hits:
+                if '项目' in hits:
                     extracted["meeting_topic"] = "项目会议"
-                elif '培训' in prompt:
+                elif '培训' in hits:
                     extracted["meeting_topic"] = "培训会议"
-                elif '汇报' in prompt:
+                elif '汇报' in hits:
                     extracted["meeting_topic"] = "汇报会议"
-                elif '决策' in prompt:
+                elif '决策' in hits:
                     extracted["meeting_topic"] = "决策会议"
-                elif '复盘' in prompt:
+                elif '复盘' in hits:
                     extracted["meeting_topic"] = "复盘会议"
-                elif '头脑风暴' in prompt:
+                elif '头脑风暴' in hits:
                     extracted["meeting_topic"] = "头脑风暴会议"
                 else:
                     extracted["meeting_topic"] = f"{keyword}会议"
                 break
         
-        # 计算会议时长（如果提取到时间）
-        if extracted["meeting_time"] != "待确认":
-            extracted["meeting_duration"] = "1-2小时"
-        
         return extracted
     
+    def _complete_meeting_info(self, meeting_info: Dict, meeting_type: str):
+        """添加会议类型信息，并确保所有必需字段存在"""
+        meeting_info["meeting_type"] = meeting_type
+        meeting_info["meeting_type_display"] = self.classifier.MEETING_TYPES[meeting_type]
+        self._ensure_required_fields(meeting_info)
+    
     def _ensure_required_fields(self, meeting_info: Dict):
         """确保必需字段存在"""
-        required_fields = [
-            "meeting_topic", "meeting_location", "meeting_time", 
-            "participants", "meeting_duration", "agenda", "global_preparation"
-        ]
-        
-        for field in required_fields:
+        for field in REQUIRED_FIELDS:
             if field not in meeting_info:
                 meeting_info[field] = "无"
             # 特殊处理agenda：若为非数组，转为空数组
             if field == "agenda" and not isinstance(meeting_info[field], list):
                 meeting_info[field] = []
 
+# 所有规则关键词（会议类型、人员、主题）编译为同一个自动机，一次扫描得到全部命中
+KEYWORD_AUTOMATON = KeywordAutomaton(
+    [keyword for keywords in MeetingTypeClassifier.TYPE_KEYWORDS.values() for keyword in keywords]
+    + AdvancedMeetingExtractor.PEOPLE_KEYWORDS
+    + AdvancedMeetingExtractor.TOPIC_KEYWORDS
+)
+
+# 各会议类型的Prompt前缀，模块加载时构建一次
+PROMPT_PREFIXES = {
+    meeting_type: AdvancedMeetingExtractor.build_prompt_prefix(meeting_type)
+    for meeting_type in MeetingTypeClassifier.MEETING_TYPES
+}
+
+def _compute_prompt_version() -> str:
+    """Prompt版本：系统提示词、输出Schema与各类型Prompt前缀的哈希，模板变化后旧缓存自动失效"""
+    digest = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8"))
+    digest.update(json.dumps(MEETING_INFO_SCHEMA, sort_keys=True).encode("utf-8"))
+    for meeting_type, prefix in PROMPT_PREFIXES.items():
+        digest.update(meeting_type.encode("utf-8"))
+        digest.update(prefix.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+# 进程内共享的提取结果缓存，以及进行中的相同请求合并
+extraction_cache = ExtractionCache()
+extraction_flight = SingleFlight()
+PROMPT_VERSION = _compute_prompt_version()
+
 def extract_meeting_info(input_text: str) -> Dict[str, Any]:
     """
     对外接口：提取会议关键信息
@@ -496,4 +981,32 @@ def extract_meeting_info(input_text: str) -> Dict[str, Any]:
     :return: 结构化字典（含会议类型、主题、地点、参会者等字段）
     """
     extractor = AdvancedMeetingExtractor()
-    return extractor.extract_meeting_info(input_text)
\ No newline at end of file
+    return extractor.extract_meeting_info(input_text)
+
+def stream_meeting_info(input_text: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    对外接口：流式提取会议关键信息
+    :param input_text: 用户输入的会议描述文本
+    :return: (事件名, 数据)迭代器，最后一个事件为("result", 结构化字典)
+    """
+    extractor = AdvancedMeetingExtractor()
+    return extractor.stream_meeting_info(input_text)
+
+def extraction_key(input_text: str) -> str:
+    """
+    对外接口：提取结果的内容标识（不调用模型）
+    :param input_text: 用户输入的会议描述文本
+    :return: 文本、模型、会议类型与Prompt版本相同时不变的哈希；模型结果写入缓存时以此为键
+    """
+    extractor = AdvancedMeetingExtractor()
+    return extractor.extraction_key(input_text)
+
+async def aextract_meeting_info(input_text: str) -> Dict[str, Any]:
+    """对外接口：extract_meeting_info的协程版本（ASGI服务使用）"""
+    extractor = AdvancedMeetingExtractor()
+    return await extractor.aextract_meeting_info(input_text)
+
+def astream_meeting_info(input_text: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """对外接口：stream_meeting_info的协程版本（ASGI服务使用），返回异步迭代器"""
+    extractor = AdvancedMeetingExtractor()
+    return extractor.astream_meeting_info(input_text)
\ No newline at end of file
@@ -0,0 +1,212 @@
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import ollama_client
+
+# 候选模型（按优先级排列，去重），默认优先使用OLLAMA_MODEL
+MODEL_CANDIDATES = list(dict.fromkeys(name.strip() for name in os.environ.get(
+    "OLLAMA_MODEL_CANDIDATES", f"{ollama_client.OLLAMA_MODEL},llama3:8b,phi3:mini,llama3").split(",") if name.strip()))
+# 已安装模型列表的后台刷新间隔（秒）
+MODEL_REFRESH_INTERVAL = float(os.environ.get("OLLAMA_MODEL_REFRESH", "60"))
+# 熔断器：连续失败多少次后熔断，熔断后多少秒允许一次探测请求
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("OLLAMA_BREAKER_THRESHOLD", "3"))
+BREAKER_RESET_TIMEOUT = float(os.environ.get("OLLAMA_BREAKER_RESET", "30"))
+# Ollama服务端实际使用的上下文长度（token）；未设置时取模型参数num_ctx，再不行取模型上限与Ollama默认值4096的较小者
+OLLAMA_NUM_CTX = int(os.environ.get("OLLAMA_NUM_CTX", "0"))
+DEFAULT_NUM_CTX = 4096
+
+
+class CircuitBreaker:
+    """
+    Ollama熔断器
+    closed：正常放行；连续失败达到阈值后进入open，直接走规则回退；
+    open持续reset_timeout秒后进入half_open，只放行一个探测请求，成功则恢复closed，失败则重新open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # 熔断期间被直接拒绝（走回退）的请求数
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """当前请求是否可以调用Ollama"""
+        with self._lock:
+            if self.state == CircuitBreaker.CLOSED:
+                return True
+            if self.state == CircuitBreaker.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitBreaker.HALF_OPEN
+            if self.state == CircuitBreaker.HALF_OPEN and not self._probe_in_flight:
+                # 半开状态只放行一个探测请求
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != CircuitBreaker.OPEN:
+                    print(f"Ollama连续失败{self.failures}次，熔断{self.reset_timeout:.0f}秒，期间使用规则回退")
+                self.state = CircuitBreaker.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """
+        放弃本次放行的调用且不记录结果（如调用方中途断开或取消）：不能说明Ollama是否健康，
+        半开状态下交还探测名额，下一个请求重新探测；否则熔断器会一直停在half_open并拒绝所有请求
+        """
+        with self._lock:
+            if self.state == CircuitBreaker.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class ModelRegistry:
+    """
+    已安装模型登记表
+    首次使用时查询一次Ollama已安装的模型，之后由后台线程定期刷新；
+    选择模型时直接按候选优先级匹配缓存的列表，不再逐个试错调用
+    """
+
+    def __init__(self, candidates: Optional[List[str]] = None,
+                 refresh_interval: float = MODEL_REFRESH_INTERVAL,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        :param candidates: 候选模型（按优先级排列）
+        :param refresh_interval: 后台刷新间隔（秒）
+        :param breaker: 探测失败时记录到的熔断器
+        """
+        self.candidates = candidates or MODEL_CANDIDATES
+        self.refresh_interval = refresh_interval
+        self.breaker = breaker
+        # None表示尚未成功查询过
+        self.installed: Optional[List[str]] = None
+        self.refreshed_at: Optional[float] = None
+        # 模型名 -> 上下文长度（token），每个模型只查询一次
+        self._context_lengths: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread_pid: Optional[int] = None
+
+    def refresh(self) -> bool:
+        """查询已安装模型，返回是否成功"""
+        try:
+            response = ollama_client.get_client().list()
+            installed = [getattr(model, "model", None) or model["name"] for model in response["models"]]
+        except Exception as e:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            print(f"查询Ollama模型列表失败: {str(e)}")
+            return False
+        with self._lock:
+            self.installed = installed
+            self.refreshed_at = time.time()
+        return True
+
+    def best_model(self, start: bool = True) -> Optional[str]:
+        """
+        返回优先级最高的已安装模型
+        :param start: 首次使用时是否同步查询并启动后台刷新线程；
+                      预派生（fork）前的主进程传False，只使用refresh()查询到的列表，不在主进程中启动线程
+        :return: 模型名；尚未查询成功时返回首选模型；确认没有任何候选模型时返回None
+        """
+        if start:
+            self._ensure_started()
+        with self._lock:
+            installed = self.installed
+        if installed is None:
+            return self.candidates[0]
+        for candidate in self.candidates:
+            for name in installed:
+                # “llama3”匹配“llama3:latest”
+                if name == candidate or (":" not in candidate and name == f"{candidate}:latest"):
+                    return name
+        return None
+
+    def context_length(self, model: Optional[str]) -> int:
+        """
+        模型推理时的上下文长度（token），用于决定单个Prompt能容纳多少会议文本
+        :param model: 模型名，None时返回默认值
+        """
+        if OLLAMA_NUM_CTX:
+            return OLLAMA_NUM_CTX
+        if model is None:
+            return DEFAULT_NUM_CTX
+        with self._lock:
+            if model in self._context_lengths:
+                return self._context_lengths[model]
+        # Ollama处于熔断状态时不再查询
+        if self.breaker is not None and self.breaker.state == CircuitBreaker.OPEN:
+            return DEFAULT_NUM_CTX
+        try:
+            response = ollama_client.get_client().show(model)
+        except Exception as e:
+            # 查询失败不缓存，下次重试
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            print(f"查询Ollama模型信息失败: {str(e)}")
+            return DEFAULT_NUM_CTX
+
+        # Modelfile中显式设置的num_ctx即为推理时的上下文长度
+        num_ctx = re.search(r"^num_ctx\s+(\d+)", response.parameters or "", re.MULTILINE)
+        if num_ctx:
+            length = int(num_ctx.group(1))
+        else:
+            # 否则Ollama使用默认上下文长度，但不会超过模型本身的上限（如llama.context_length）
+            model_limit = next((value for key, value in (response.modelinfo or {}).items()
+                                if key.endswith(".context_length")), None)
+            length = min(int(model_limit), DEFAULT_NUM_CTX) if model_limit else DEFAULT_NUM_CTX
+        with self._lock:
+            self._context_lengths[model] = length
+        return length
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"candidates": self.candidates, "installed": self.installed,
+                    "refreshed_at": self.refreshed_at}
+
+    def _ensure_started(self):
+        """首次使用时同步查询一次，并启动后台刷新线程（fork后的子进程重新启动）"""
+        pid = os.getpid()
+        if self._thread_pid == pid:
+            return
+        with self._lock:
+            if self._thread_pid == pid:
+                return
+            self._thread_pid = pid
+        self.refresh()
+        threading.Thread(target=self._refresh_loop, name="ollama-model-registry", daemon=True).start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            self.refresh()
+
+
+# 进程内共享的熔断器与模型登记表
+ollama_breaker = CircuitBreaker()
+model_registry = ModelRegistry(breaker=ollama_breaker)
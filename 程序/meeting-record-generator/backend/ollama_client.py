@@ -0,0 +1,200 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Optional
+
+# ollama与httpx（连带httpcore、anyio等）导入较慢，首次调用Ollama时才导入，不拖慢服务启动
+if TYPE_CHECKING:
+    import httpx
+    import ollama
+
+# Ollama服务配置（可通过环境变量覆盖）
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3:8b")
+# 建立连接的超时（秒）：Ollama未启动时快速失败
+OLLAMA_CONNECT_TIMEOUT = float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", "3"))
+# 两次收到数据之间的最长间隔（秒）：模型卡住时中止
+OLLAMA_READ_TIMEOUT = float(os.environ.get("OLLAMA_READ_TIMEOUT", "60"))
+# 单次调用的总时长上限（秒）：无论是否仍在输出，超时即中止
+OLLAMA_TOTAL_TIMEOUT = float(os.environ.get("OLLAMA_TOTAL_TIMEOUT", "180"))
+# 连接池：最大连接数与保持空闲的长连接数
+OLLAMA_MAX_CONNECTIONS = int(os.environ.get("OLLAMA_MAX_CONNECTIONS", "10"))
+OLLAMA_MAX_KEEPALIVE = int(os.environ.get("OLLAMA_MAX_KEEPALIVE", "5"))
+OLLAMA_KEEPALIVE_EXPIRY = float(os.environ.get("OLLAMA_KEEPALIVE_EXPIRY", "60"))
+
+
+class OllamaTimeoutError(Exception):
+    """Ollama调用超时（连接、读取或总时长）"""
+
+
+_client: "Optional[ollama.Client]" = None
+# 异步客户端绑定创建时的事件循环，每个事件循环各用一个
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ollama.AsyncClient]" = weakref.WeakKeyDictionary()
+# 创建客户端的进程ID：预派生（fork）的工作进程不能复用父进程的连接池
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def _timeout() -> "httpx.Timeout":
+    import httpx
+    return httpx.Timeout(OLLAMA_READ_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT)
+
+
+def _limits() -> "httpx.Limits":
+    import httpx
+    return httpx.Limits(max_connections=OLLAMA_MAX_CONNECTIONS,
+                        max_keepalive_connections=OLLAMA_MAX_KEEPALIVE,
+                        keepalive_expiry=OLLAMA_KEEPALIVE_EXPIRY)
+
+
+def get_client() -> "ollama.Client":
+    """获取进程内共享的Ollama客户端（带长连接池与超时配置）"""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            import ollama
+            _client = ollama.Client(host=OLLAMA_HOST, timeout=_timeout(), limits=_limits())
+            _client_pid = pid
+    return _client
+
+
+def get_async_client() -> "ollama.AsyncClient":
+    """
+    获取当前事件循环共享的异步Ollama客户端（长连接池与超时配置与同步客户端相同）
+    连接池已满时排队等待空闲连接，不设排队超时，由调用方的总时长上限兜底
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import httpx
+        import ollama
+        timeout = httpx.Timeout(OLLAMA_READ_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT, pool=None)
+        client = ollama.AsyncClient(host=OLLAMA_HOST, timeout=timeout, limits=_limits())
+        _async_clients[loop] = client
+    return client
+
+
+async def achat_stream(messages: List[Dict[str, str]], model: Optional[str] = None,
+                       total_timeout: Optional[float] = None, **kwargs) -> AsyncIterator[Any]:
+    """
+    chat_stream的协程版本：等待Ollama输出期间不占用线程
+    总时长上限包括排队等待连接的时间，超时后抛出OllamaTimeoutError；调用方提前停止迭代时关闭连接
+    """
+    import httpx
+    limit = total_timeout or OLLAMA_TOTAL_TIMEOUT
+    deadline = time.monotonic() + limit
+    stream = None
+    try:
+        stream = await asyncio.wait_for(
+            get_async_client().chat(model=model or OLLAMA_MODEL, messages=messages, stream=True, **kwargs),
+            timeout=limit)
+        while True:
+            try:
+                chunk = await asyncio.wait_for(stream.__anext__(), timeout=max(0.0, deadline - time.monotonic()))
+            except StopAsyncIteration:
+                break
+            yield chunk
+            if chunk.get("done"):
+                break
+    except asyncio.TimeoutError as e:
+        raise OllamaTimeoutError(f"Ollama调用超过总时长上限（{limit}秒）") from e
+    except httpx.TimeoutException as e:
+        raise OllamaTimeoutError(f"Ollama调用超时：{type(e).__name__}") from e
+    finally:
+        # 提前退出时关闭流，释放连接并让Ollama停止生成
+        if stream is not None and hasattr(stream, "aclose"):
+            await stream.aclose()
+
+
+def chat_stream(messages: List[Dict[str, str]], model: Optional[str] = None,
+                total_timeout: Optional[float] = None, **kwargs) -> Iterator[Any]:
+    """
+    流式调用Ollama对话接口，逐个返回Ollama输出的分块
+    由读取线程接收分块，调用方等待每个分块时最多等到总时长上限（与achat_stream的wait_for相同），
+    Ollama卡住不再输出时不会因读取超时而超出总时长；
+    调用方提前停止迭代（或关闭生成器）时，读取线程收到下一个分块后关闭底层连接，Ollama随之停止生成
+    :param messages: 对话消息列表
+    :param model: 模型名，默认OLLAMA_MODEL
+    :param total_timeout: 总时长上限（秒），默认OLLAMA_TOTAL_TIMEOUT
+    :param kwargs: 透传给ollama.Client.chat的其他参数（如format、options）
+    :return: 分块迭代器，每个分块含message.content，最后一块done为True并带有eval_count等统计字段
+    :raises OllamaTimeoutError: 连接、读取或总时长超时
+    """
+    import httpx
+    limit = total_timeout or OLLAMA_TOTAL_TIMEOUT
+    deadline = time.monotonic() + limit
+    # (分块, 异常)；分块与异常都为None表示输出结束
+    chunks: "queue.Queue[tuple]" = queue.Queue()
+    stop = threading.Event()
+
+    def read():
+        stream = None
+        try:
+            stream = get_client().chat(model=model or OLLAMA_MODEL, messages=messages, stream=True, **kwargs)
+            for chunk in stream:
+                chunks.put((chunk, None))
+                if stop.is_set() or chunk.get("done"):
+                    break
+            chunks.put((None, None))
+        except Exception as e:
+            chunks.put((None, e))
+        finally:
+            # 输出结束或调用方已退出时关闭流，释放连接并让Ollama停止生成
+            if stream is not None and hasattr(stream, "close"):
+                stream.close()
+
+    threading.Thread(target=read, name="ollama-stream", daemon=True).start()
+    try:
+        while True:
+            try:
+                chunk, error = chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise OllamaTimeoutError(f"Ollama调用超过总时长上限（{limit}秒）") from None
+            if error is not None:
+                raise error
+            if chunk is None:
+                break
+            yield chunk
+            if chunk.get("done"):
+                break
+    except httpx.TimeoutException as e:
+        raise OllamaTimeoutError(f"Ollama调用超时：{type(e).__name__}") from e
+    finally:
+        stop.set()
+
+
+def chat(messages: List[Dict[str, str]], model: Optional[str] = None,
+         total_timeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+    """
+    调用Ollama对话接口
+    内部使用流式输出，以便在总时长超限时立即关闭连接；返回值与非流式调用的结构一致
+    :param messages: 对话消息列表
+    :param model: 模型名，默认OLLAMA_MODEL
+    :param total_timeout: 总时长上限（秒），默认OLLAMA_TOTAL_TIMEOUT
+    :param kwargs: 透传给ollama.Client.chat的其他参数（如format、options）
+    :return: {"model", "message": {"role", "content"}, "done", 以及eval_count等统计字段}
+    :raises OllamaTimeoutError: 连接、读取或总时长超时
+    """
+    content_parts = []
+    final_chunk = None
+    for chunk in chat_stream(messages, model=model, total_timeout=total_timeout, **kwargs):
+        content_parts.append(chunk["message"]["content"] or "")
+        if chunk.get("done"):
+            final_chunk = chunk
+
+    response = {
+        "model": model or OLLAMA_MODEL,
+        "message": {"role": "assistant", "content": "".join(content_parts)},
+        "done": final_chunk is not None,
+    }
+    if final_chunk is not None:
+        for key in ("total_duration", "load_duration", "prompt_eval_count", "prompt_eval_duration",
+                    "eval_count", "eval_duration", "done_reason"):
+            response[key] = final_chunk.get(key)
+    return response
@@ -0,0 +1,224 @@
+"""
+会议记录Word文档的快速渲染器：直接拼接word/document.xml并写出.docx压缩包，绕过python-docx对象构建
+模板在首次使用时从python-docx渲染器的输出中预编译，两种渲染器生成的文档结构完全一致
+"""
+import io
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from xml.sax.saxutils import escape
+
+import word_generator
+
+# 表格中的变量字段
+VALUE_FIELDS = ("meeting_topic", "meeting_location", "participants", "meeting_duration")
+
+# 预编译模板时使用的占位符
+_FIELD_TOKEN = "__MRG_FIELD_{}__"
+_AGENDA_TOKEN = "__MRG_AGENDA__"
+_AGENDA_SLOT = "agenda"
+
+# XML 1.0不允许的控制字符
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# 压缩包内各文件的固定修改时间（1980-01-01 00:00），使相同内容得到相同的字节
+_DOS_TIME = 0
+_DOS_DATE = (1 << 5) | 1
+
+
+class _ZipEntry:
+    """已压缩的压缩包条目"""
+
+    __slots__ = ("name", "method", "crc", "compressed", "size")
+
+    def __init__(self, name, method, crc, compressed, size):
+        self.name = name.encode("utf-8")
+        self.method = method
+        self.crc = crc
+        self.compressed = compressed
+        self.size = size
+
+
+class _CompiledTemplate:
+    """预编译的文档模板：document.xml片段与压缩好的静态部件"""
+
+    def __init__(self, segments, slots, agenda_prefix, agenda_suffix, empty_agenda, entries, document_index):
+        # document.xml由segments与slots交替拼接：segments[0] + slot[0] + segments[1] + ...
+        self.segments = segments
+        self.slots = slots
+        self.agenda_prefix = agenda_prefix
+        self.agenda_suffix = agenda_suffix
+        self.empty_agenda = empty_agenda
+        # 静态部件（样式、主题、内容类型、关系等）保持python-docx写出的顺序，word/document.xml占位
+        self.entries = entries
+        self.document_index = document_index
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def _enclosing_paragraph(xml, marker):
+    """返回包含marker的<w:p>段落的起止位置"""
+    idx = xml.index(marker)
+    start = xml.rindex("<w:p>", 0, idx)
+    end = xml.index("</w:p>", idx) + len("</w:p>")
+    return start, end
+
+
+def _read_raw_entries(docx_bytes):
+    """读取.docx中每个文件的压缩后原始字节（不解压）"""
+    entries = []
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as archive:
+        for info in archive.infolist():
+            # 本地文件头固定30字节，之后是文件名和扩展字段
+            header = docx_bytes[info.header_offset:info.header_offset + 30]
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            data_start = info.header_offset + 30 + name_len + extra_len
+            compressed = docx_bytes[data_start:data_start + info.compress_size]
+            entries.append(_ZipEntry(info.filename, info.compress_type, info.CRC, compressed, info.file_size))
+    return entries
+
+
+def _compile_template():
+    """用python-docx渲染器生成带占位符的文档，切分为静态片段"""
+    field_tokens = {field: _FIELD_TOKEN.format(field) for field in VALUE_FIELDS}
+
+    # 1. 无议题的文档：切出document.xml主体与“无具体议题记录”段落
+    doc = word_generator.build_meeting_document(dict(field_tokens, agenda=[]))
+    document_xml = doc.part.blob.decode("utf-8")
+    start, end = _enclosing_paragraph(document_xml, "无具体议题记录")
+    empty_agenda = document_xml[start:end]
+    document_xml = document_xml[:start] + _AGENDA_TOKEN + document_xml[end:]
+
+    pattern = re.compile("<w:t>(%s)</w:t>|(%s)" % (
+        "|".join(re.escape(token) for token in field_tokens.values()), re.escape(_AGENDA_TOKEN)))
+    token_to_field = {token: field for field, token in field_tokens.items()}
+    segments, slots, last = [], [], 0
+    for match in pattern.finditer(document_xml):
+        segments.append(document_xml[last:match.start()])
+        slots.append(token_to_field[match.group(1)] if match.group(1) else _AGENDA_SLOT)
+        last = match.end()
+    segments.append(document_xml[last:])
+
+    # 2. 单个议题的文档：切出议题段落的前缀（段落与字体属性）和后缀
+    agenda_doc = word_generator.build_meeting_document({"agenda": [{"title": _AGENDA_TOKEN}]})
+    agenda_xml = agenda_doc.part.blob.decode("utf-8")
+    start, end = _enclosing_paragraph(agenda_xml, _AGENDA_TOKEN)
+    paragraph = agenda_xml[start:end]
+    agenda_prefix = paragraph[:paragraph.index("<w:t>")]
+    agenda_suffix = "</w:r></w:p>"
+
+    # 3. 静态部件：保留python-docx写出的压缩字节，渲染时原样复制
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    entries = _read_raw_entries(buffer.getvalue())
+    document_index = next(idx for idx, entry in enumerate(entries) if entry.name == b"word/document.xml")
+
+    return _CompiledTemplate(segments, slots, agenda_prefix, agenda_suffix, empty_agenda, entries, document_index)
+
+
+def prepare_template():
+    """预编译模板（线程安全，重复调用只编译一次）"""
+    global _template
+    if _template is not None:
+        return _template
+    with _template_lock:
+        if _template is None:
+            _template = _compile_template()
+    return _template
+
+
+def _run_content_xml(text):
+    """
+    生成<w:r>内的文字内容，与python-docx设置run.text的结果一致：
+    换行转为<w:br/>，制表符转为<w:tab/>，首尾有空白的文字段保留空格
+    """
+    text = str(text)
+    if _INVALID_XML_CHARS.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    parts = []
+    for piece in re.split(r"(\t|\r\n|\r|\n)", text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r\n", "\r", "\n"):
+            # python-docx对\r和\n分别插入换行，\r\n对应两个<w:br/>
+            parts.append("<w:br/>" * len(piece))
+        elif piece:
+            if piece.strip() != piece:
+                parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+            else:
+                parts.append(f"<w:t>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+def render_document_xml(meeting_info):
+    """
+    生成word/document.xml的内容
+    :param meeting_info: 模型提取的会议信息字典
+    :return: document.xml的UTF-8字节
+    """
+    template = prepare_template()
+
+    agenda_list = meeting_info.get("agenda", [])
+    if len(agenda_list) > 0:
+        agenda_parts = []
+        for idx, agenda in enumerate(agenda_list):
+            agenda_parts.append(template.agenda_prefix)
+            agenda_parts.append(_run_content_xml(word_generator.format_agenda_text(idx, agenda)))
+            agenda_parts.append(template.agenda_suffix)
+            # 议题之间添加分隔
+            if idx < len(agenda_list) - 1:
+                agenda_parts.append("<w:p/>")
+        agenda_xml = "".join(agenda_parts)
+    else:
+        agenda_xml = template.empty_agenda
+
+    parts = [template.segments[0]]
+    for slot, segment in zip(template.slots, template.segments[1:]):
+        if slot == _AGENDA_SLOT:
+            parts.append(agenda_xml)
+        else:
+            parts.append(_run_content_xml(meeting_info.get(slot, "无")))
+        parts.append(segment)
+    return "".join(parts).encode("utf-8")
+
+
+def _write_zip(entries):
+    """按给定条目写出zip压缩包（条目数据已压缩）"""
+    output = io.BytesIO()
+    central = []
+    for entry in entries:
+        offset = output.tell()
+        output.write(struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, 0, entry.method, _DOS_TIME, _DOS_DATE,
+                                 entry.crc, len(entry.compressed), entry.size, len(entry.name), 0))
+        output.write(entry.name)
+        output.write(entry.compressed)
+        central.append(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, 20, 20, 0, entry.method, _DOS_TIME,
+                                   _DOS_DATE, entry.crc, len(entry.compressed), entry.size, len(entry.name),
+                                   0, 0, 0, 0, 0, offset) + entry.name)
+    central_offset = output.tell()
+    central_data = b"".join(central)
+    output.write(central_data)
+    output.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(entries), len(entries),
+                             len(central_data), central_offset, 0))
+    return output.getvalue()
+
+
+def render_meeting_word(meeting_info):
+    """
+    直接写出会议记录.docx（与word_generator.render_meeting_word的结果结构一致）
+    :param meeting_info: 模型提取的会议信息字典
+    :return: .docx文件的字节内容
+    """
+    template = prepare_template()
+    document_xml = render_document_xml(meeting_info)
+
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    compressed = compressor.compress(document_xml) + compressor.flush()
+    entries = list(template.entries)
+    entries[template.document_index] = _ZipEntry("word/document.xml", zipfile.ZIP_DEFLATED,
+                                                 zlib.crc32(document_xml), compressed, len(document_xml))
+    return _write_zip(entries)
@@ -0,0 +1,105 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TopLevelFieldParser:
+    """
+    增量JSON字段解析器
+    模型流式输出JSON对象时逐块喂入文本，每个顶层字段的值一旦完整（字符串闭合、数组/对象闭合、
+    或数字等基本类型后出现逗号/右花括号）就立即返回，无需等待整个JSON输出完毕；
+    每个字段值只解析一次，顶层对象闭合后closed为True，fields即为完整结果，之后喂入的文本被忽略
+    """
+
+    def __init__(self):
+        # 已完成的顶层字段
+        self.fields: Dict[str, Any] = {}
+        # 顶层对象是否已闭合
+        self.closed = False
+        self._text = ""
+        # 已扫描到的位置，每次喂入只扫描新增部分
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # 当前顶层键的起始位置、键名与值的起始位置
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        喂入一段模型输出
+        :param chunk: 新增文本
+        :return: 本次新完成的顶层字段 [(字段名, 值), ...]
+        """
+        if self.closed:
+            return []
+        self._text += chunk
+        text = self._text
+        fields: List[Tuple[str, Any]] = []
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._key is None:
+                            self._key = self._loads(text[self._key_start:pos + 1])
+                        elif self._value_start is not None:
+                            self._emit(fields, text[self._value_start:pos + 1])
+                continue
+
+            # 顶层键之后第一个非空白、非冒号字符即为值的开始
+            if (self._depth == 1 and self._key is not None and self._value_start is None
+                    and ch not in ": \t\r\n"):
+                self._value_start = pos
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = pos
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    # 数组或对象类型的值闭合
+                    self._emit(fields, text[self._value_start:pos + 1])
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        # 最后一个字段是数字、布尔等基本类型
+                        self._emit(fields, text[self._value_start:pos])
+                    # 顶层对象闭合，其后的文本不再解析
+                    self.closed = True
+                    self._text = text[:pos + 1]
+                    break
+            elif ch == "," and self._depth == 1 and self._value_start is not None:
+                self._emit(fields, text[self._value_start:pos])
+        self._pos = len(text)
+        return fields
+
+    @property
+    def text(self) -> str:
+        """到目前为止喂入的全部文本"""
+        return self._text
+
+    def _emit(self, fields: List[Tuple[str, Any]], raw: str):
+        value = self._loads(raw.strip())
+        if self._key is not None and value is not None:
+            fields.append((self._key, value))
+            self.fields[self._key] = value
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+
+    @staticmethod
+    def _loads(raw: str) -> Any:
+        """解析单个JSON值，格式错误时返回None（该字段视为缺失）"""
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
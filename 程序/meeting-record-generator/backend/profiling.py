@@ -0,0 +1,248 @@
+import cProfile
+import hmac
+import marshal
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# 按需性能分析配置（可通过环境变量覆盖）
+# 访问令牌：为空时分析功能完全关闭（相关接口返回404，请求路径上没有任何额外开销）
+PROFILE_TOKEN = os.environ.get("MEETING_PROFILE_TOKEN", "")
+# 采样分析的间隔（秒）
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get("MEETING_PROFILE_SAMPLE_INTERVAL", "0.001"))
+# tracemalloc记录的调用栈深度
+PROFILE_TRACE_DEPTH = int(os.environ.get("MEETING_PROFILE_TRACE_DEPTH", "30"))
+# 保留最近多少份分析结果
+PROFILE_KEEP = int(os.environ.get("MEETING_PROFILE_KEEP", "20"))
+
+# 分析类型：cpu（cProfile确定性分析，pstats文件）、sample（调用栈采样，折叠栈文本）、
+# alloc（tracemalloc，请求结束时仍存活的内存按调用栈折叠，值为字节数）
+PROFILE_KINDS = ("cpu", "sample", "alloc")
+DEFAULT_KINDS = ("sample", "alloc")
+
+# 各类型结果的下载文件扩展名与MIME类型
+PROFILE_FORMATS = {
+    "cpu": ("pstats", "application/octet-stream"),
+    "sample": ("collapsed", "text/plain; charset=utf-8"),
+    "alloc": ("alloc.collapsed", "text/plain; charset=utf-8"),
+}
+
+
+def _frame_name(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def parse_kinds(value: Optional[str]) -> Tuple[str, ...]:
+    """解析分析类型列表（如"cpu,alloc"），无效类型忽略，为空或"1"时使用默认类型"""
+    kinds = tuple(kind for kind in (value or "").replace(" ", "").split(",") if kind in PROFILE_KINDS)
+    return kinds or DEFAULT_KINDS
+
+
+class StackSampler:
+    """
+    调用栈采样分析器：后台线程定时读取目标线程的当前调用栈，统计各调用栈出现的次数
+    结果为折叠栈格式（每行“根;...;叶 次数”），可直接用flamegraph.pl或speedscope生成火焰图
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileSession:
+    """一次请求的性能分析"""
+
+    def __init__(self, kinds: Tuple[str, ...], label: str = ""):
+        self.id = uuid.uuid4().hex[:12]
+        self.kinds = kinds
+        self.label = label
+        self.created_at = time.time()
+        self.seconds = 0.0
+        self.alloc_peak: Optional[int] = None
+        # 各类型的结果文件内容
+        self.results: Dict[str, bytes] = {}
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._start = 0.0
+
+    def start(self):
+        self._start = time.perf_counter()
+        if "alloc" in self.kinds:
+            tracemalloc.start(PROFILE_TRACE_DEPTH)
+        if "sample" in self.kinds:
+            self._sampler = StackSampler(threading.get_ident())
+            self._sampler.start()
+        if "cpu" in self.kinds:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self._start
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        # 先停止内存跟踪，再整理各项结果（整理结果本身的内存分配不计入）
+        snapshot = None
+        if "alloc" in self.kinds:
+            snapshot = tracemalloc.take_snapshot()
+            self.alloc_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        if self._profile is not None:
+            self._profile.create_stats()
+            # 与pstats.Stats.dump_stats写出的文件格式相同，可用snakeviz、gprof2dot等工具打开
+            self.results["cpu"] = marshal.dumps(self._profile.stats)
+        if self._sampler is not None:
+            self.results["sample"] = self._sampler.collapsed().encode("utf-8")
+        if snapshot is not None:
+            self.results["alloc"] = self._collapse_snapshot(snapshot).encode("utf-8")
+
+    @staticmethod
+    def _collapse_snapshot(snapshot: "tracemalloc.Snapshot") -> str:
+        """按调用栈汇总仍存活的内存分配（字节），折叠栈格式"""
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                           tracemalloc.Filter(False, __file__)])
+        lines = []
+        for stat in snapshot.statistics("traceback"):
+            # tracemalloc的调用栈从最早的帧到最近的帧排列，与折叠栈的“根;...;叶”顺序一致
+            stack = ";".join(f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in stat.traceback)
+            lines.append(f"{stack} {stat.size}\n")
+        return "".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.id,
+            "label": self.label,
+            "kinds": list(self.kinds),
+            "created_at": self.created_at,
+            "seconds": round(self.seconds, 3),
+            "alloc_peak_bytes": self.alloc_peak,
+            "downloads": {kind: f"/admin/profiles/{self.id}/{kind}" for kind in self.results},
+        }
+
+
+class Profiler:
+    """
+    按需性能分析：只有携带正确令牌的请求（X-Profile请求头）或管理员预约的后续请求才会被分析
+    同一时间只分析一个请求（cProfile与tracemalloc都是进程级的），其他请求照常处理不分析
+    """
+
+    def __init__(self, token: str = PROFILE_TOKEN, keep: int = PROFILE_KEEP):
+        self.token = token
+        self.keep = keep
+        self._sessions: "OrderedDict[str, ProfileSession]" = OrderedDict()
+        # 管理员预约：接下来还需分析的请求数与分析类型
+        self._armed = 0
+        self._armed_kinds: Tuple[str, ...] = DEFAULT_KINDS
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """校验访问令牌（分析功能未开启时始终为False）"""
+        return self.enabled and token is not None and hmac.compare_digest(token, self.token)
+
+    def requested(self, header: Optional[str], token: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        判断本次请求是否需要分析
+        :param header: X-Profile请求头（分析类型列表）
+        :param token: X-Profile-Token请求头
+        :return: 分析类型；不需要分析时返回None
+        """
+        if not self.enabled:
+            return None
+        if header is not None and self.authorized(token):
+            return parse_kinds(header)
+        if self._armed:
+            with self._lock:
+                if self._armed > 0:
+                    self._armed -= 1
+                    return self._armed_kinds
+        return None
+
+    def wants(self, header: Optional[str], token: Optional[str]) -> bool:
+        """
+        本次请求是否可能需要分析（与requested相同的判断，但不消耗预约次数）：
+        ASGI入口据此把请求交给Flask接口，在线程中完成分析
+        """
+        return self.enabled and ((header is not None and self.authorized(token)) or self._armed > 0)
+
+    def arm(self, requests: int, kinds: Tuple[str, ...]):
+        """预约分析接下来的requests个请求"""
+        with self._lock:
+            self._armed = max(0, requests)
+            self._armed_kinds = kinds
+
+    @contextmanager
+    def profile(self, kinds: Tuple[str, ...], label: str = "") -> Iterator[Optional[ProfileSession]]:
+        """
+        在with代码块中分析当前线程；已有请求正在分析时不分析（返回None）
+        """
+        if not self._busy.acquire(blocking=False):
+            yield None
+            return
+        session = ProfileSession(kinds, label)
+        try:
+            session.start()
+            try:
+                yield session
+            finally:
+                session.stop()
+            self._store(session)
+        finally:
+            self._busy.release()
+
+    def _store(self, session: ProfileSession):
+        with self._lock:
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.keep:
+                self._sessions.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[ProfileSession]:
+        with self._lock:
+            return self._sessions.get(profile_id)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "armed_requests": self._armed,
+                "armed_kinds": list(self._armed_kinds),
+                "profiles": [session.to_dict() for session in reversed(self._sessions.values())],
+            }
+
+
+# 进程内共享的分析器（多进程部署时各工作进程分别保存结果）
+profiler = Profiler()
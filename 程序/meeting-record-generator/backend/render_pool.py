@@ -0,0 +1,148 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+from metrics import STAGE_SECONDS
+
+# Word渲染进程池配置（可通过环境变量覆盖）
+# 渲染进程数，0表示不使用进程池，在调用线程中直接渲染（受GIL限制，多个渲染只能轮流执行）
+RENDER_PROCESSES = int(os.environ.get("MEETING_RENDER_PROCESSES", "0"))
+# 每个渲染进程处理多少个文档后重启（释放python-docx累积的内存），0表示不重启
+RENDER_MAX_TASKS_PER_CHILD = int(os.environ.get("MEETING_RENDER_MAX_TASKS_PER_CHILD", "200"))
+
+
+def _init_worker():
+    """渲染进程启动时预构建文档骨架，首个任务不承担构建开销"""
+    import word_generator
+    word_generator.prepare_template()
+
+
+def _render(meeting_info: Dict[str, Any]) -> bytes:
+    # python-docx与lxml导入较慢，首次渲染时才导入（只查询接口或提交任务的进程不必加载）
+    import word_generator
+    return word_generator.render_meeting_word(meeting_info)
+
+
+class RenderPool:
+    """
+    Word渲染进程池：python-docx渲染是纯Python的CPU密集操作，放到独立进程中执行，多核并行且不阻塞Web进程
+    传入meeting_info，返回.docx字节；进程池按进程号懒加载，gunicorn预加载后派生的各工作进程各自创建
+    """
+
+    def __init__(self, processes: int = RENDER_PROCESSES, max_tasks_per_child: int = RENDER_MAX_TASKS_PER_CHILD):
+        """
+        :param processes: 渲染进程数，0表示在调用线程中直接渲染
+        :param max_tasks_per_child: 每个进程处理的文档数上限，0表示不限
+        """
+        self.processes = processes
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pool = None
+        self._pool_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        # 已提交但尚未完成的文档数，以及已完成的文档数
+        self._pending = 0
+        self.rendered = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def start(self):
+        """创建渲染进程（重复调用无副作用）；使用spawn启动，不继承Web进程的线程与连接"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                return
+            context = multiprocessing.get_context("spawn")
+            self._pool = context.Pool(self.processes, initializer=_init_worker,
+                                      maxtasksperchild=self.max_tasks_per_child or None)
+            self._pool_pid = os.getpid()
+            self._pending = 0
+
+    def submit(self, meeting_info: Dict[str, Any]) -> Future:
+        """
+        提交渲染任务
+        :return: Future，结果为.docx字节；线程可调用result()等待，协程可用asyncio.wrap_future等待
+        """
+        future: Future = Future()
+        start = time.perf_counter()
+        if not self.enabled:
+            try:
+                future.set_result(_render(meeting_info))
+                self._record(True, start)
+            except Exception as e:
+                future.set_exception(e)
+                self._record(False, start)
+            return future
+
+        self.start()
+        with self._lock:
+            self._pending += 1
+        self._pool.apply_async(_render, (meeting_info,),
+                               callback=lambda result: self._finish(future, start, result=result),
+                               error_callback=lambda error: self._finish(future, start, error=error))
+        return future
+
+    def render(self, meeting_info: Dict[str, Any]) -> bytes:
+        """渲染会议记录，返回.docx字节（与word_generator.render_meeting_word相同）"""
+        return self.submit(meeting_info).result()
+
+    def _finish(self, future: Future, start: float, result: Optional[bytes] = None,
+                error: Optional[BaseException] = None):
+        with self._lock:
+            self._pending -= 1
+        self._record(error is None, start)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _record(self, success: bool, start: float):
+        # 渲染耗时包括在进程池中排队等待的时间
+        STAGE_SECONDS.labels("render").observe(time.perf_counter() - start)
+        with self._lock:
+            if success:
+                self.rendered += 1
+            else:
+                self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """进程池状态：queue_depth为等待空闲进程的文档数"""
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "max_tasks_per_child": self.max_tasks_per_child,
+                "in_flight": self._pending,
+                "queue_depth": max(0, self._pending - self.processes) if self.enabled else 0,
+                "rendered": self.rendered,
+                "failed": self.failed,
+            }
+
+    def close(self):
+        """停止渲染进程（等待已提交的任务完成）"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            owned = self._pool_pid == os.getpid()
+        if pool is not None and owned:
+            pool.close()
+            pool.join()
+
+
+# 进程内共享的渲染进程池
+render_pool = RenderPool()
+atexit.register(render_pool.close)
+
+
+def render_meeting_word(meeting_info: Dict[str, Any]) -> bytes:
+    """
+    对外接口：渲染会议记录Word文档（配置了MEETING_RENDER_PROCESSES时在渲染进程中执行）
+    :param meeting_info: 会议信息字典
+    :return: .docx文件的字节内容
+    """
+    return render_pool.render(meeting_info)
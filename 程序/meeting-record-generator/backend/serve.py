@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生产环境启动入口：预派生（pre-fork）多进程WSGI服务（gunicorn，仅支持Linux/macOS）
+主进程先导入model_client与word_generator、预构建Word文档骨架与各类型Prompt、渲染一份示例文档、
+向模型发送一次预热请求，全部完成后才派生工作进程开始接收请求；工作进程通过fork共享已构建好的模板
+用法：
+    python serve.py [--bind 127.0.0.1:5000] [--workers 2] [--threads 4] [--pidfile PATH]
+    python serve.py --reload [--pidfile PATH]    平滑重载：新主进程加载新代码并预热完成后，旧进程处理完已有请求再退出
+"""
+
+import argparse
+import os
+import signal
+import sys
+import tempfile
+import time
+
+# 服务配置（可通过环境变量覆盖，命令行参数优先）
+SERVER_BIND = os.environ.get("MEETING_BIND", "127.0.0.1:5000")
+SERVER_WORKERS = int(os.environ.get("MEETING_WORKERS", "2"))
+SERVER_THREADS = int(os.environ.get("MEETING_THREADS", "4"))
+# 单个请求的最长处理时间（秒），需大于Ollama调用总时长上限OLLAMA_TOTAL_TIMEOUT
+SERVER_TIMEOUT = int(os.environ.get("MEETING_TIMEOUT", "300"))
+# 重载或停止时等待进行中请求完成的时间（秒）
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get("MEETING_GRACEFUL_TIMEOUT", "60"))
+SERVER_PIDFILE = os.environ.get("MEETING_PIDFILE", os.path.join(tempfile.gettempdir(), "meeting-record-generator.pid"))
+# 是否在启动时向模型发送预热请求
+SERVER_WARM_UP = os.environ.get("MEETING_WARM_UP", "1") != "0"
+
+
+def warm_up(with_model: bool = True):
+    """
+    预热：在主进程中完成所有一次性初始化，工作进程派生后直接可用
+    :param with_model: 是否向Ollama发送一次预热请求（加载模型并缓存系统提示词）
+    """
+    import model_client
+    import ollama_client
+    import word_generator
+    from model_registry import model_registry
+
+    # 1. 构建Word文档骨架（main导入时不构建，首次渲染或此处预热时才导入python-docx并构建）并渲染一份示例文档
+    start = time.perf_counter()
+    word_generator.prepare_template()
+    word_generator.render_meeting_word({
+        "meeting_topic": "预热", "meeting_location": "会议室", "meeting_time": "待确认",
+        "participants": "张三", "meeting_duration": "1小时",
+        "agenda": [{"title": "预热", "leader": "张三", "preparation": "无", "participants": "张三"}],
+    })
+    print(f"Word模板预热完成: {len(model_client.PROMPT_PREFIXES)}种会议类型Prompt已预构建, "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if not with_model:
+        return
+
+    # 2. 查询已安装模型，并发送一次只生成1个token的请求，让Ollama把模型加载到内存
+    # （主进程只查询一次，后台刷新线程由各工作进程首次选择模型时启动，派生前不启动线程）
+    start = time.perf_counter()
+    if not model_registry.refresh():
+        print("Ollama不可用，跳过模型预热（请求将使用规则回退，Ollama恢复后自动切换）")
+        return
+    model = model_registry.best_model(start=False)
+    if model is None:
+        print(f"未找到候选模型{model_registry.candidates}，跳过模型预热")
+        return
+    try:
+        ollama_client.chat(
+            model=model,
+            messages=[{"role": "system", "content": model_client.SYSTEM_PROMPT},
+                      {"role": "user", "content": "预热"}],
+            options={"num_predict": 1},
+        )
+        print(f"模型{model}预热完成: {time.perf_counter() - start:.1f} s")
+    except Exception as e:
+        print(f"模型预热失败: {str(e)}")
+
+
+def load_app():
+    """导入并预热应用（开启preload时在主进程中执行一次）"""
+    import main
+    warm_up(with_model=SERVER_WARM_UP)
+    return main.app
+
+
+def run_server(bind: str, workers: int, threads: int, pidfile: str) -> int:
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("未安装gunicorn或当前系统不支持（gunicorn仅支持Linux/macOS），Windows下请使用python main.py启动")
+        return 1
+
+    class MeetingServer(BaseApplication):
+        """gunicorn应用：配置来自命令行参数，主进程预加载并预热"""
+
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app()
+
+    def post_worker_init(worker):
+        # 渲染进程池在各工作进程中创建（不能在主进程中创建后随fork继承）
+        from render_pool import render_pool
+        render_pool.start()
+
+    MeetingServer({
+        "bind": bind,
+        "workers": workers,
+        "threads": threads,
+        "worker_class": "gthread",
+        # 主进程加载并预热后再派生工作进程，工作进程共享已构建好的模板
+        "preload_app": True,
+        "timeout": SERVER_TIMEOUT,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+        "pidfile": pidfile,
+        "post_worker_init": post_worker_init,
+    }).run()
+    return 0
+
+
+def _read_pid(pidfile: str):
+    try:
+        with open(pidfile, "r") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def reload_server(pidfile: str, wait_seconds: float = 600) -> int:
+    """
+    平滑重载正在运行的服务
+    向旧主进程发送USR2，gunicorn启动新主进程（重新导入代码、预热后把pid写入“pid文件.2”）；
+    新主进程就绪后向旧主进程发送TERM，旧工作进程处理完进行中的请求后退出，新主进程随后接管pid文件
+    """
+    old_pid = _read_pid(pidfile)
+    if old_pid is None:
+        print(f"未找到运行中的服务（pid文件: {pidfile}）")
+        return 1
+
+    os.kill(old_pid, signal.SIGUSR2)
+    print(f"已通知主进程{old_pid}启动新主进程，等待新进程预热完成...")
+    deadline = time.monotonic() + wait_seconds
+    while time.monotonic() < deadline:
+        new_pid = _read_pid(f"{pidfile}.2")
+        if new_pid is not None and new_pid != old_pid:
+            os.kill(old_pid, signal.SIGTERM)
+            print(f"新主进程{new_pid}已就绪，旧主进程{old_pid}正在处理完已有请求后退出")
+            return 0
+        time.sleep(0.5)
+    print("等待新主进程超时，旧进程保持运行")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会议记录生成服务（生产环境）")
+    parser.add_argument("--bind", default=SERVER_BIND, help="监听地址")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="工作进程数")
+    parser.add_argument("--threads", type=int, default=SERVER_THREADS, help="每个工作进程的线程数")
+    parser.add_argument("--pidfile", default=SERVER_PIDFILE, help="主进程pid文件")
+    parser.add_argument("--reload", action="store_true", help="平滑重载正在运行的服务")
+    args = parser.parse_args()
+
+    if args.reload:
+        return reload_server(args.pidfile)
+    return run_server(args.bind, args.workers, args.threads, args.pidfile)
+
+
+if __name__ == "__main__":
+    # 与python main.py一致，从backend目录导入各模块
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(main())
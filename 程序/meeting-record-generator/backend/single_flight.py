@@ -0,0 +1,108 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class FlightAbandoned(Exception):
+    """发起者中途退出（如客户端断开），等待者应重新发起调用"""
+
+
+class Flight:
+    """
+    一次进行中的调用，等待者阻塞直到发起者给出结果或异常
+    线程（wait）与协程（wait_async）都可以等待，同步与异步的相同请求可以互相合并
+    """
+
+    def __init__(self):
+        self._future: Future = Future()
+
+    def resolve(self, result: Any):
+        # 保存快照，发起者之后修改自己的结果不影响等待者
+        self._future.set_result(copy.deepcopy(result))
+
+    def reject(self, error: BaseException):
+        self._future.set_exception(error)
+
+    def wait(self) -> Any:
+        """等待结果，返回结果的副本（各调用方可以独立修改）；发起者失败时抛出同一异常"""
+        return copy.deepcopy(self._future.result())
+
+    async def wait_async(self) -> Any:
+        """协程版本的wait，等待期间不占用线程"""
+        # shield：等待方被取消时不影响共享的结果
+        return copy.deepcopy(await asyncio.shield(asyncio.wrap_future(self._future)))
+
+
+class SingleFlight:
+    """
+    相同请求合并（single-flight）
+    同一个键同时只有一次调用真正执行，其间到达的相同请求等待并共享该次调用的结果；
+    调用结束后立即移除，之后的请求重新执行（结果复用由ExtractionCache负责）
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+        # 实际执行的调用数与被合并（等待共享结果）的调用数
+        self.executed = 0
+        self.coalesced = 0
+
+    def begin(self, key: str) -> Tuple[Flight, bool]:
+        """
+        登记一次调用
+        :return: (flight, 是否为发起者)；发起者执行后必须调用finish，其他调用方调用flight.wait()
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = Flight()
+            self._flights[key] = flight
+            self.executed += 1
+            return flight, True
+
+    def finish(self, key: str, flight: Flight, result: Any = None, error: Optional[BaseException] = None):
+        """
+        发起者结束调用：先移除登记（之后到达的请求不再合并），再唤醒等待者
+        error不是普通异常（如GeneratorExit、KeyboardInterrupt）时，等待者收到FlightAbandoned
+        """
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if error is not None:
+            flight.reject(error if isinstance(error, Exception) else FlightAbandoned("相同请求的调用已中断"))
+        else:
+            flight.resolve(result)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """执行fn，同一个键的并发调用共享一次执行的结果"""
+        while True:
+            flight, leader = self.begin(key)
+            if leader:
+                break
+            try:
+                return flight.wait()
+            except FlightAbandoned:
+                # 发起者中途退出，重新登记（可能成为新的发起者）
+                continue
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, flight, error=e)
+            raise
+        self.finish(key, flight, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """合并统计"""
+        with self._lock:
+            calls = self.executed + self.coalesced
+            return {
+                "in_flight": len(self._flights),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / calls, 4) if calls else 0.0,
+            }
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+from contextlib import closing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Tuple
+
+from cancellation import DISCONNECT, record_cancellation
+from jobs import JobManager
+
+# SSE心跳注释：立即发送首字节，让浏览器与代理尽快开始处理响应
+_SSE_OPEN = ": stream opened\n\n"
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """格式化一条Server-Sent Events消息"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_meeting_events(input_text: str,
+                          stream_fn: Callable[[str], Iterator[Tuple[str, Dict[str, Any]]]],
+                          render_fn: Callable[[Dict[str, Any]], bytes],
+                          job_manager: JobManager) -> Iterator[str]:
+    """
+    以SSE事件流的形式生成会议记录
+    事件依次为：classified（会议类型）、progress（token数与生成速度）、field（完整的顶层字段）、
+    done（下载地址与各阶段耗时）；出错时发送error事件后结束
+    :param input_text: 会议描述文本
+    :param stream_fn: 流式信息提取函数（input_text -> (事件名, 数据)迭代器，最后一个事件为result）
+    :param render_fn: Word渲染函数（meeting_info -> .docx字节）
+    :param job_manager: 登记生成结果的任务管理器，结果通过/jobs/<id>/result下载
+    客户端断开后，服务器在下一次推送时关闭本生成器：提取流随之关闭（Ollama停止生成），也不再渲染
+    """
+    yield _SSE_OPEN
+    stage = "extract"
+    try:
+        # 1. 信息提取：除最终结果外的事件原样推送
+        stage_start = time.perf_counter()
+        meeting_info = None
+        with closing(stream_fn(input_text)) as events:
+            for event, data in events:
+                if event == "result":
+                    meeting_info = data
+                else:
+                    yield format_sse(event, data)
+        timings = {"extract": time.perf_counter() - stage_start}
+
+        # 2. 渲染Word文档
+        stage = "render"
+        stage_start = time.perf_counter()
+        word_bytes = render_fn(meeting_info)
+        timings["render"] = time.perf_counter() - stage_start
+
+        # 3. 登记结果并推送下载地址
+        job = job_manager.add_completed(word_bytes, meeting_info.get("meeting_type"), timings)
+        yield format_sse("done", {
+            "job_id": job.id,
+            "download_url": f"/jobs/{job.id}/result",
+            "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        })
+    except GeneratorExit:
+        record_cancellation(DISCONNECT, stage)
+        raise
+    except Exception as e:
+        yield format_sse("error", {"error": str(e)})
+
+
+async def astream_meeting_events(input_text: str,
+                                 stream_fn: Callable[[str], AsyncIterator[Tuple[str, Dict[str, Any]]]],
+                                 render_fn: Callable[[Dict[str, Any]], Awaitable[bytes]],
+                                 job_manager: JobManager) -> AsyncIterator[str]:
+    """
+    stream_meeting_events的协程版本，事件相同
+    :param stream_fn: 异步流式信息提取函数（input_text -> (事件名, 数据)异步迭代器）
+    :param render_fn: 异步Word渲染函数（Word渲染是CPU密集操作，应在线程池或进程池中执行）
+    客户端断开时调用方取消协程（或关闭本生成器），取消传到Ollama调用并关闭连接
+    """
+    yield _SSE_OPEN
+    stage = "extract"
+    try:
+        stage_start = time.perf_counter()
+        meeting_info = None
+        events = stream_fn(input_text)
+        try:
+            async for event, data in events:
+                if event == "result":
+                    meeting_info = data
+                else:
+                    yield format_sse(event, data)
+        finally:
+            await events.aclose()
+        timings = {"extract": time.perf_counter() - stage_start}
+
+        stage = "render"
+        stage_start = time.perf_counter()
+        word_bytes = await render_fn(meeting_info)
+        timings["render"] = time.perf_counter() - stage_start
+
+        job = job_manager.add_completed(word_bytes, meeting_info.get("meeting_type"), timings)
+        yield format_sse("done", {
+            "job_id": job.id,
+            "download_url": f"/jobs/{job.id}/result",
+            "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        })
+    except (asyncio.CancelledError, GeneratorExit):
+        record_cancellation(DISCONNECT, stage)
+        raise
+    except Exception as e:
+        yield format_sse("error", {"error": str(e)})
@@ -3,13 +3,16 @@ from docx.enum.table import WD_TABLE_ALIGNMENT, WD_CELL_VERTICAL_ALIGNMENT
 from docx.shared import Pt, RGBColor
 from docx.text.font import Font
 from docx.oxml.shared import OxmlElement, qn
+import copy
+import io
 import os
+import threading
 
-# 临时文件存储路径（后端目录下的temp文件夹）
+# 临时文件存储路径（后端目录下的temp文件夹，generate_meeting_word首次写入时创建）
 TEMP_PATH = os.path.join(os.path.dirname(__file__), "temp")
-# 确保temp文件夹存在，不存在则创建
-if not os.path.exists(TEMP_PATH):
-    os.makedirs(TEMP_PATH)
+
+# Word渲染器：docx（python-docx对象模型，默认）或ooxml（直接写出document.xml的快速渲染器，见ooxml_writer.py）
+WORD_RENDERER = os.environ.get("MEETING_WORD_RENDERER", "docx")
 
 def set_cell_font(cell, font_name, font_size, is_bold=False):
     """设置单元格字体样式"""
@@ -46,11 +49,11 @@ def add_cell_border(cell):
     tcPr.append(tcBorders)
     cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
 
-def generate_meeting_word(meeting_info):
+def _build_skeleton_document():
     """
-    根据结构化信息生成与图片一致的会议记录Word文档
-    :param meeting_info: 模型提取的会议信息字典
-    :return: 生成的Word文件路径
+    构建会议记录的静态骨架：标题、5行4列表格、合并单元格、边框以及标签文字和字体
+    骨架与具体会议无关，只需构建一次，之后每次渲染复制骨架并填入变量内容
+    :return: python-docx的Document对象（内容单元格为空）
     """
     # 1. 创建新的Word文档
     doc = Document()
@@ -74,11 +77,11 @@ def generate_meeting_word(meeting_info):
         for cell in row.cells:
             cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
 
-    # 填充表格内容（严格匹配图片字段位置）
+    # 填充表格标签（严格匹配图片字段位置），内容单元格在渲染时填写
     # 第1行：会议主题 + 主持人
     row1_cells = table.rows[0].cells
     row1_cells[0].text = "会议主题"
-    row1_cells[1].text = meeting_info.get("meeting_topic", "无")
+    row1_cells[1].text = ""
     row1_cells[2].text = "主持人"
     row1_cells[3].text = ""  # 若模板中主持人无默认值，留空
 
@@ -86,19 +89,16 @@ def generate_meeting_word(meeting_info):
     row2_cells = table.rows[1].cells
     row2_cells[0].text = "会议地点"
     row2_cells[1].merge(row2_cells[3])
-    row2_cells[1].text = meeting_info.get("meeting_location", "无")
 
     # 第3行：参会人员（合并第2-4列）
     row3_cells = table.rows[2].cells
     row3_cells[0].text = "参会人员"
     row3_cells[1].merge(row3_cells[3])
-    row3_cells[1].text = meeting_info.get("participants", "无")
 
     # 第4行：会议时长（合并第2-4列）
     row4_cells = table.rows[3].cells
     row4_cells[0].text = "会议时长"
     row4_cells[1].merge(row4_cells[3])
-    row4_cells[1].text = meeting_info.get("meeting_duration", "无")
 
     # 为前4行所有单元格添加边框（会议主题、会议地点、参会人员、会议时长、主持人）
     for row in table.rows[:4]:  # 前4行
@@ -113,42 +113,75 @@ def generate_meeting_word(meeting_info):
     # 为会议内容记录单元格添加完整的方框边框
     add_cell_border(row5_cells[0])
 
-    # 4. 设置表格字体样式（标签使用黑体黑色，内容使用微软雅黑）
-    # 第1行设置
+    # 4. 设置标签字体样式（标签使用黑体黑色）
     set_cell_font(row1_cells[0], "黑体", 11, True)      # 会议主题标签
-    set_cell_font(row1_cells[1], "微软雅黑", 11)        # 会议主题内容
     set_cell_font(row1_cells[2], "黑体", 11, True)      # 主持人标签
     set_cell_font(row1_cells[3], "微软雅黑", 11)        # 主持人内容
-    
-    # 第2行设置
     set_cell_font(row2_cells[0], "黑体", 11, True)      # 会议地点标签
-    set_cell_font(row2_cells[1], "微软雅黑", 11)        # 会议地点内容
-    
-    # 第3行设置
     set_cell_font(row3_cells[0], "黑体", 11, True)      # 参会人员标签
-    set_cell_font(row3_cells[1], "微软雅黑", 11)        # 参会人员内容
-    
-    # 第4行设置
     set_cell_font(row4_cells[0], "黑体", 11, True)      # 会议时长标签
-    set_cell_font(row4_cells[1], "微软雅黑", 11)        # 会议时长内容
-    
-    # 第5行设置（标题使用黑体，内容使用微软雅黑）
     set_cell_font(row5_cells[0], "黑体", 11, True)      # 会议内容记录标签
 
-    # 5. 填充会议内容记录区（议题、负责人等）- 在带边框的单元格内显示
+    return doc
+
+# 预构建的文档骨架（首次使用或调用prepare_template时构建）
+_skeleton_part = None
+# 骨架中除正文外的其他部件（样式、主题、字体表等），渲染时只读，各副本共享而不复制
+_shared_parts = {}
+_skeleton_lock = threading.Lock()
+
+def prepare_template():
+    """构建文档骨架（线程安全，重复调用只构建一次），服务启动时调用可避免首个请求承担构建开销"""
+    global _skeleton_part, _shared_parts
+    if _skeleton_part is not None:
+        return
+    with _skeleton_lock:
+        if _skeleton_part is None:
+            document_part = _build_skeleton_document().part
+            _shared_parts = {id(part): part for part in document_part.package.iter_parts()
+                             if part is not document_part}
+            _skeleton_part = document_part
+    if WORD_RENDERER == "ooxml":
+        import ooxml_writer
+        ooxml_writer.prepare_template()
+
+def _clone_skeleton_document():
+    """复制文档骨架：只深拷贝正文部件，其余部件与骨架共享"""
+    prepare_template()
+    document_part = copy.deepcopy(_skeleton_part, dict(_shared_parts))
+    return document_part.document
+
+def format_agenda_text(idx, agenda):
+    """拼接单个议题的文字内容（含标题、负责人、会前准备、参与人员）"""
+    return f"""议题{idx+1}：{agenda.get('title', '无')}
+负责人：{agenda.get('leader', '无')}
+会前准备：{agenda.get('preparation', '无')}
+参与人员：{agenda.get('participants', '无')}"""
+
+def _fill_meeting_document(doc, meeting_info):
+    """向骨架中填入会议的变量内容（表格内容单元格与会议内容记录区）"""
+    table = doc.tables[0]
+
+    # 表格内容单元格（内容使用微软雅黑）
+    value_cells = [
+        (table.cell(0, 1), "meeting_topic"),      # 会议主题内容
+        (table.cell(1, 1), "meeting_location"),   # 会议地点内容
+        (table.cell(2, 1), "participants"),       # 参会人员内容
+        (table.cell(3, 1), "meeting_duration"),   # 会议时长内容
+    ]
+    for cell, field in value_cells:
+        cell.text = meeting_info.get(field, "无")
+        set_cell_font(cell, "微软雅黑", 11)
+
+    # 填充会议内容记录区（议题、负责人等）- 在带边框的单元格内显示
     agenda_count = len(meeting_info.get("agenda", []))
-    content_cell = row5_cells[0]
+    content_cell = table.cell(4, 0)
     
     if agenda_count > 0:
         # 在单元格内添加议题内容
         for idx, agenda in enumerate(meeting_info["agenda"]):
             agenda_para = content_cell.add_paragraph()
-            agenda_text = f"""议题{idx+1}：{agenda.get('title', '无')}
-负责人：{agenda.get('leader', '无')}
-会前准备：{agenda.get('preparation', '无')}
-参与人员：{agenda.get('participants', '无')}"""
-            
-            agenda_run = agenda_para.add_run(agenda_text)
+            agenda_run = agenda_para.add_run(format_agenda_text(idx, agenda))
             agenda_run.font.name = "微软雅黑"
             agenda_run.font.size = Pt(10)
             
@@ -161,9 +194,44 @@ def generate_meeting_word(meeting_info):
         content_para.runs[0].font.name = "微软雅黑"
         content_para.runs[0].font.size = Pt(11)
 
-    # 6. 保存Word文件到临时目录
+    return doc
+
+def build_meeting_document(meeting_info):
+    """
+    根据结构化信息构建与图片一致的会议记录Word文档对象（不落盘）
+    :param meeting_info: 模型提取的会议信息字典
+    :return: python-docx的Document对象
+    """
+    return _fill_meeting_document(_clone_skeleton_document(), meeting_info)
+
+def render_meeting_word(meeting_info, renderer=None):
+    """
+    在内存中渲染会议记录Word文档，不读写任何共享文件，可安全地被多线程并发调用
+    :param meeting_info: 模型提取的会议信息字典
+    :param renderer: 渲染器（docx / ooxml），默认取MEETING_WORD_RENDERER
+    :return: .docx文件的字节内容
+    """
+    if (renderer or WORD_RENDERER) == "ooxml":
+        import ooxml_writer
+        return ooxml_writer.render_meeting_word(meeting_info)
+
+    buffer = io.BytesIO()
+    build_meeting_document(meeting_info).save(buffer)
+    return buffer.getvalue()
+
+def generate_meeting_word(meeting_info):
+    """
+    根据结构化信息生成与图片一致的会议记录Word文档
+    :param meeting_info: 模型提取的会议信息字典
+    :return: 生成的Word文件路径
+    """
+    word_bytes = render_meeting_word(meeting_info)
+
+    # 保存Word文件到临时目录（固定文件名，多请求并发时会互相覆盖，Web接口请使用render_meeting_word）
     word_filename = "会议记录.docx"
+    os.makedirs(TEMP_PATH, exist_ok=True)
     word_path = os.path.join(TEMP_PATH, word_filename)
-    doc.save(word_path)
+    with open(word_path, "wb") as f:
+        f.write(word_bytes)
 
     return word_path
\ No newline at end of file
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字段提取微基准：对比旧的逐个正则 + 逐个关键词查找与FIELD_EXTRACTOR单次扫描在长中文会议记录上的耗时
+用法：python benchmarks/bench_field_extractor.py [--rounds 50]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from field_extractor import FIELD_EXTRACTOR, LOCATION_KEYWORDS  # noqa: E402
+from bench_word_render import timed  # noqa: E402
+
+# 旧实现中的时间正则（每次调用时重新查找编译缓存并依次尝试）
+LEGACY_TIME_PATTERNS = [
+    r'(\d{4})年(\d{1,2})月(\d{1,2})日\s*(\d{1,2}):(\d{1,2})[-,到](\d{1,2}):(\d{1,2})',
+    r'(\d{4})-(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{1,2})[-,到](\d{1,2}):(\d{1,2})',
+    r'(\d{1,2})月(\d{1,2})日\s*(\d{1,2}):(\d{1,2})[-,到](\d{1,2}):(\d{1,2})'
+]
+
+# 会议记录片段，重复拼接得到不同长度的文本
+TRANSCRIPT_LINES = [
+    "张三：大家好，今天我们主要讨论一下下个季度的产品规划和研发排期。",
+    "李四：我先汇报一下上个月的进展，后端接口已经完成了百分之八十，剩下的预计两周内完成。",
+    "王五：测试这边发现了几个性能问题，主要集中在报表导出模块，需要开发同事配合排查。",
+    "赵六：市场部希望新版本能在下个月中旬上线，我们需要评估一下风险。",
+    "张三：好的，那我们先把需求优先级排一下，每个人说一下自己负责模块的情况。",
+]
+
+
+def legacy_extract(text):
+    """旧实现：逐个正则依次搜索，再逐个关键词查找地点"""
+    result = {}
+    for pattern in LEGACY_TIME_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            result["meeting_time"] = match.group(0)
+            break
+    for location in LOCATION_KEYWORDS:
+        if location in text:
+            result["meeting_location"] = location
+            break
+    return result
+
+
+def build_transcript(line_count, with_header):
+    """构造指定行数的会议记录；with_header为False时时间地点不在文本中，需扫描全文"""
+    lines = [TRANSCRIPT_LINES[idx % len(TRANSCRIPT_LINES)] for idx in range(line_count)]
+    if with_header:
+        lines.insert(0, "会议时间：2025年3月5日 14:00-16:00，地点：公司三楼大会议室，预计两小时。")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="字段提取微基准")
+    parser.add_argument("--rounds", type=int, default=50, help="每项测试的执行次数")
+    args = parser.parse_args()
+
+    print(f"{'行数':>6} {'字数':>8} {'含时间地点':>10} {'旧实现(ms)':>12} {'单次扫描(ms)':>14}")
+    for line_count in (10, 200, 2000):
+        for with_header in (True, False):
+            text = build_transcript(line_count, with_header)
+            legacy_ms = statistics.median(timed(lambda: legacy_extract(text), args.rounds))
+            engine_ms = statistics.median(timed(lambda: FIELD_EXTRACTOR.extract(text), args.rounds))
+            print(f"{line_count:>6} {len(text):>8} {str(with_header):>10} {legacy_ms:>12.3f} {engine_ms:>14.3f}")
+
+    # 展示提取结果（含位置与置信度）
+    print()
+    for field, match in FIELD_EXTRACTOR.extract(build_transcript(10, True)).items():
+        print(f"{field}: {match.value}  span={match.span}  confidence={match.confidence}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+长会议记录提取基准：对比“整篇放入一个Prompt”与“分段并发提取后合并（map-reduce）”的耗时，
+以及单Prompt时模型实际看到的原文比例（超出上下文的部分被截断，信息丢失）
+默认使用模拟模型（按Prompt token数计预填充耗时、按输出token数计生成耗时，超出上下文时与Ollama一样截断开头，
+并发数受--parallel限制）；加--ollama时调用OLLAMA_HOST上的真实模型
+用法：python benchmarks/bench_long_input.py [--lines 20 200 1000] [--ollama]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import ollama_client  # noqa: E402
+import model_client  # noqa: E402
+from extraction_cache import ExtractionCache  # noqa: E402
+from long_input import CHARS_PER_TOKEN, OUTPUT_TOKEN_RESERVE  # noqa: E402
+from model_registry import model_registry  # noqa: E402
+
+SPEAKERS = ["张三", "李四", "王五", "赵六", "项目经理", "测试工程师"]
+TRANSCRIPT_LINES = [
+    "大家好，今天我们主要讨论一下下个季度的产品规划和研发排期。",
+    "我先汇报一下上个月的进展，后端接口已经完成了百分之八十，剩下的预计两周内完成。",
+    "测试这边发现了几个性能问题，主要集中在报表导出模块，需要开发同事配合排查。",
+    "市场部希望新版本能在下个月中旬上线，我们需要评估一下风险。",
+    "好的，那我们先把需求优先级排一下，每个人说一下自己负责模块的情况。",
+]
+
+
+def build_transcript(line_count):
+    """构造指定行数的会议逐字稿，开头给出时间地点"""
+    lines = ["会议时间：2025年3月5日 14:00-16:00，地点：公司三楼大会议室。"]
+    for idx in range(line_count):
+        lines.append(f"{SPEAKERS[idx % len(SPEAKERS)]}：{TRANSCRIPT_LINES[idx % len(TRANSCRIPT_LINES)]}")
+    return "\n".join(lines)
+
+
+class SimulatedModel:
+    """
+    模拟Ollama流式输出：输出内容为规则提取结果，耗时按token数计算
+    超出上下文的Prompt与Ollama一样只保留末尾部分
+    """
+
+    def __init__(self, num_ctx, parallel, prefill_ms, decode_ms):
+        self.num_ctx = num_ctx
+        self.prefill_ms = prefill_ms
+        self.decode_ms = decode_ms
+        # 最近一次调用模型看到的会议文本比例
+        self.visible_ratio = 1.0
+        self._slots = threading.Semaphore(parallel)
+        self._extractor = model_client.AdvancedMeetingExtractor(cache=ExtractionCache(cache_dir=""))
+
+    def chat_stream(self, messages, model=None, total_timeout=None, **kwargs):
+        prompt = messages[-1]["content"]
+        prompt_tokens = int((len(messages[0]["content"]) + len(prompt)) / CHARS_PER_TOKEN)
+        visible_prompt = prompt
+        self.visible_ratio = 1.0
+        budget = self.num_ctx - OUTPUT_TOKEN_RESERVE
+        if prompt_tokens > budget:
+            keep_chars = int(budget * CHARS_PER_TOKEN) - len(messages[0]["content"])
+            visible_prompt = model_client.MEETING_TEXT_MARKER + "\n" + prompt[-keep_chars:]
+            text_chars = len(prompt) - prompt.index(model_client.MEETING_TEXT_MARKER)
+            self.visible_ratio = min(1.0, keep_chars / text_chars)
+            prompt_tokens = budget
+        output = json.dumps(self._extractor._generate_smart_mock_data(visible_prompt), ensure_ascii=False)
+
+        with self._slots:
+            time.sleep(prompt_tokens * self.prefill_ms / 1000)
+            tokens = 0
+            for idx in range(0, len(output), 4):
+                time.sleep(self.decode_ms / 1000)
+                tokens += 1
+                yield {"message": {"role": "assistant", "content": output[idx:idx + 4]}, "done": False}
+        yield {"message": {"role": "assistant", "content": ""}, "done": True,
+               "eval_count": tokens, "eval_duration": int(tokens * self.decode_ms * 1e6)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="长会议记录提取基准")
+    parser.add_argument("--lines", type=int, nargs="+", default=[20, 200, 1000], help="逐字稿行数")
+    parser.add_argument("--ollama", action="store_true", help="调用真实的Ollama服务，而不是模拟模型")
+    parser.add_argument("--num-ctx", type=int, default=4096, help="模拟模型的上下文长度（token）")
+    parser.add_argument("--parallel", type=int, default=4, help="模拟模型的并发数（OLLAMA_NUM_PARALLEL）")
+    parser.add_argument("--prefill-ms", type=float, default=0.5, help="模拟模型每个Prompt token的预填充耗时")
+    parser.add_argument("--decode-ms", type=float, default=25, help="模拟模型每个输出token的生成耗时")
+    args = parser.parse_args()
+
+    simulated = None
+    if not args.ollama:
+        simulated = SimulatedModel(args.num_ctx, args.parallel, args.prefill_ms, args.decode_ms)
+        ollama_client.chat_stream = simulated.chat_stream
+        # 模拟模型视为已安装，上下文长度取--num-ctx
+        model_registry.installed = [model_client.MODEL_NAME]
+        model_registry._thread_pid = os.getpid()
+        model_registry._context_lengths[model_client.MODEL_NAME] = args.num_ctx
+
+    model = model_registry.best_model()
+    extractor = model_client.AdvancedMeetingExtractor(cache=ExtractionCache(cache_dir=""))
+    print(f"模型: {model}  上下文: {model_registry.context_length(model)} tokens  "
+          f"{'真实Ollama' if args.ollama else '模拟模型'}")
+    print(f"{'行数':>6} {'字数':>8} {'分段':>4} {'单Prompt(s)':>12} {'单Prompt可见原文':>16} {'分段合并(s)':>12}")
+
+    for line_count in args.lines:
+        text = build_transcript(line_count)
+        meeting_type = extractor.classifier.classify_meeting_type(text)
+        chunks = extractor.split_input(text, meeting_type, model)
+
+        start = time.perf_counter()
+        extractor._call_model(extractor.get_meeting_prompt_by_type(meeting_type, text), model)
+        single_seconds = time.perf_counter() - start
+        visible = f"{simulated.visible_ratio:.0%}" if simulated else "-"
+
+        start = time.perf_counter()
+        if len(chunks) > 1:
+            extractor._call_model_chunked(meeting_type, chunks, model)
+        else:
+            extractor._call_model(extractor.get_meeting_prompt_by_type(meeting_type, text), model)
+        merged_seconds = time.perf_counter() - start
+
+        print(f"{line_count:>6} {len(text):>8} {len(chunks):>4} {single_seconds:>12.2f} {visible:>16} "
+              f"{merged_seconds:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+快速渲染器（ooxml_writer）与python-docx渲染器的一致性校验和基准测试
+先逐个对比两种渲染器输出的压缩包文件列表与每个文件内容，不一致时以非0状态码退出；再对比渲染耗时
+用法：python benchmarks/bench_ooxml_render.py [--rounds 50]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import ooxml_writer  # noqa: E402
+import word_generator  # noqa: E402
+from bench_word_render import sample_meeting_info, timed  # noqa: E402
+
+# 一致性校验用例：覆盖特殊字符、换行、制表符、首尾空格、缺失字段与空议程
+PARITY_CASES = [
+    sample_meeting_info(0),
+    sample_meeting_info(3),
+    sample_meeting_info(20),
+    {},
+    {"meeting_topic": "A&B <季度> \"规划\"", "meeting_location": " 3楼\t会议室 ",
+     "participants": "张三\n李四\r\n王五", "meeting_duration": "",
+     "agenda": [{"title": " 开场"}, {}, {"leader": "李四&王五"}]},
+]
+
+
+def check_parity():
+    """返回不一致的用例描述列表"""
+    failures = []
+    for idx, info in enumerate(PARITY_CASES):
+        expected = zipfile.ZipFile(io.BytesIO(word_generator.render_meeting_word(info, renderer="docx")))
+        actual = zipfile.ZipFile(io.BytesIO(ooxml_writer.render_meeting_word(info)))
+        if actual.testzip() is not None:
+            failures.append(f"用例{idx}：压缩包损坏")
+            continue
+        if expected.namelist() != actual.namelist():
+            failures.append(f"用例{idx}：文件列表不一致")
+            continue
+        for name in expected.namelist():
+            if expected.read(name) != actual.read(name):
+                failures.append(f"用例{idx}：{name}内容不一致")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="快速渲染器一致性校验与基准测试")
+    parser.add_argument("--rounds", type=int, default=50, help="每项测试的执行次数")
+    args = parser.parse_args()
+
+    failures = check_parity()
+    if failures:
+        print("一致性校验失败：")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"一致性校验通过（{len(PARITY_CASES)}个用例，压缩包内所有文件逐字节一致）")
+
+    word_generator.prepare_template()
+    ooxml_writer.prepare_template()
+    print(f"{'议题数':>6} {'python-docx(ms)':>16} {'ooxml(ms)':>10} {'加速比':>8}")
+    for agenda_size in (0, 3, 20, 100):
+        info = sample_meeting_info(agenda_size)
+        docx_ms = statistics.median(timed(lambda: word_generator.render_meeting_word(info, renderer="docx"),
+                                          args.rounds))
+        ooxml_ms = statistics.median(timed(lambda: ooxml_writer.render_meeting_word(info), args.rounds))
+        print(f"{agenda_size:>6} {docx_ms:>16.2f} {ooxml_ms:>10.2f} {docx_ms / ooxml_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
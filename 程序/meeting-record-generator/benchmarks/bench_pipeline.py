@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成流程分阶段基准：分别统计会议类型识别、Prompt构建、规则提取、模型输出解析、必需字段补全、
+Word渲染（不同议题数）以及Flask /generate-meeting完整请求的耗时，输入从一句话到超长逐字稿
+（Word渲染统计render_meeting_word：generate_meeting_word只是在其后写入固定的temp文件）
+Ollama由进程内的确定性模拟客户端代替（固定输出，默认不模拟生成延迟），结果可重复、可跨版本比较
+结果以JSON输出，可保存为基线并在之后的版本上比较，中位数变慢超过阈值时以退出码1结束
+用法：
+    python benchmarks/bench_pipeline.py [--rounds 20] [--output result.json]
+    python benchmarks/bench_pipeline.py --compare baseline.json [--threshold 0.2]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 渲染的文档写入临时目录（须在导入后端模块之前设置）：不在仓库中留下.docx，每次运行都从空存储开始
+os.environ["MEETING_ARTIFACT_DIR"] = tempfile.mkdtemp(prefix="bench-artifacts-")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import ollama_client  # noqa: E402
+import model_client  # noqa: E402
+import word_generator  # noqa: E402
+from bench_long_input import build_transcript  # noqa: E402
+from bench_word_render import sample_meeting_info  # noqa: E402
+from model_registry import model_registry  # noqa: E402
+from partial_json import TopLevelFieldParser  # noqa: E402
+
+# 输入规模：名称 -> 会议文本
+INPUT_CASES = {
+    "note": "明天下午三点在三楼会议室开项目周会，张三、李四参加，讨论上线排期",
+    "short": build_transcript(20),
+    "long": build_transcript(200),
+    "very_long": build_transcript(2000),
+}
+AGENDA_SIZES = (0, 3, 20)
+
+# 模拟模型的固定输出
+FAKE_MODEL_OUTPUT = json.dumps({
+    "meeting_topic": "季度产品规划与研发排期",
+    "meeting_location": "三楼大会议室",
+    "meeting_time": "2025年03月05日 14:00-16:00",
+    "participants": "张三,李四,王五,赵六",
+    "meeting_duration": "2小时",
+    "agenda": [
+        {"title": "上月进展汇报", "leader": "李四", "preparation": "准备进度报告", "participants": "项目组"},
+        {"title": "性能问题排查", "leader": "王五", "preparation": "准备问题清单", "participants": "开发、测试"},
+        {"title": "上线风险评估", "leader": "赵六", "preparation": "准备上线计划", "participants": "全体"},
+    ],
+    "global_preparation": "各模块负责人准备进度数据",
+}, ensure_ascii=False)
+
+
+class FakeOllamaClient:
+    """
+    确定性的进程内Ollama客户端（替代ollama.Client）：list/show返回固定模型信息，
+    chat按每4个字符一个分块流式返回FAKE_MODEL_OUTPUT
+    """
+
+    def __init__(self, token_ms: float = 0.0, num_ctx: int = 4096):
+        self.token_ms = token_ms
+        self.num_ctx = num_ctx
+        self.calls = 0
+
+    def list(self):
+        return {"models": [{"name": model_client.MODEL_NAME}]}
+
+    def show(self, model):
+        class ShowResponse:
+            parameters = f"num_ctx {self.num_ctx}"
+            modelinfo = {}
+        return ShowResponse()
+
+    def chat(self, model=None, messages=None, stream=False, **kwargs):
+        self.calls += 1
+        chunks = self._chunks()
+        return chunks if stream else list(chunks)[-1]
+
+    def _chunks(self):
+        tokens = 0
+        for idx in range(0, len(FAKE_MODEL_OUTPUT), 4):
+            if self.token_ms:
+                time.sleep(self.token_ms / 1000)
+            tokens += 1
+            yield {"message": {"role": "assistant", "content": FAKE_MODEL_OUTPUT[idx:idx + 4]}, "done": False}
+        yield {"message": {"role": "assistant", "content": ""}, "done": True,
+               "eval_count": tokens, "eval_duration": max(1, int(tokens * self.token_ms * 1e6))}
+
+
+def install_fake_ollama(token_ms: float) -> FakeOllamaClient:
+    """用模拟客户端替换进程内共享的Ollama客户端"""
+    fake = FakeOllamaClient(token_ms)
+    ollama_client._client = fake
+    ollama_client._client_pid = os.getpid()
+    model_registry._thread_pid = os.getpid()
+    model_registry.refresh()
+    return fake
+
+
+# 单次采样的最短耗时（毫秒）：很快的阶段在一次采样内重复执行多次，减少计时误差
+MIN_SAMPLE_MS = 2.0
+
+
+def measure(fn, rounds):
+    """先执行一次预热并确定每次采样的重复次数，再采样rounds次，返回单次执行的耗时统计（毫秒）"""
+    start = time.perf_counter()
+    fn()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    repeat = max(1, int(MIN_SAMPLE_MS / elapsed_ms)) if elapsed_ms > 0 else 1000
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / repeat)
+    samples.sort()
+    return {
+        "rounds": rounds,
+        "repeat": repeat,
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+    }
+
+
+def parse_model_output():
+    """模型输出解析：与_stream_model相同，逐块喂入增量解析器"""
+    parser = TopLevelFieldParser()
+    for idx in range(0, len(FAKE_MODEL_OUTPUT), 4):
+        parser.feed(FAKE_MODEL_OUTPUT[idx:idx + 4])
+    return parser.fields
+
+
+def run_benchmarks(rounds):
+    import main  # 初始化Flask应用（Word骨架在首次渲染时构建）
+
+    extractor = model_client.AdvancedMeetingExtractor()
+    classifier = extractor.classifier
+    client = main.app.test_client()
+    results = []
+
+    def record(stage, case, fn, stage_rounds=rounds):
+        stats = measure(fn, stage_rounds)
+        results.append({"stage": stage, "case": case, **stats})
+        print(f"{stage:<24} {case:<12} {stats['median_ms']:>12.3f} {stats['p95_ms']:>12.3f}", file=sys.stderr)
+
+    def round_trip(text, clear_cache):
+        if clear_cache:
+            model_client.extraction_cache.clear()
+            main.artifact_store.clear()
+        response = client.post("/generate-meeting", json={"input_text": text})
+        if response.status_code != 200:
+            raise RuntimeError(f"/generate-meeting返回{response.status_code}: {response.get_data(as_text=True)}")
+
+    print(f"{'阶段':<24} {'输入':<12} {'中位数(ms)':>12} {'p95(ms)':>12}", file=sys.stderr)
+    for case, text in INPUT_CASES.items():
+        meeting_type = classifier.classify_meeting_type(text)
+        prompt = extractor.get_meeting_prompt_by_type(meeting_type, text)
+        record("classify_meeting_type", case, lambda: classifier.classify_meeting_type(text))
+        record("get_meeting_prompt", case, lambda: extractor.get_meeting_prompt_by_type(meeting_type, text))
+        record("extract_info_from_text", case, lambda: extractor._extract_info_from_text(prompt))
+
+    record("parse_model_output", "-", parse_model_output)
+    record("ensure_required_fields", "-", lambda: extractor._ensure_required_fields(parse_model_output()))
+
+    for agenda_size in AGENDA_SIZES:
+        info = sample_meeting_info(agenda_size)
+        record("render_meeting_word", f"agenda={agenda_size}", lambda: word_generator.render_meeting_word(info))
+
+    # 完整请求较慢，次数减半；cold每次清空提取缓存与文档存储（经过模拟模型并重新渲染），cached命中缓存
+    for case, text in INPUT_CASES.items():
+        record("flask_generate_cold", case, lambda: round_trip(text, True), max(3, rounds // 2))
+        record("flask_generate_cached", case, lambda: round_trip(text, False), max(3, rounds // 2))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold, min_delta_ms):
+    """与基线比较各阶段中位数，返回变慢超过阈值（且绝对差值超过min_delta_ms）的项"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(item["stage"], item["case"]): item for item in json.load(f)["results"]}
+    regressions = []
+    print(f"\n与基线比较（{baseline_path}，阈值{threshold:.0%}）", file=sys.stderr)
+    for item in results:
+        base = baseline.get((item["stage"], item["case"]))
+        if base is None or not base["median_ms"]:
+            continue
+        change = item["median_ms"] / base["median_ms"] - 1
+        regressed = change > threshold and item["median_ms"] - base["median_ms"] > min_delta_ms
+        mark = "  变慢" if regressed else ""
+        print(f"{item['stage']:<24} {item['case']:<12} {base['median_ms']:>12.3f} -> {item['median_ms']:>10.3f} "
+              f"{change:>+8.1%}{mark}", file=sys.stderr)
+        if regressed:
+            regressions.append({"stage": item["stage"], "case": item["case"], "change": round(change, 4)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成流程分阶段基准")
+    parser.add_argument("--rounds", type=int, default=20, help="每项测试的执行次数")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="模拟模型每个输出分块的生成耗时（毫秒）")
+    parser.add_argument("--output", help="结果JSON的保存路径（默认输出到标准输出）")
+    parser.add_argument("--compare", help="基线结果JSON，比较各阶段中位数")
+    parser.add_argument("--threshold", type=float, default=0.2, help="中位数变慢超过该比例视为性能回退")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="绝对差值低于该值（毫秒）时不视为回退")
+    args = parser.parse_args()
+
+    fake = install_fake_ollama(args.token_ms)
+    results = run_benchmarks(args.rounds)
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rounds": args.rounds,
+            "token_ms": args.token_ms,
+            "prompt_version": model_client.PROMPT_VERSION,
+            "fake_model_calls": fake.calls,
+        },
+        "results": results,
+    }
+    if args.compare:
+        report["regressions"] = compare(results, args.compare, args.threshold, args.min_delta_ms)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
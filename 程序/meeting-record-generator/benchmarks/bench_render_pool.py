@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Word渲染并发基准：对比多线程渲染（受GIL限制）与渲染进程池的吞吐，
+以及渲染期间Web进程中其他请求的处理延迟（用一段短小的纯Python计算模拟）
+用法：python benchmarks/bench_render_pool.py [--docs 200] [--concurrency 8] [--processes 4]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import word_generator  # noqa: E402
+from bench_word_render import sample_meeting_info  # noqa: E402
+from render_pool import RenderPool  # noqa: E402
+
+
+def probe_latencies(stop):
+    """渲染期间每10ms执行一次短小计算，记录实际耗时（毫秒）"""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        sum(range(2000))
+        samples.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+    return samples
+
+
+def run(render_fn, docs, concurrency):
+    """并发渲染docs个文档，返回(总耗时秒, 探测延迟p50, 探测延迟p99)"""
+    info = sample_meeting_info(5)
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as prober:
+        probe = prober.submit(probe_latencies, stop)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda _: render_fn(info), range(docs)))
+        seconds = time.perf_counter() - start
+        stop.set()
+        samples = sorted(probe.result())
+    return seconds, statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word渲染并发基准")
+    parser.add_argument("--docs", type=int, default=200, help="渲染文档数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发请求数")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 4, help="渲染进程数")
+    args = parser.parse_args()
+
+    word_generator.prepare_template()
+    pool = RenderPool(processes=args.processes)
+    pool.start()
+    # 预热：确保渲染进程均已启动并构建好骨架
+    for future in [pool.submit(sample_meeting_info(1)) for _ in range(args.processes * 2)]:
+        future.result()
+
+    print(f"CPU核数: {os.cpu_count()}  文档数: {args.docs}  并发: {args.concurrency}")
+    print(f"{'方式':<16} {'总耗时(s)':>10} {'文档/秒':>8} {'探测延迟p50(ms)':>16} {'p99(ms)':>10}")
+    for name, render_fn in (("线程", word_generator.render_meeting_word),
+                            (f"进程池({args.processes})", pool.render)):
+        seconds, p50, p99 = run(render_fn, args.docs, args.concurrency)
+        print(f"{name:<16} {seconds:>10.2f} {args.docs / seconds:>8.1f} {p50:>16.3f} {p99:>10.3f}")
+    print(pool.stats())
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Word渲染基准测试：对比“每次重新构建整个文档”与“复制预构建骨架后填充”的耗时
+用法：python benchmarks/bench_word_render.py [--rounds 50]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import word_generator  # noqa: E402
+
+
+def sample_meeting_info(agenda_size):
+    """构造指定议题数量的会议信息"""
+    return {
+        "meeting_topic": "项目进度会议",
+        "meeting_location": "三楼大会议室",
+        "participants": "张三,李四,王五,赵六",
+        "meeting_duration": "1小时",
+        "agenda": [
+            {"title": f"议题{idx + 1}", "leader": "项目经理",
+             "preparation": "准备进度报告", "participants": "项目组全体"}
+            for idx in range(agenda_size)
+        ],
+    }
+
+
+def timed(fn, rounds):
+    """执行rounds次，返回每次耗时（毫秒）列表"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word渲染基准测试")
+    parser.add_argument("--rounds", type=int, default=50, help="每项测试的执行次数")
+    args = parser.parse_args()
+
+    word_generator.prepare_template()
+    print(f"{'议题数':>6} {'阶段':<10} {'重新构建(ms)':>14} {'骨架复制(ms)':>14} {'加速比':>8}")
+    for agenda_size in (0, 3, 20):
+        info = sample_meeting_info(agenda_size)
+        stages = {
+            # 仅构建文档对象
+            "build": (
+                lambda: word_generator._fill_meeting_document(word_generator._build_skeleton_document(), info),
+                lambda: word_generator.build_meeting_document(info),
+            ),
+            # 构建并保存为.docx字节
+            "render": (
+                lambda: word_generator._fill_meeting_document(
+                    word_generator._build_skeleton_document(), info).save(io.BytesIO()),
+                lambda: word_generator.render_meeting_word(info),
+            ),
+        }
+        for stage, (rebuild, from_template) in stages.items():
+            rebuild_ms = statistics.median(timed(rebuild, args.rounds))
+            template_ms = statistics.median(timed(from_template, args.rounds))
+            print(f"{agenda_size:>6} {stage:<10} {rebuild_ms:>14.2f} {template_ms:>14.2f} "
+                  f"{rebuild_ms / template_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
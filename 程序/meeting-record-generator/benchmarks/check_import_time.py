@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动导入耗时检查：用python -X importtime导入后端模块（默认main），报告总耗时与最慢的模块，
+超过预算或启动时导入了应延迟加载的重量级模块（ollama、httpx、python-docx、lxml）时以退出码1结束
+用法：python benchmarks/check_import_time.py [--module main] [--budget-ms 500] [--runs 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+# 导入耗时预算（毫秒，可通过环境变量覆盖）
+IMPORT_BUDGET_MS = float(os.environ.get("MEETING_IMPORT_BUDGET_MS", "500"))
+# 启动时不应导入的模块：首次调用Ollama或首次渲染Word时才加载
+LAZY_MODULES = ("ollama", "httpx", "docx", "lxml", "word_generator")
+
+
+def measure_import(module):
+    """
+    在新的解释器中导入module
+    :return: (总耗时毫秒, {模块名: (自身耗时毫秒, 累计耗时毫秒)})
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=BACKEND_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"导入{module}失败：\n{result.stderr}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not self_us.isdigit():
+            continue  # 表头
+        modules[name] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    if module not in modules:
+        raise RuntimeError(f"未能从-X importtime输出中找到{module}")
+    return modules[module][1], modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动导入耗时检查")
+    parser.add_argument("--module", default="main", help="要检查的后端模块")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="导入耗时预算（毫秒）")
+    parser.add_argument("--runs", type=int, default=3, help="导入次数，取最快的一次（减少磁盘缓存等干扰）")
+    parser.add_argument("--top", type=int, default=10, help="报告最慢的模块数")
+    args = parser.parse_args()
+
+    total_ms, modules = min((measure_import(args.module) for _ in range(args.runs)), key=lambda item: item[0])
+    print(f"import {args.module}: {total_ms:.1f} ms（预算 {args.budget_ms:.0f} ms）")
+    print(f"{'自身(ms)':>10} {'累计(ms)':>10}  模块")
+    for name, (self_ms, cumulative_ms) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{self_ms:>10.1f} {cumulative_ms:>10.1f}  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"导入耗时{total_ms:.1f} ms超过预算{args.budget_ms:.0f} ms")
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f"启动时导入了应延迟加载的模块：{', '.join(eager)}")
+    for failure in failures:
+        print(f"失败：{failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
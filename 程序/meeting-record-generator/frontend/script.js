@@ -1,3 +1,179 @@
+// 轮询任务状态的间隔（毫秒）
+const POLL_INTERVAL_MS = 1000;
+
+// 实时展示的字段名称（顺序即展示顺序）
+const FIELD_LABELS = {
+    meeting_type_display: '会议类型',
+    meeting_topic: '会议主题',
+    meeting_time: '会议时间',
+    meeting_location: '会议地点',
+    participants: '参会人员',
+    meeting_duration: '会议时长',
+    agenda: '会议议程',
+    global_preparation: '会前准备',
+};
+
+// 当前正在进行的生成：{ controller: AbortController, jobId: 异步任务ID }，没有时为null
+let currentGeneration = null;
+
+// 等待指定毫秒数
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// 取消当前的生成：中止进行中的请求（流式接口的连接随之关闭，后端停止生成），异步任务另外通知后端取消
+function cancelGeneration() {
+    if (!currentGeneration) return;
+    const { controller, jobId } = currentGeneration;
+    currentGeneration = null;
+    controller.abort();
+    // keepalive：关闭页面时请求也能发出
+    if (jobId) fetch(`/jobs/${jobId}`, { method: 'DELETE', keepalive: true }).catch(() => {});
+}
+
+// 轮询任务状态，直到任务完成或失败
+async function waitForJob(jobId, loading, signal) {
+    while (true) {
+        const response = await fetch(`/jobs/${jobId}`, { signal });
+        if (!response.ok) throw new Error('查询任务状态失败');
+        const job = await response.json();
+
+        if (job.status === 'done') return job;
+        if (job.status === 'failed') throw new Error(job.error || '生成失败');
+        if (job.status === 'cancelled') throw new DOMException('任务已取消', 'AbortError');
+
+        // 显示当前进度（排队中 / 生成中）
+        const stage = job.status === 'queued' ? '排队中' : '生成中';
+        loading.textContent = `${stage}...（已用时${Math.round(job.total_seconds)}秒）`;
+        await sleep(POLL_INTERVAL_MS);
+        if (signal.aborted) throw new DOMException('已取消', 'AbortError');
+    }
+}
+
+// 异步任务方式生成：提交任务、轮询状态，返回Word文件的临时下载链接
+async function generateWithJob(inputText, loading, generation) {
+    const { signal } = generation.controller;
+    // 1. 提交生成任务，立即获得任务ID
+    const submitResponse = await fetch('/jobs', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json', // 传递JSON格式数据
+        },
+        body: JSON.stringify({ input_text: inputText }), // 发送用户输入的文本
+        signal,
+    });
+    if (submitResponse.status === 503) throw new Error('服务繁忙，请稍后重试');
+    if (!submitResponse.ok) throw new Error('提交失败，请检查后端服务是否启动');
+    const { job_id: jobId } = await submitResponse.json();
+    // 记录任务ID，取消时通知后端（提交期间已取消时立即取消任务）
+    generation.jobId = jobId;
+    if (signal.aborted) {
+        fetch(`/jobs/${jobId}`, { method: 'DELETE', keepalive: true }).catch(() => {});
+        throw new DOMException('已取消', 'AbortError');
+    }
+
+    // 2. 轮询任务状态
+    await waitForJob(jobId, loading, signal);
+
+    // 3. 下载生成的Word文件流
+    const response = await fetch(`/jobs/${jobId}/result`, { signal });
+    if (!response.ok) throw new Error('下载失败');
+    const blob = await response.blob(); // 转换为文件流
+    return window.URL.createObjectURL(blob); // 创建临时下载链接
+}
+
+// 读取SSE事件流，每收到一个完整事件调用一次onEvent(事件名, 数据)
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // 事件之间以空行分隔
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const message = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            let event = 'message';
+            const dataLines = [];
+            for (const line of message.split('\n')) {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+            }
+            if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
+        }
+    }
+}
+
+// 将字段值格式化为展示文本（议程逐条展示）
+function formatFieldValue(name, value) {
+    if (name === 'agenda' && Array.isArray(value)) {
+        return value.map((item, idx) => `${idx + 1}. ${item.title || ''}（负责人：${item.leader || '待确认'}）`).join('\n');
+    }
+    return typeof value === 'string' ? value : JSON.stringify(value);
+}
+
+// 显示或更新一个已提取的字段
+function renderField(fieldList, name, value) {
+    if (!(name in FIELD_LABELS)) return;
+    let item = fieldList.querySelector(`dd[data-field="${name}"]`);
+    if (!item) {
+        const term = document.createElement('dt');
+        term.textContent = FIELD_LABELS[name];
+        item = document.createElement('dd');
+        item.dataset.field = name;
+        fieldList.append(term, item);
+    }
+    item.textContent = formatFieldValue(name, value);
+}
+
+// 流式方式生成：实时展示会议类型、生成速度与已提取的字段，返回Word文件的下载地址
+// 中止signal时连接随之关闭，后端检测到断开后停止模型生成，也不再渲染Word
+async function generateWithStream(inputText, loading, signal) {
+    const response = await fetch('/generate-meeting/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ input_text: inputText }),
+        signal,
+    });
+    if (!response.ok) throw new Error('提交失败，请检查后端服务是否启动');
+
+    const live = document.getElementById('live');
+    const liveStatus = document.getElementById('live-status');
+    const fieldList = document.getElementById('live-fields');
+    fieldList.innerHTML = '';
+    liveStatus.textContent = '正在识别会议类型...';
+    live.style.display = 'block';
+
+    let downloadUrl = null;
+    await readEventStream(response, (event, data) => {
+        if (event === 'classified') {
+            renderField(fieldList, 'meeting_type_display', data.meeting_type_display);
+            liveStatus.textContent = '正在提取会议信息...';
+        } else if (event === 'progress') {
+            const speed = data.tokens_per_second ? `，${data.tokens_per_second} tokens/秒` : '';
+            liveStatus.textContent = `${data.done ? '提取完成' : '正在提取会议信息'}：已生成${data.tokens}个token${speed}`;
+            loading.textContent = data.done ? '正在生成Word文档...' : '生成中...';
+        } else if (event === 'field') {
+            renderField(fieldList, data.name, data.value);
+        } else if (event === 'done') {
+            downloadUrl = data.download_url;
+            liveStatus.textContent = `生成完成（信息提取${data.timings.extract}秒，文档生成${data.timings.render}秒）`;
+        } else if (event === 'error') {
+            throw new Error(data.error);
+        }
+    });
+    if (!downloadUrl) throw new Error('生成中断，请重试');
+    return downloadUrl;
+}
+
+// 取消按钮；关闭或离开页面时同样取消（不再为无人下载的结果占用模型）
+document.getElementById('cancel-btn').addEventListener('click', cancelGeneration);
+window.addEventListener('pagehide', cancelGeneration);
+
 // 绑定生成按钮点击事件
 document.getElementById('generate-btn').addEventListener('click', async () => {
     // 获取DOM元素
@@ -5,6 +181,7 @@ document.getElementById('generate-btn').addEventListener('click', async () => {
     const loading = document.getElementById('loading');
     const result = document.getElementById('result');
     const downloadLink = document.getElementById('download-link');
+    const cancelButton = document.getElementById('cancel-btn');
 
     // 输入校验：若为空则提示
     if (!inputText) {
@@ -12,24 +189,23 @@ document.getElementById('generate-btn').addEventListener('click', async () => {
         return;
     }
 
+    // 再次点击生成时取消上一次仍在进行的生成
+    cancelGeneration();
+    const generation = { controller: new AbortController(), jobId: null };
+    currentGeneration = generation;
+
     // 显示加载状态，隐藏结果
+    loading.textContent = '提交中...';
     loading.style.display = 'inline-block';
+    cancelButton.style.display = 'inline-block';
     result.style.display = 'none';
 
     try {
-        // 调用后端Flask接口（注意地址与后端一致）
-        const response = await fetch('/generate-meeting', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json', // 传递JSON格式数据
-            },
-            body: JSON.stringify({ input_text: inputText }), // 发送用户输入的文本
-        });
-
-        // 处理后端返回的Word文件流
-        if (!response.ok) throw new Error('生成失败，请检查后端服务是否启动');
-        const blob = await response.blob(); // 转换为文件流
-        const url = window.URL.createObjectURL(blob); // 创建临时下载链接
+        // 浏览器支持读取响应流时使用流式接口，否则退回异步任务轮询
+        const streamSupported = typeof ReadableStream !== 'undefined' && typeof TextDecoder !== 'undefined';
+        const url = streamSupported
+            ? await generateWithStream(inputText, loading, generation.controller.signal)
+            : await generateWithJob(inputText, loading, generation);
 
         // 显示结果，设置下载链接
         downloadLink.href = url;
@@ -37,9 +213,20 @@ document.getElementById('generate-btn').addEventListener('click', async () => {
         result.style.display = 'block';
 
     } catch (error) {
-        // 异常处理：提示错误并打印日志
+        // 已被新的生成取代时不改动页面
+        if (currentGeneration !== null && currentGeneration !== generation) return;
         loading.style.display = 'none';
-        alert(`操作失败：${error.message}`);
-        console.error('错误详情：', error);
+        // 用户取消：不提示错误
+        if (error.name !== 'AbortError') {
+            // 异常处理：提示错误并打印日志
+            alert(`操作失败：${error.message}`);
+            console.error('错误详情：', error);
+        }
+    } finally {
+        // 没有被新的生成取代时结束本次生成
+        if (currentGeneration === generation || currentGeneration === null) {
+            currentGeneration = null;
+            cancelButton.style.display = 'none';
+        }
     }
 });
\ No newline at end of file
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+# 测试不访问真实的Ollama，也不向仓库目录写入渲染结果（须在导入后端模块之前设置）
+os.environ.setdefault("OLLAMA_HOST", "http://127.0.0.1:9")
+os.environ.setdefault("MEETING_ARTIFACT_DIR", tempfile.mkdtemp(prefix="meeting-artifacts-"))
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+import pytest  # noqa: E402
+
+import ollama_client  # noqa: E402
+from model_registry import model_registry  # noqa: E402
+
+# 模拟模型的固定输出
+FAKE_MODEL_OUTPUT = json.dumps({
+    "meeting_topic": "季度产品规划",
+    "meeting_location": "三楼大会议室",
+    "meeting_time": "2025年03月05日 14:00-16:00",
+    "participants": "张三,李四",
+    "meeting_duration": "2小时",
+    "agenda": [{"title": "上线排期", "leader": "张三", "preparation": "准备计划", "participants": "全体"}],
+    "global_preparation": "准备进度数据",
+}, ensure_ascii=False)
+
+
+def fake_chunks(text=FAKE_MODEL_OUTPUT, size=4):
+    """Ollama流式输出的分块：每size个字符一块，最后一块done为True"""
+    for idx in range(0, len(text), size):
+        yield {"message": {"role": "assistant", "content": text[idx:idx + size]}, "done": False}
+    yield {"message": {"role": "assistant", "content": ""}, "done": True}
+
+
+def wait_until(condition, timeout=2.0):
+    """轮询等待condition成立（Ollama流由读取线程异步关闭）"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class FakeOllamaClient:
+    """进程内的Ollama客户端（替代ollama.Client），chat流式返回FAKE_MODEL_OUTPUT"""
+
+    def __init__(self):
+        self.calls = 0
+        self.closed = 0
+
+    def list(self):
+        return {"models": [{"name": ollama_client.OLLAMA_MODEL}]}
+
+    def show(self, model):
+        raise RuntimeError("模拟客户端不提供模型信息")
+
+    def chat(self, model=None, messages=None, stream=False, **kwargs):
+        self.calls += 1
+        return self._stream()
+
+    def _stream(self):
+        try:
+            yield from fake_chunks()
+        finally:
+            self.closed += 1
+
+
+@pytest.fixture
+def fake_ollama(monkeypatch):
+    """用模拟客户端替换进程内共享的Ollama客户端，模型登记表直接使用OLLAMA_MODEL"""
+    fake = FakeOllamaClient()
+    monkeypatch.setattr(ollama_client, "_client", fake)
+    monkeypatch.setattr(ollama_client, "_client_pid", os.getpid())
+    # 不启动后台刷新线程
+    monkeypatch.setattr(model_registry, "_thread_pid", os.getpid())
+    monkeypatch.setattr(model_registry, "installed", [ollama_client.OLLAMA_MODEL])
+    return fake
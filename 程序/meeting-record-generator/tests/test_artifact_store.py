@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from artifact_store import ArtifactStore, make_artifact_key
+
+KB = 1024 / (1024 * 1024)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(root=str(tmp_path), quota_mb=10 * KB)
+
+
+def test_key_depends_on_content_not_key_order():
+    assert make_artifact_key({"a": 1, "b": 2}) == make_artifact_key({"b": 2, "a": 1})
+    assert make_artifact_key({"a": 1}) != make_artifact_key({"a": 2})
+    assert make_artifact_key({"a": 1}, "v1") != make_artifact_key({"a": 1}, "v2")
+
+
+@pytest.mark.parametrize("key", ["../etc/passwd", "A" * 64, "0" * 63, "", "0" * 64 + "/"])
+def test_lookup_rejects_invalid_keys(store, key):
+    assert store.lookup(key) is None
+    assert store.read(key) is None
+
+
+def test_put_and_read(store):
+    key = make_artifact_key({"topic": "周会"})
+    path = store.put(key, b"docx")
+    assert path == store.path(key)
+    assert store.read(key) == b"docx"
+    assert store.stats()["hits"] == 1
+
+
+def test_evicts_least_recently_used_over_quota(store):
+    keys = [make_artifact_key({"n": n}) for n in range(3)]
+    for key in keys:
+        store.put(key, b"x" * 4096)
+    # 三个4KB超出10KB配额，最早写入的被淘汰
+    assert store.read(keys[0]) is None
+    assert not os.path.exists(store.path(keys[0]))
+
+    # 访问keys[1]后它成为最近使用的，再写入时淘汰keys[2]
+    assert store.read(keys[1]) is not None
+    store.put(make_artifact_key({"n": 3}), b"x" * 4096)
+    assert store.read(keys[1]) is not None
+    assert store.read(keys[2]) is None
+    stats = store.stats()
+    assert stats["evictions"] == 2
+    assert stats["bytes"] <= stats["quota_bytes"]
+
+
+def test_document_larger_than_quota_is_not_stored(store):
+    assert store.put(make_artifact_key({"n": 0}), b"x" * 20 * 1024) is None
+    assert store.stats()["entries"] == 0
+
+
+def test_disabled_store_renders_every_time(tmp_path):
+    store = ArtifactStore(root=str(tmp_path), quota_mb=0)
+    calls = []
+    render = lambda info: calls.append(info) or b"docx"
+    assert store.render({"n": 0}, render)[1:] == (b"docx", False)
+    assert store.render({"n": 0}, render)[1:] == (b"docx", False)
+    assert len(calls) == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_render_reuses_stored_document(store):
+    calls = []
+    render = lambda info: calls.append(info) or b"docx"
+    key, data, stored = store.render({"n": 0}, render)
+    assert (data, stored) == (b"docx", True)
+    assert store.render({"n": 0}, render) == (key, b"docx", True)
+    assert len(calls) == 1
+
+
+def test_render_survives_concurrent_eviction(store):
+    key, _, _ = store.render({"n": 0}, lambda info: b"docx")
+    # 其他工作进程淘汰了该文档：重新渲染而不是返回已不存在的文件
+    os.remove(store.path(key))
+    assert store.render({"n": 0}, lambda info: b"again") == (key, b"again", True)
+
+
+def test_index_is_recovered_from_directory(tmp_path):
+    first = ArtifactStore(root=str(tmp_path), quota_mb=10 * KB)
+    key = make_artifact_key({"n": 0})
+    first.put(key, b"docx")
+    second = ArtifactStore(root=str(tmp_path), quota_mb=10 * KB)
+    assert second.read(key) == b"docx"
+    assert second.stats()["bytes"] == 4
+
+
+def test_clear_removes_documents(store):
+    key = make_artifact_key({"n": 0})
+    store.put(key, b"docx")
+    store.clear()
+    assert store.read(key) is None
+    assert store.stats()["bytes"] == 0
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("asgiref")
+
+import asgi  # noqa: E402
+import main  # noqa: E402
+from profiling import profiler  # noqa: E402
+
+MEETING_INFO = {"meeting_topic": "周会", "meeting_location": "三楼大会议室"}
+
+
+def call(app, path, body, headers=()):
+    """以ASGI协议发送一个POST请求，返回(状态码, 响应头字典, 响应体)"""
+    payload = json.dumps(body).encode("utf-8")
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+             "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+             + [(name.lower().encode(), value.encode()) for name, value in headers],
+             "server": ("testserver", 80), "client": ("127.0.0.1", 1234)}
+    asyncio.run(app(scope, receive, send))
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return start["status"], {name.decode(): value.decode() for name, value in start["headers"]}, body
+
+
+@pytest.fixture
+def app(monkeypatch):
+    async def aextract(input_text):
+        return dict(MEETING_INFO)
+
+    monkeypatch.setattr(asgi, "aextract_meeting_info", aextract)
+    monkeypatch.setattr(asgi, "render_meeting_word", lambda info: b"docx-bytes")
+    monkeypatch.setattr(main, "extract_meeting_info", lambda input_text: dict(MEETING_INFO))
+    monkeypatch.setattr(main, "render_meeting_word", lambda info: b"docx-bytes")
+    return asgi.MeetingASGIApp(main.app)
+
+
+def test_generate_meeting_returns_document_with_etag(app):
+    status, headers, body = call(app, "/generate-meeting", {"input_text": "周会"})
+    assert status == 200
+    assert body == b"docx-bytes"
+    assert headers["content-type"] == main.DOCX_MIMETYPE
+    assert headers["etag"].strip('"') in headers["content-location"]
+
+
+def test_generate_meeting_if_none_match_matches_flask(app):
+    _, headers, _ = call(app, "/generate-meeting", {"input_text": "周会"})
+    etag = headers["etag"]
+
+    # POST与Flask接口一样返回完整文档，重新验证通过Content-Location的GET请求完成
+    status, revalidated, body = call(app, "/generate-meeting", {"input_text": "周会"}, [("If-None-Match", etag)])
+    flask_response = main.app.test_client().post("/generate-meeting", json={"input_text": "周会"},
+                                                 headers={"If-None-Match": etag})
+    assert status == flask_response.status_code == 200
+    assert body == flask_response.get_data() == b"docx-bytes"
+    assert revalidated["etag"] == flask_response.headers["ETag"] == etag
+
+    conditional = main.app.test_client().get(headers["content-location"], headers={"If-None-Match": etag})
+    assert conditional.status_code == 304
+
+
+def test_profiled_request_is_handled_by_flask(app, monkeypatch):
+    monkeypatch.setattr(profiler, "token", "secret")
+    monkeypatch.setattr(asgi, "aextract_meeting_info", None)  # 协程接口不应被调用
+    status, headers, body = call(app, "/generate-meeting", {"input_text": "周会"},
+                                 [("X-Profile", "cpu"), ("X-Profile-Token", "secret")])
+    assert status == 200
+    assert body == b"docx-bytes"
+    assert "x-profile-id" in headers or "x-profile-status" in headers
+
+
+def test_profile_header_without_token_stays_async(app, monkeypatch):
+    monkeypatch.setattr(profiler, "token", "secret")
+    monkeypatch.setattr(main, "extract_meeting_info", None)  # Flask接口不应被调用
+    status, headers, _ = call(app, "/generate-meeting", {"input_text": "周会"}, [("X-Profile", "cpu")])
+    assert status == 200
+    assert "x-profile-id" not in headers
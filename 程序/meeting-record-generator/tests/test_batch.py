@@ -0,0 +1,66 @@
+import io
+import json
+import threading
+import time
+import zipfile
+
+from batch import stream_batch_zip
+from cancellation import check_cancelled
+
+
+def extract(text):
+    if text == "坏":
+        raise RuntimeError("提取失败")
+    return {"meeting_topic": text, "meeting_type": "周会"}
+
+
+def render(info):
+    return info["meeting_topic"].encode("utf-8")
+
+
+def test_zip_contains_documents_and_manifest_in_input_order():
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_batch_zip(["一", "坏", "", "二"], extract, render))))
+    assert archive.testzip() is None
+    assert archive.namelist() == ["001_会议记录.docx", "004_会议记录.docx", "manifest.json"]
+    assert archive.read("004_会议记录.docx") == "二".encode("utf-8")
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert (manifest["total"], manifest["succeeded"]) == (4, 2)
+    assert [item["index"] for item in manifest["items"]] == [0, 1, 2, 3]
+    assert [item["status"] for item in manifest["items"]] == ["ok", "failed", "failed", "ok"]
+    assert manifest["items"][0] == {"index": 0, "filename": "001_会议记录.docx", "status": "ok",
+                                    "meeting_type": "周会", "error": None}
+    assert manifest["items"][1]["error"] == "提取失败"
+    assert manifest["items"][2]["error"] == "会议描述文本为空"
+    assert "content" not in manifest["items"][0]
+
+
+def test_disconnect_cancels_pending_items():
+    started = []
+    release = threading.Event()
+
+    def slow_extract(text):
+        started.append(text)
+        if text != "0":
+            # 模拟逐块输出的模型调用：在分块之间检查取消
+            while not release.wait(0.01):
+                check_cancelled()
+        return {"meeting_topic": text}
+
+    # 取消未生效时兜底放行，测试不会一直阻塞
+    safety_net = threading.Timer(5, release.set)
+    safety_net.start()
+    try:
+        stream = stream_batch_zip([str(idx) for idx in range(20)], slow_extract, render, parallelism=2)
+        next(stream)  # 第一条已写入，第二条正在生成
+
+        start = time.perf_counter()
+        stream.close()
+        elapsed = time.perf_counter() - start
+    finally:
+        safety_net.cancel()
+        release.set()
+
+    # 正在生成的记录被取消，排队中的记录不再开始
+    assert elapsed < 1
+    assert len(started) <= 3
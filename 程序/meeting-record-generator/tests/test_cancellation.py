@@ -0,0 +1,66 @@
+import pytest
+
+import model_client
+import ollama_client
+from conftest import wait_until
+from cancellation import DISCONNECT, CancelToken, Cancelled, cancel_scope, check_cancelled, current_token
+from model_registry import CircuitBreaker
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """处于半开状态（等待探测请求）的熔断器"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    monkeypatch.setattr(model_client, "ollama_breaker", breaker)
+    return breaker
+
+
+def test_cancel_keeps_first_reason():
+    token = CancelToken()
+    token.check()
+    token.cancel(DISCONNECT)
+    token.cancel()
+    assert token.cancelled
+    with pytest.raises(Cancelled) as excinfo:
+        token.check()
+    assert excinfo.value.args == (DISCONNECT,)
+
+
+def test_cancel_scope_is_restored():
+    token = CancelToken()
+    token.cancel()
+    with cancel_scope(token):
+        assert current_token() is token
+        with pytest.raises(Cancelled):
+            check_cancelled()
+    assert current_token() is None
+    check_cancelled()
+
+
+def test_cancelled_mid_stream_probe_is_released(fake_ollama, breaker):
+    token = CancelToken()
+    extractor = model_client.AdvancedMeetingExtractor()
+    with cancel_scope(token):
+        events = extractor._stream_model("会议描述", ollama_client.OLLAMA_MODEL, {})
+        next(events)
+        token.cancel(DISCONNECT)
+        with pytest.raises(Cancelled):
+            for _ in events:
+                pass
+
+    # 连接已关闭，取消不算作失败也不算作成功
+    assert wait_until(lambda: fake_ollama.closed == 1)
+    assert breaker.status()["state"] == CircuitBreaker.HALF_OPEN
+    assert breaker.status()["consecutive_failures"] == 1
+    assert breaker.allow() is True
+
+
+def test_cancelled_before_call_probe_is_released(fake_ollama, breaker):
+    token = CancelToken()
+    token.cancel()
+    with cancel_scope(token), pytest.raises(Cancelled):
+        model_client.AdvancedMeetingExtractor()._call_model("会议描述", ollama_client.OLLAMA_MODEL)
+
+    assert fake_ollama.calls == 0
+    assert breaker.allow() is True
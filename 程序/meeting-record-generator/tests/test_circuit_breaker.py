@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+import model_client
+import ollama_client
+from conftest import fake_chunks, wait_until
+from model_registry import CircuitBreaker
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """处于半开状态（等待探测请求）的熔断器"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    monkeypatch.setattr(model_client, "ollama_breaker", breaker)
+    return breaker
+
+
+def test_half_open_admits_single_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow() is True
+    assert breaker.status()["state"] == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert breaker.status()["state"] == CircuitBreaker.CLOSED
+
+
+def test_release_probe_readmits_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.allow() is True
+    breaker.release_probe()
+    assert breaker.allow() is True
+
+
+def test_release_probe_keeps_open_breaker_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.release_probe()
+    assert breaker.allow() is False
+
+
+def test_disconnected_probe_does_not_wedge_breaker(fake_ollama, breaker):
+    extractor = model_client.AdvancedMeetingExtractor()
+    events = extractor._stream_model("会议描述", ollama_client.OLLAMA_MODEL, {})
+    next(events)
+    # 调用方断开：SSE生成器被关闭
+    events.close()
+
+    assert wait_until(lambda: fake_ollama.closed == 1)
+    assert breaker.status()["state"] == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is True
+
+
+def test_finished_probe_closes_breaker(fake_ollama, breaker):
+    response = model_client.AdvancedMeetingExtractor()._call_model("会议描述", ollama_client.OLLAMA_MODEL)
+    assert response["fallback"] is False
+    assert breaker.status()["state"] == CircuitBreaker.CLOSED
+
+
+def test_cancelled_async_probe_does_not_wedge_breaker(monkeypatch, breaker):
+    async def slow_chat_stream(messages, model=None, **kwargs):
+        for chunk in fake_chunks():
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    monkeypatch.setattr(ollama_client, "achat_stream", slow_chat_stream)
+    extractor = model_client.AdvancedMeetingExtractor()
+
+    async def consume():
+        async for _ in extractor._astream_model("会议描述", ollama_client.OLLAMA_MODEL, {}):
+            pass
+
+    async def cancel_midway():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    assert breaker.status()["state"] == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is True
@@ -0,0 +1,103 @@
+import datetime
+
+from field_extractor import FIELD_EXTRACTOR, FieldExtractor
+
+FILLER = "张三：我们先看一下上周的进展，然后讨论下一步的安排。\n" * 200
+
+
+def test_explicit_year_is_kept():
+    fields = FieldExtractor(default_year=2020).extract("会议时间：2025年3月5日 14:00-16:00")
+    assert fields["meeting_time"].value == "2025年03月05日 14:00-16:00"
+    assert fields["meeting_time"].confidence == 0.95
+
+
+def test_missing_year_uses_default_year_with_lower_confidence():
+    fields = FieldExtractor(default_year=2031).extract("3月5日 9:30到11:00开会")
+    assert fields["meeting_time"].value == "2031年03月05日 09:30-11:00"
+    assert fields["meeting_time"].confidence == 0.8
+
+
+def test_missing_year_defaults_to_current_year():
+    fields = FIELD_EXTRACTOR.extract("3月5日 14:00-15:00")
+    assert fields["meeting_time"].value.startswith(f"{datetime.date.today().year}年")
+
+
+def test_explicit_year_beats_earlier_inferred_year():
+    fields = FieldExtractor(default_year=2031).extract("3月5日 14:00-15:00预备会，正式会议2025年3月6日 14:00-16:00")
+    assert fields["meeting_time"].value == "2025年03月06日 14:00-16:00"
+
+
+def test_first_of_equally_confident_matches_wins():
+    fields = FIELD_EXTRACTOR.extract("地点：三楼大会议室，备用：二楼小会议室；预计两小时，最多3小时")
+    assert fields["meeting_location"].value == "三楼大会议室"
+    assert fields["meeting_duration"].value == "2小时"
+
+
+def test_modified_location_beats_bare_keyword():
+    fields = FIELD_EXTRACTOR.extract("先在会议室碰头，正式地点：公司三楼大会议室")
+    assert fields["meeting_location"].value == "公司三楼大会议室"
+    assert fields["meeting_location"].confidence == 0.85
+
+
+def test_duration_computed_from_time_span():
+    fields = FIELD_EXTRACTOR.extract("2025-03-05 14:00-15:30 在线")
+    assert fields["meeting_duration"].value == "1小时30分钟"
+    assert fields["meeting_duration"].confidence == 0.7
+
+
+def test_meeting_time_takes_precedence_over_date_range():
+    fields = FIELD_EXTRACTOR.extract("2025年3月5日 14:00-16:00，三楼大会议室，两小时。培训3月5日至3月7日")
+    assert "meeting_time" in fields
+    assert "date_range" not in fields
+
+
+def test_date_range_found_when_no_meeting_time():
+    fields = FIELD_EXTRACTOR.extract(FILLER + "培训安排在2025年3月5日至2025年3月7日")
+    assert fields["date_range"].value == "2025年03月05日至2025年03月07日"
+
+
+def test_fields_beyond_scan_window_are_still_found():
+    fields = FieldExtractor(scan_chars=100).extract("会议在三楼大会议室。" + FILLER + "时间2025年3月5日 14:00-16:00")
+    assert fields["meeting_time"].value == "2025年03月05日 14:00-16:00"
+    assert fields["meeting_location"].value == "三楼大会议室"
+
+
+def test_better_candidate_within_scan_window_replaces_earlier():
+    text = "三楼大会议室，两小时，3月5日 14:00-15:00，" + "。" * 50 + "2025年3月5日 14:00-15:00"
+    assert FieldExtractor(scan_chars=1000).extract(text)["meeting_time"].confidence == 0.95
+    # 超出窗口后已找到的字段不再择优
+    assert FieldExtractor(scan_chars=30).extract(text)["meeting_time"].confidence == 0.8
+
+
+def test_long_transcript_matches_short_header():
+    header = "会议时间：2025年3月5日 14:00-16:00，地点：公司三楼大会议室，预计两小时。\n"
+    assert FIELD_EXTRACTOR.extract(header + FILLER * 10) == FIELD_EXTRACTOR.extract(header)
+
+
+def test_hour_and_a_half_duration():
+    fields = FIELD_EXTRACTOR.extract("会议预计一个半小时，地点在三楼大会议室")
+    assert fields["meeting_duration"].value == "1小时30分钟"
+    assert fields["meeting_duration"].confidence == 0.9
+
+
+def test_hours_and_minutes_duration():
+    assert FIELD_EXTRACTOR.extract("时长：1小时30分钟")["meeting_duration"].value == "1小时30分钟"
+    assert FIELD_EXTRACTOR.extract("约两个半钟头")["meeting_duration"].value == "2小时30分钟"
+
+
+def test_incidental_minutes_do_not_override_time_span():
+    fields = FIELD_EXTRACTOR.extract("2025年3月5日 14:00-16:00 三楼大会议室。中途休息10分钟")
+    assert fields["meeting_duration"].value == "2小时"
+    assert fields["meeting_duration"].confidence == 0.7
+
+
+def test_anchored_duration_beats_earlier_unanchored_one():
+    fields = FIELD_EXTRACTOR.extract("每人发言5分钟，会议时长：两小时")
+    assert fields["meeting_duration"].value == "2小时"
+    assert fields["meeting_duration"].confidence == 0.9
+
+
+def test_unanchored_duration_used_when_nothing_better():
+    fields = FIELD_EXTRACTOR.extract("上次会议开了2小时")
+    assert fields["meeting_duration"].value == "2小时"
+    assert fields["meeting_duration"].confidence == 0.6
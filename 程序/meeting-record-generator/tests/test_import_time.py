@@ -0,0 +1,14 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from check_import_time import IMPORT_BUDGET_MS, LAZY_MODULES, measure_import  # noqa: E402
+
+
+def test_main_import_within_budget_and_lazy():
+    # 取3次中最快的一次，减少磁盘缓存等干扰
+    total_ms, modules = min((measure_import("main") for _ in range(3)), key=lambda item: item[0])
+    assert total_ms <= IMPORT_BUDGET_MS, f"import main耗时{total_ms:.1f} ms，超过预算{IMPORT_BUDGET_MS:.0f} ms"
+    eager = [name for name in LAZY_MODULES if name in modules]
+    assert not eager, f"启动时导入了应延迟加载的模块：{', '.join(eager)}"
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from cancellation import CLIENT, check_cancelled
+from conftest import wait_until
+from jobs import Job, JobManager, QueueFullError
+
+
+def test_queue_bound_rejects_extra_jobs():
+    # 不启动工作线程，提交的任务一直排队
+    manager = JobManager(lambda text: {}, lambda info: b"", workers=0, queue_size=2)
+    first = manager.submit("会议一")
+    manager.submit("会议二")
+    with pytest.raises(QueueFullError):
+        manager.submit("会议三")
+    assert manager.queue_depth() == 2
+    assert first.status == Job.QUEUED
+
+
+def test_job_runs_extract_then_render():
+    manager = JobManager(lambda text: {"meeting_type": "team_meeting", "text": text},
+                         lambda info: info["text"].encode("utf-8"), workers=1)
+    job = manager.submit("周会")
+    assert wait_until(lambda: job.finished)
+    assert job.status == Job.DONE
+    assert job.result == "周会".encode("utf-8")
+    assert job.meeting_type == "team_meeting"
+    assert set(job.to_dict()["timings"]) == {"extract", "render"}
+    # 原文在任务结束后释放
+    assert job.input_text == ""
+
+
+def test_failed_job_records_error():
+    def extract(text):
+        raise ValueError("模型输出无效")
+
+    manager = JobManager(extract, lambda info: b"", workers=1)
+    job = manager.submit("周会")
+    assert wait_until(lambda: job.finished)
+    assert job.status == Job.FAILED
+    assert job.error == "模型输出无效"
+
+
+def test_cancel_queued_job():
+    manager = JobManager(lambda text: {}, lambda info: b"", workers=0)
+    job = manager.submit("周会")
+    assert manager.cancel(job.id) is job
+    assert job.status == Job.CANCELLED
+    assert job.cancel_token.reason == CLIENT
+    assert manager.cancel("missing") is None
+
+
+def test_cancel_running_job_skips_render():
+    started = threading.Event()
+    release = threading.Event()
+    rendered = []
+
+    def extract(text):
+        started.set()
+        release.wait(5)
+        # 模型调用在下一个输出分块时检查取消标记
+        check_cancelled()
+        return {}
+
+    manager = JobManager(extract, lambda info: rendered.append(info) or b"", workers=1)
+    job = manager.submit("周会")
+    assert started.wait(2)
+    manager.cancel(job.id)
+    assert job.to_dict()["cancel_requested"] is True
+    release.set()
+
+    assert wait_until(lambda: job.finished)
+    assert job.status == Job.CANCELLED
+    assert rendered == []
+
+
+def test_cancel_finished_job_has_no_effect():
+    manager = JobManager(lambda text: {}, lambda info: b"docx", workers=1)
+    job = manager.submit("周会")
+    assert wait_until(lambda: job.finished)
+    manager.cancel(job.id)
+    assert job.status == Job.DONE
+    assert not job.cancel_token.cancelled
+
+
+def test_expired_results_are_purged():
+    manager = JobManager(lambda text: {}, lambda info: b"", workers=0, result_ttl=-1)
+    job = manager.add_completed(b"docx")
+    assert manager.get(job.id) is job
+    manager.add_completed(b"docx")
+    assert manager.get(job.id) is None
@@ -0,0 +1,41 @@
+import re
+
+from keyword_matcher import KeywordAutomaton
+
+
+def naive_count(keywords, text):
+    """逐个关键词的重叠计数（与自动机的结果对照）"""
+    counts = {}
+    for keyword in dict.fromkeys(kw for kw in keywords if kw):
+        hits = len(re.findall(f"(?={re.escape(keyword)})", text))
+        if hits:
+            counts[keyword] = hits
+    return counts
+
+
+def test_nested_keywords_are_all_counted():
+    automaton = KeywordAutomaton(["例会", "周例会", "会"])
+    assert automaton.count("本周例会和月例会") == {"周例会": 1, "例会": 2, "会": 2}
+
+
+def test_overlapping_keywords():
+    automaton = KeywordAutomaton(["aa", "aba"])
+    assert automaton.count("aaba aaa") == {"aa": 3, "aba": 1}
+
+
+def test_duplicate_and_empty_keywords_are_ignored():
+    automaton = KeywordAutomaton(["评审", "", "评审"])
+    assert automaton.keywords == ["评审"]
+    assert automaton.count("评审评审") == {"评审": 2}
+    assert KeywordAutomaton([]).count("评审") == {}
+
+
+def test_find_all_reports_start_positions_in_end_order():
+    automaton = KeywordAutomaton(["项目", "项目评审", "评审会"])
+    assert automaton.find_all("项目评审会") == [(0, "项目"), (0, "项目评审"), (2, "评审会")]
+
+
+def test_matches_naive_scan():
+    keywords = ["周会", "例会", "周例会", "评审", "项目评审", "复盘", "会议", "议程"]
+    text = "本周例会议程：项目评审会议后复盘，周会改为双周例会；评审评审复盘会议会议" * 3
+    assert KeywordAutomaton(keywords).count(text) == naive_count(keywords, text)
@@ -0,0 +1,78 @@
+import model_client
+import ollama_client
+from long_input import merge_meeting_infos, normalize_title, split_transcript
+from metrics import TRANSCRIPT_CHUNKS
+
+
+def test_short_text_is_a_single_chunk():
+    assert split_transcript("张三：大家好。", 100) == ["张三：大家好。"]
+
+
+def test_chunks_respect_limit_and_sentence_boundaries():
+    text = "".join(f"发言人{idx}：这是第{idx}句话。\n" for idx in range(200))
+    chunks = split_transcript(text, 300, overlap_ratio=0.1)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert all(chunk.endswith("。") for chunk in chunks)
+    # 相邻分段有重叠，拼接后不丢内容
+    assert chunks[1].split("\n")[0] in chunks[0]
+    assert all(f"发言人{idx}：" in "".join(chunks) for idx in range(200))
+
+
+def test_overlong_sentence_is_hard_split():
+    chunks = split_transcript("啊" * 1000, 300)
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert "".join(chunks).count("啊") >= 1000
+
+
+def test_merge_prefers_specific_values_in_chunk_order():
+    merged = merge_meeting_infos([
+        {"meeting_topic": "待确认", "meeting_time": "3月5日", "meeting_location": "会议室",
+         "meeting_duration": "较长", "participants": "张三，李四", "global_preparation": "准备数据"},
+        {"meeting_topic": "季度规划", "meeting_time": "2025年3月5日 14:00-16:00",
+         "meeting_location": "三楼大会议室", "meeting_duration": "2小时", "participants": "李四、王五",
+         "global_preparation": " 准备数据 "},
+        {"meeting_topic": "其他主题", "meeting_time": "无", "participants": "无"},
+    ])
+    assert merged["meeting_topic"] == "季度规划"
+    assert merged["meeting_time"] == "2025年3月5日 14:00-16:00"
+    assert merged["meeting_location"] == "三楼大会议室"
+    assert merged["meeting_duration"] == "2小时"
+    assert merged["participants"] == "张三,李四,王五"
+    assert merged["global_preparation"] == "准备数据"
+
+
+def test_merge_deduplicates_agenda_by_normalized_title():
+    merged = merge_meeting_infos([
+        {"agenda": [{"title": "上线排期", "leader": "待确认"}, {"title": "预算"}]},
+        {"agenda": [{"title": "上线 排期！", "leader": "张三", "preparation": "计划"}, "无效", {"title": ""}]},
+        {"agenda": "无"},
+    ])
+    assert merged["agenda"] == [
+        {"title": "上线排期", "leader": "张三", "preparation": "计划"},
+        {"title": "预算"},
+    ]
+
+
+def test_merge_of_empty_chunks_uses_placeholders():
+    merged = merge_meeting_infos([{}, {"meeting_topic": "未提及"}])
+    assert merged["meeting_topic"] == "待确认"
+    assert merged["participants"] == "待确认"
+    assert merged["agenda"] == []
+    assert merged["global_preparation"] == "无"
+
+
+def test_normalize_title_ignores_width_spacing_and_punctuation():
+    assert normalize_title("Ｑ３ 规划：") == normalize_title("q3规划")
+
+
+def test_chunked_extraction_records_chunk_count(fake_ollama):
+    before = TRANSCRIPT_CHUNKS.labels().counts[:]
+    response = model_client.AdvancedMeetingExtractor()._call_model_chunked(
+        "team_meeting", ["第一段。", "第二段。", "第三段。"], ollama_client.OLLAMA_MODEL)
+    after = TRANSCRIPT_CHUNKS.labels().counts
+    assert fake_ollama.calls == 3
+    assert response["fallback"] is False
+    assert response["meeting_info"]["meeting_topic"] == "季度产品规划"
+    assert sum(after) - sum(before) == 1
+    assert after[TRANSCRIPT_CHUNKS.buckets.index(3)] - before[TRANSCRIPT_CHUNKS.buckets.index(3)] == 1
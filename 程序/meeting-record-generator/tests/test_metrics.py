@@ -0,0 +1,53 @@
+import pytest
+
+from metrics import Counter, GaugeCallback, Histogram, MetricsRegistry, _Metric
+
+
+def test_metric_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("meeting_test", "doc")
+
+    class Incomplete(_Metric):
+        def _new_child(self):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete("meeting_test", "doc")
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("meeting_test_total", "Test counter.", ["reason"]))
+    histogram = registry.register(Histogram("meeting_test_seconds", "Test histogram.", buckets=(0.1, 1)))
+    counter.labels('a"b').inc()
+    counter.labels('a"b').inc(2)
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    text = registry.render()
+    assert '# TYPE meeting_test_total counter' in text
+    assert 'meeting_test_total{reason="a\\"b"} 3' in text
+    assert 'meeting_test_seconds_bucket{le="0.1"} 1' in text
+    assert 'meeting_test_seconds_bucket{le="1"} 2' in text
+    assert 'meeting_test_seconds_bucket{le="+Inf"} 3' in text
+    assert 'meeting_test_seconds_count 3' in text
+    assert 'meeting_test_seconds_sum 5.55' in text
+
+
+def test_label_count_is_checked():
+    counter = Counter("meeting_test_total", "Test counter.", ["reason"])
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+
+def test_gauge_callback_samples_and_rejects_labels():
+    gauge = GaugeCallback("meeting_test_depth", "Test gauge.", lambda: {(): 4})
+    assert "meeting_test_depth 4" in gauge.render()
+    with pytest.raises(TypeError):
+        gauge.labels()
+
+
+def test_failing_gauge_callback_renders_no_samples():
+    gauge = GaugeCallback("meeting_test_depth", "Test gauge.", lambda: 1 / 0)
+    assert gauge.render().splitlines()[2:] == []
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+import ollama_client
+from model_registry import CircuitBreaker, ModelRegistry
+
+
+class ListClient:
+    def __init__(self, names=None, error=None):
+        self.names = names or []
+        self.error = error
+        self.list_calls = 0
+
+    def list(self):
+        self.list_calls += 1
+        if self.error is not None:
+            raise self.error
+        return {"models": [{"name": name} for name in self.names]}
+
+
+@pytest.fixture
+def use_client(monkeypatch):
+    def install(client):
+        monkeypatch.setattr(ollama_client, "get_client", lambda: client)
+        return client
+    return install
+
+
+def registry_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "ollama-model-registry"]
+
+
+def test_candidates_matched_in_priority_order(use_client):
+    use_client(ListClient(["qwen2:7b", "llama3:latest"]))
+    registry = ModelRegistry(candidates=["llama3", "qwen2:7b"])
+    assert registry.refresh() is True
+    assert registry.best_model(start=False) == "llama3:latest"
+
+
+def test_no_candidate_installed(use_client):
+    use_client(ListClient(["mistral:7b"]))
+    registry = ModelRegistry(candidates=["llama3:8b"])
+    registry.refresh()
+    assert registry.best_model(start=False) is None
+
+
+def test_unknown_list_falls_back_to_first_candidate_and_records_failure(use_client):
+    use_client(ListClient(error=ConnectionError("refused")))
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    registry = ModelRegistry(candidates=["llama3:8b", "qwen2:7b"], breaker=breaker)
+    assert registry.refresh() is False
+    assert registry.best_model(start=False) == "llama3:8b"
+    assert breaker.status()["state"] == CircuitBreaker.OPEN
+
+
+def test_warm_up_does_not_start_refresh_thread(use_client, monkeypatch):
+    import serve
+    import model_registry as registry_module
+
+    client = use_client(ListClient())
+    registry = ModelRegistry(candidates=["absent-model"])
+    monkeypatch.setattr(registry_module, "model_registry", registry)
+    before = len(registry_threads())
+
+    serve.warm_up(with_model=True)
+
+    # 只查询一次，派生工作进程前不启动后台刷新线程
+    assert client.list_calls == 1
+    assert len(registry_threads()) == before
+    assert registry._thread_pid is None
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+
+import httpx
+import pytest
+
+import ollama_client
+from conftest import FAKE_MODEL_OUTPUT, fake_chunks, wait_until
+
+
+class StalledClient:
+    """输出一个分块后不再输出（模拟模型卡住、读取一直等到读取超时）"""
+
+    def __init__(self, error=None):
+        self.release = threading.Event()
+        self.closed = threading.Event()
+        self.error = error
+
+    def chat(self, **kwargs):
+        return self._stream()
+
+    def _stream(self):
+        try:
+            yield {"message": {"role": "assistant", "content": "{"}, "done": False}
+            self.release.wait(5)
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture
+def use_client(monkeypatch):
+    def install(client):
+        monkeypatch.setattr(ollama_client, "_client", client)
+        monkeypatch.setattr(ollama_client, "_client_pid", os.getpid())
+        return client
+    return install
+
+
+def test_stalled_stream_is_aborted_at_total_timeout(use_client):
+    client = use_client(StalledClient())
+    stream = ollama_client.chat_stream([], total_timeout=0.2)
+    start = time.monotonic()
+    assert next(stream)["message"]["content"] == "{"
+    with pytest.raises(ollama_client.OllamaTimeoutError):
+        next(stream)
+    # 不等待读取超时，到总时长上限即返回
+    assert time.monotonic() - start < 1.0
+
+    # 读取线程收到后续数据后关闭连接
+    client.release.set()
+    assert wait_until(client.closed.is_set)
+
+
+def test_read_timeout_is_reported_as_ollama_timeout(use_client):
+    client = use_client(StalledClient(error=httpx.ReadTimeout("read timed out")))
+    client.release.set()
+    with pytest.raises(ollama_client.OllamaTimeoutError, match="ReadTimeout"):
+        list(ollama_client.chat_stream([], total_timeout=5))
+
+
+def test_other_errors_propagate(use_client):
+    client = use_client(StalledClient(error=ConnectionError("refused")))
+    client.release.set()
+    with pytest.raises(ConnectionError):
+        list(ollama_client.chat_stream([], total_timeout=5))
+
+
+def test_early_close_stops_the_stream(fake_ollama):
+    stream = ollama_client.chat_stream([])
+    next(stream)
+    stream.close()
+    assert wait_until(lambda: fake_ollama.closed == 1)
+
+
+def test_chat_assembles_streamed_content(fake_ollama):
+    response = ollama_client.chat([{"role": "user", "content": "会议"}])
+    assert response["done"] is True
+    assert response["message"]["content"] == FAKE_MODEL_OUTPUT
+    assert fake_ollama.calls == 1
+
+
+def test_stream_stops_at_done_chunk(fake_ollama):
+    chunks = list(ollama_client.chat_stream([]))
+    assert chunks == list(fake_chunks())
+    assert wait_until(lambda: fake_ollama.closed == 1)
+
+
+def test_client_is_recreated_after_fork(monkeypatch):
+    stale = object()
+    monkeypatch.setattr(ollama_client, "_client", stale)
+    monkeypatch.setattr(ollama_client, "_client_pid", -1)
+    client = ollama_client.get_client()
+    assert client is not stale
+    assert ollama_client.get_client() is client
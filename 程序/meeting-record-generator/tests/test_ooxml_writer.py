@@ -0,0 +1,48 @@
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("docx")
+
+import ooxml_writer  # noqa: E402
+import word_generator  # noqa: E402
+
+
+def _agenda(size):
+    return [{"title": f"议题{idx + 1}", "leader": "项目经理", "preparation": "准备进度报告",
+             "participants": "项目组全体"} for idx in range(size)]
+
+
+CASES = {
+    "no_agenda": {"meeting_topic": "周会", "meeting_location": "线上", "agenda": []},
+    "one_item": {"meeting_topic": "项目进度会议", "meeting_location": "三楼大会议室",
+                 "participants": "张三,李四", "meeting_duration": "1小时", "agenda": _agenda(1)},
+    "many_items": {"meeting_topic": "季度规划", "meeting_time": "2025年03月05日 14:00",
+                   "global_preparation": "准备数据", "agenda": _agenda(12)},
+    "xml_special_chars": {
+        "meeting_topic": "<会议> & \"评审\" 'A'", "meeting_location": "R&D <3F>",
+        "participants": "张三 & 李四", "global_preparation": "  前后空格  ]]> \t制表",
+        "agenda": [{"title": "<script>&amp;</script>", "leader": "\"王五\"",
+                    "preparation": "a < b > c", "participants": "&&"}, {}],
+    },
+    "missing_fields": {},
+}
+
+
+@pytest.mark.parametrize("info", CASES.values(), ids=CASES.keys())
+def test_document_xml_matches_python_docx(info):
+    expected = zipfile.ZipFile(io.BytesIO(word_generator.render_meeting_word(info, renderer="docx")))
+    actual = zipfile.ZipFile(io.BytesIO(ooxml_writer.render_meeting_word(info)))
+
+    assert actual.testzip() is None
+    assert actual.namelist() == expected.namelist()
+    assert actual.read("word/document.xml") == expected.read("word/document.xml")
+    for name in expected.namelist():
+        assert actual.read(name) == expected.read(name), name
+
+
+def test_special_characters_are_escaped():
+    xml = ooxml_writer.render_document_xml(CASES["xml_special_chars"]).decode("utf-8")
+    assert "&lt;script&gt;&amp;amp;&lt;/script&gt;" in xml
+    assert "<script>" not in xml
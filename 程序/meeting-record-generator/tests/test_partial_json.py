@@ -0,0 +1,61 @@
+import json
+
+from conftest import FAKE_MODEL_OUTPUT
+from partial_json import TopLevelFieldParser
+
+
+def feed_all(parser, chunks):
+    fields = []
+    for chunk in chunks:
+        fields.extend(parser.feed(chunk))
+    return fields
+
+
+def test_fields_are_emitted_as_soon_as_complete():
+    parser = TopLevelFieldParser()
+    assert parser.feed('{"meeting_topic": "季度') == []
+    assert parser.feed('规划", "count": 1') == [("meeting_topic", "季度规划")]
+    # 数字在逗号或右花括号之前不算完整
+    assert parser.feed("2") == []
+    assert parser.feed("}") == [("count", 12)]
+    assert parser.closed
+
+
+def test_single_character_chunks_match_json_loads():
+    parser = TopLevelFieldParser()
+    fields = feed_all(parser, FAKE_MODEL_OUTPUT)
+    expected = json.loads(FAKE_MODEL_OUTPUT)
+    assert parser.closed
+    assert parser.fields == expected
+    assert [key for key, _ in fields] == list(expected)
+
+
+def test_escapes_split_across_chunks():
+    text = json.dumps({"topic": 'a "quoted" \\ name', "agenda": [{"title": "x}]"}]}, ensure_ascii=False)
+    split = text.index("\\") + 1
+    parser = TopLevelFieldParser()
+    feed_all(parser, [text[:split], text[split:]])
+    assert parser.fields == json.loads(text)
+
+
+def test_nested_values_are_emitted_when_closed():
+    parser = TopLevelFieldParser()
+    assert parser.feed('{"agenda": [{"title": "上线", "items": [1, 2]}') == []
+    assert parser.feed("]") == [("agenda", [{"title": "上线", "items": [1, 2]}])]
+
+
+def test_trailing_text_after_close_is_ignored():
+    parser = TopLevelFieldParser()
+    parser.feed('{"a": true, "b": null} 以上为提取结果')
+    assert parser.closed
+    assert parser.text == '{"a": true, "b": null}'
+    assert parser.feed('{"c": 1}') == []
+    # null视为缺失字段
+    assert parser.fields == {"a": True}
+
+
+def test_malformed_value_is_skipped():
+    parser = TopLevelFieldParser()
+    fields = parser.feed('{"a": tru, "b": "ok"}')
+    assert fields == [("b", "ok")]
+    assert parser.closed
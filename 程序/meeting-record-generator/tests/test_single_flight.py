@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+from cancellation import Cancelled
+from conftest import wait_until
+from single_flight import FlightAbandoned, SingleFlight
+
+
+def start_waiter(flights, key, fn, results):
+    """在线程中调用flights.do，结果或异常追加到results"""
+    def run():
+        try:
+            results.append(flights.do(key, fn))
+        except BaseException as e:
+            results.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def extract():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"agenda": ["上线排期"]}
+
+    results = []
+    threads = [start_waiter(flights, "key", extract, results)]
+    assert started.wait(2)
+    threads += [start_waiter(flights, "key", extract, results) for _ in range(3)]
+    assert wait_until(lambda: flights.stats()["coalesced"] == 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"agenda": ["上线排期"]}] * 4
+    # 各调用方得到独立的副本
+    results[0]["agenda"].append("复盘")
+    assert results[1] == {"agenda": ["上线排期"]}
+    assert flights.stats() == {"in_flight": 0, "executed": 1, "coalesced": 3, "coalesced_rate": 0.75}
+
+
+def test_error_is_shared_with_waiters():
+    flights = SingleFlight()
+    flight, leader = flights.begin("key")
+    waiter, waiter_leader = flights.begin("key")
+    assert leader and not waiter_leader and waiter is flight
+
+    flights.finish("key", flight, error=ValueError("模型输出无效"))
+    with pytest.raises(ValueError, match="模型输出无效"):
+        waiter.wait()
+    # 结束后不再合并
+    assert flights.begin("key")[1] is True
+
+
+def test_cancelled_leader_abandons_waiters():
+    flights = SingleFlight()
+    flight, _ = flights.begin("key")
+    waiter, _ = flights.begin("key")
+    flights.finish("key", flight, error=Cancelled("disconnect"))
+    with pytest.raises(FlightAbandoned):
+        waiter.wait()
+
+
+def test_waiter_retries_after_leader_is_cancelled():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def cancelled_extract():
+        started.set()
+        release.wait(5)
+        raise Cancelled("disconnect")
+
+    results = []
+    leader = start_waiter(flights, "key", cancelled_extract, results)
+    assert started.wait(2)
+    waiter = start_waiter(flights, "key", lambda: "重新提取", results)
+    assert wait_until(lambda: flights.stats()["coalesced"] == 1)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert len(results) == 2
+    assert any(isinstance(result, Cancelled) for result in results)
+    assert "重新提取" in results
+    assert flights.stats()["executed"] == 2
+
+
+def test_async_waiter_gets_copy():
+    flights = SingleFlight()
+    flight, _ = flights.begin("key")
+    waiter, _ = flights.begin("key")
+
+    async def wait():
+        task = asyncio.ensure_future(waiter.wait_async())
+        await asyncio.sleep(0)
+        flights.finish("key", flight, {"participants": "张三"})
+        return await task
+
+    result = asyncio.run(wait())
+    assert result == {"participants": "张三"}
+    result["participants"] = "李四"
+    assert flight.wait() == {"participants": "张三"}